@@ -0,0 +1,29 @@
+"""drop untrimmed wikidata entities
+
+Revision ID: 1f6a3d8c0e57
+Revises: 994765d402a0
+Create Date: 2026-10-18 15:06:52.731940
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "1f6a3d8c0e57"
+down_revision: str | Sequence[str] | None = "994765d402a0"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Cached entities used to hold the full claims dict; the app now stores the trimmed
+    # WikidataEntity projection. They are refetched (and re-cached trimmed) on next use.
+    op.execute("DELETE FROM wikidata_cache WHERE key LIKE 'entity:%'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM wikidata_cache WHERE key LIKE 'entity:%'")
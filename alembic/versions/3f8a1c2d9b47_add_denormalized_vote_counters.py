@@ -0,0 +1,48 @@
+"""add denormalized vote counters
+
+Revision ID: 3f8a1c2d9b47
+Revises: e07ef69ec28e
+Create Date: 2026-10-18 10:12:41.208315
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f8a1c2d9b47"
+down_revision: str | Sequence[str] | None = "e07ef69ec28e"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "reports", sa.Column("vote_count", sa.Integer(), server_default="0", nullable=False)
+    )
+    op.add_column(
+        "exam_events", sa.Column("total_votes", sa.Integer(), server_default="0", nullable=False)
+    )
+
+    # Backfill from existing Vote rows (same logic as ReportService.recompute_vote_counters).
+    op.execute(
+        "UPDATE reports SET vote_count = "
+        "(SELECT COUNT(votes.id) FROM votes WHERE votes.report_id = reports.id)"
+    )
+    op.execute(
+        "UPDATE exam_events SET total_votes = "
+        "(SELECT COALESCE(SUM(reports.vote_count), 0) FROM reports "
+        "WHERE reports.event_id = exam_events.id)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("exam_events", schema=None) as batch_op:
+        batch_op.drop_column("total_votes")
+    with op.batch_alter_table("reports", schema=None) as batch_op:
+        batch_op.drop_column("vote_count")
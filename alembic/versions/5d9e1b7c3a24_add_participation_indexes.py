@@ -0,0 +1,29 @@
+"""add participation indexes
+
+Revision ID: 5d9e1b7c3a24
+Revises: c7b2e4f19a60
+Create Date: 2026-10-18 13:05:41.602318
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5d9e1b7c3a24"
+down_revision: str | Sequence[str] | None = "c7b2e4f19a60"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_reports_event_user", "reports", ["event_id", "user_id"], unique=False)
+    op.create_index("ix_votes_user_report", "votes", ["user_id", "report_id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_votes_user_report", table_name="votes")
+    op.drop_index("ix_reports_event_user", table_name="reports")
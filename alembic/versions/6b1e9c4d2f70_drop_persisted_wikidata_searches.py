@@ -0,0 +1,29 @@
+"""drop persisted wikidata searches
+
+Revision ID: 6b1e9c4d2f70
+Revises: a8e3d51f7c29
+Create Date: 2026-10-18 21:42:10.318604
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "6b1e9c4d2f70"
+down_revision: str | Sequence[str] | None = "a8e3d51f7c29"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Search results are now cached per worker only; the rows written per keystroke
+    # would otherwise sit in the table forever.
+    op.execute("DELETE FROM wikidata_cache WHERE key LIKE 'search:%'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Nothing to restore: searches are simply refetched.
@@ -0,0 +1,85 @@
+"""add event consensus snapshot table
+
+Revision ID: 8c5e2f7a1d03
+Revises: 3f8a1c2d9b47
+Create Date: 2026-10-18 11:02:17.530142
+
+"""
+
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from itertools import groupby
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8c5e2f7a1d03"
+down_revision: str | Sequence[str] | None = "3f8a1c2d9b47"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Frozen copies of app.core.constants.Consensus at the time of this migration.
+MIN_VOTES_FOR_VERIFICATION = 2
+VERIFICATION_THRESHOLD = 0.75
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    event_consensus = op.create_table(
+        "event_consensus",
+        sa.Column("event_id", sa.Integer(), nullable=False),
+        sa.Column("report_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("total_votes", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("event_status", sa.String(), server_default="empty", nullable=False),
+        sa.Column("top_report_id", sa.Integer(), nullable=True),
+        sa.Column("top_percentage", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("has_verified", sa.Boolean(), server_default=sa.false(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["event_id"], ["exam_events.id"]),
+        sa.ForeignKeyConstraint(["top_report_id"], ["reports.id"]),
+        sa.PrimaryKeyConstraint("event_id"),
+    )
+
+    # Backfill from the denormalized Report.vote_count counters.
+    rows = op.get_bind().execute(
+        sa.text(
+            "SELECT event_id, id, vote_count FROM reports ORDER BY event_id, vote_count DESC, id"
+        )
+    )
+    now = datetime.now(timezone.utc)
+    snapshots = []
+    for event_id, group in groupby(rows, key=lambda r: r.event_id):
+        reports = list(group)
+        total_votes = sum(r.vote_count for r in reports)
+        top = reports[0]
+        rate = top.vote_count / total_votes if total_votes > 0 else 0
+        has_verified = (
+            top.vote_count >= MIN_VOTES_FOR_VERIFICATION and rate >= VERIFICATION_THRESHOLD
+        )
+        if total_votes == 0:
+            event_status = "empty"
+        elif total_votes == 1:
+            event_status = "neutral"
+        else:
+            event_status = "resolved" if has_verified else "disputed"
+        snapshots.append(
+            {
+                "event_id": event_id,
+                "report_count": len(reports),
+                "total_votes": total_votes,
+                "event_status": event_status,
+                "top_report_id": top.id,
+                "top_percentage": int(rate * 100),
+                "has_verified": has_verified,
+                "updated_at": now,
+            }
+        )
+    if snapshots:
+        op.bulk_insert(event_consensus, snapshots)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("event_consensus")
@@ -0,0 +1,91 @@
+"""add composer and work search index
+
+Revision ID: 9b4c2e8d6f13
+Revises: e3a8f0c6b912
+Create Date: 2026-10-18 14:20:06.519274
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9b4c2e8d6f13"
+down_revision: str | Sequence[str] | None = "e3a8f0c6b912"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Frozen copy of app/db/search_index.py at this revision.
+SEARCH_INDEX_DDL = [
+    """
+    CREATE VIRTUAL TABLE composers_fts USING fts5(
+        name,
+        content='composers', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER composers_fts_ai AFTER INSERT ON composers BEGIN
+        INSERT INTO composers_fts(rowid, name) VALUES (new.id, new.name);
+    END
+    """,
+    """
+    CREATE TRIGGER composers_fts_ad AFTER DELETE ON composers BEGIN
+        INSERT INTO composers_fts(composers_fts, rowid, name) VALUES ('delete', old.id, old.name);
+    END
+    """,
+    """
+    CREATE TRIGGER composers_fts_au AFTER UPDATE OF name ON composers BEGIN
+        INSERT INTO composers_fts(composers_fts, rowid, name) VALUES ('delete', old.id, old.name);
+        INSERT INTO composers_fts(rowid, name) VALUES (new.id, new.name);
+    END
+    """,
+    """
+    CREATE VIRTUAL TABLE works_fts USING fts5(
+        title, nickname,
+        content='works', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER works_fts_ai AFTER INSERT ON works BEGIN
+        INSERT INTO works_fts(rowid, title, nickname) VALUES (new.id, new.title, new.nickname);
+    END
+    """,
+    """
+    CREATE TRIGGER works_fts_ad AFTER DELETE ON works BEGIN
+        INSERT INTO works_fts(works_fts, rowid, title, nickname)
+        VALUES ('delete', old.id, old.title, old.nickname);
+    END
+    """,
+    """
+    CREATE TRIGGER works_fts_au AFTER UPDATE OF title, nickname ON works BEGIN
+        INSERT INTO works_fts(works_fts, rowid, title, nickname)
+        VALUES ('delete', old.id, old.title, old.nickname);
+        INSERT INTO works_fts(rowid, title, nickname) VALUES (new.id, new.title, new.nickname);
+    END
+    """,
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # FTS5 is SQLite-only; other dialects keep the substring search fallback.
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for statement in SEARCH_INDEX_DDL:
+        op.execute(statement)
+    op.execute("INSERT INTO composers_fts(composers_fts) VALUES ('rebuild')")
+    op.execute("INSERT INTO works_fts(works_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for trigger in ("ai", "ad", "au"):
+        op.execute(f"DROP TRIGGER IF EXISTS composers_fts_{trigger}")
+        op.execute(f"DROP TRIGGER IF EXISTS works_fts_{trigger}")
+    op.execute("DROP TABLE IF EXISTS composers_fts")
+    op.execute("DROP TABLE IF EXISTS works_fts")
@@ -0,0 +1,32 @@
+"""add exam events timeline index
+
+Revision ID: a41d6e9b3c58
+Revises: 8c5e2f7a1d03
+Create Date: 2026-10-18 11:48:05.114729
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a41d6e9b3c58"
+down_revision: str | Sequence[str] | None = "8c5e2f7a1d03"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_exam_events_region_discipline_year",
+        "exam_events",
+        ["region_id", "discipline_id", "year"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_exam_events_region_discipline_year", table_name="exam_events")
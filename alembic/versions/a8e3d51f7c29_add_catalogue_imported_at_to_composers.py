@@ -0,0 +1,32 @@
+"""add catalogue imported at to composers
+
+Revision ID: a8e3d51f7c29
+Revises: f2d7a9c4b861
+Create Date: 2026-10-18 19:20:37.508112
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a8e3d51f7c29"
+down_revision: str | Sequence[str] | None = "f2d7a9c4b861"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "composers",
+        sa.Column("catalogue_imported_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("composers", "catalogue_imported_at")
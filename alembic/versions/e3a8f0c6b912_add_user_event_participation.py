@@ -0,0 +1,49 @@
+"""add user event participation
+
+Revision ID: e3a8f0c6b912
+Revises: 5d9e1b7c3a24
+Create Date: 2026-10-18 13:42:17.338905
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e3a8f0c6b912"
+down_revision: str | Sequence[str] | None = "5d9e1b7c3a24"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "user_event_participation",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("event_id", sa.Integer(), nullable=False),
+        sa.Column("report_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["event_id"], ["exam_events.id"]),
+        sa.ForeignKeyConstraint(["report_id"], ["reports.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("user_id", "event_id"),
+    )
+    # Backfill from existing votes. If a race already let a user vote twice in an event,
+    # keep the one with the lowest report id.
+    op.execute(
+        """
+        INSERT INTO user_event_participation (user_id, event_id, report_id, created_at)
+        SELECT votes.user_id, reports.event_id, MIN(votes.report_id), MIN(votes.created_at)
+        FROM votes JOIN reports ON reports.id = votes.report_id
+        GROUP BY votes.user_id, reports.event_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("user_event_participation")
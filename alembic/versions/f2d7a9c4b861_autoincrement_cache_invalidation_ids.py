@@ -0,0 +1,46 @@
+"""autoincrement cache invalidation ids
+
+Revision ID: f2d7a9c4b861
+Revises: deef9100352e
+Create Date: 2026-10-18 18:42:10.114306
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2d7a9c4b861"
+down_revision: str | Sequence[str] | None = "deef9100352e"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def _create_table(**kwargs: bool) -> None:
+    op.create_table(
+        "cache_invalidations",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("key", sa.String(), nullable=False),
+        sa.Column("origin", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        **kwargs,
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Without AUTOINCREMENT SQLite reuses ids from 1 once pruning empties the table, and
+    # workers polling for ids above the last one seen miss every later key. The rows are
+    # short-lived relay messages (workers restart on deploy), so the table is recreated.
+    op.drop_table("cache_invalidations")
+    _create_table(sqlite_autoincrement=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("cache_invalidations")
+    _create_table()
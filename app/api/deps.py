@@ -1,23 +1,30 @@
 import logging
+from typing import Any
 
 import jwt
 from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy import event, literal, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import Session
 
 from app.core.security import verify_token
-from app.db.session import get_db
-from app.models import Report, User, Vote
+from app.db.session import get_read_db
+from app.models import Report, Vote
+from app.services.identity_service import IdentityService, UserIdentity
 
 logger = logging.getLogger("uvicorn")
 
+# Session.info key for the per-session (= per-request, see get_write_db) participation memo.
+PARTICIPATION_MEMO_KEY = "participation"
+
 
 async def _get_user_from_request(
     request: Request,
     db: AsyncSession,
     *,
     required: bool,
-) -> User | None:
+) -> UserIdentity | None:
     token = request.cookies.get("access_token")
     if not token:
         auth_header = request.headers.get("Authorization")
@@ -51,14 +58,13 @@ async def _get_user_from_request(
                 )
             return None
 
-        result = await db.execute(select(User).filter(User.email == user_email))
-        user = result.scalar_one_or_none()
+        user = await IdentityService.resolve(db, payload)
 
         if not user:
             if required:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="User not found",
+                    detail="User not found or session revoked",
                 )
             return None
 
@@ -74,18 +80,37 @@ async def _get_user_from_request(
         return None
 
 
-async def get_current_user(request: Request, db: AsyncSession = Depends(get_db)) -> User:
+async def get_current_user(
+    request: Request, db: AsyncSession = Depends(get_read_db)
+) -> UserIdentity:
     user = await _get_user_from_request(request, db, required=True)
     assert user is not None  # required=True guarantees raise-or-return
     return user
 
 
 async def get_current_user_optional(
-    request: Request, db: AsyncSession = Depends(get_db)
-) -> User | None:
+    request: Request, db: AsyncSession = Depends(get_read_db)
+) -> UserIdentity | None:
     return await _get_user_from_request(request, db, required=False)
 
 
+def _participation_memo(db: AsyncSession) -> dict[tuple[int, int], tuple[bool, int | None]]:
+    memo: dict[tuple[int, int], tuple[bool, int | None]]
+    memo = db.info.setdefault(PARTICIPATION_MEMO_KEY, {})
+    return memo
+
+
+def remember_participation(db: AsyncSession, user_id: int, event_id: int, report_id: int) -> None:
+    """Record a participation written in this session so later checks needn't re-query."""
+    _participation_memo(db)[(user_id, event_id)] = (True, report_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_participation(session: Session, previous_transaction: Any) -> None:
+    # A rolled-back vote/report no longer counts; the next check goes back to the database.
+    session.info.pop(PARTICIPATION_MEMO_KEY, None)
+
+
 async def check_user_event_participation(
     db: AsyncSession,
     user_id: int,
@@ -93,20 +118,27 @@ async def check_user_event_participation(
 ) -> tuple[bool, int | None]:
     """Return (has_participated, report_id_or_none).
 
-    Checks first for an existing Report by this user, then for a Vote on any
-    Report in the event. Returns the relevant report.id so callers can render
-    participation UI.
+    A single query over the user's own Report in the event (preferred) and any Vote they
+    cast on one of its Reports, served by the (event_id, user_id) and (user_id, report_id)
+    indexes. The answer is memoized on the session, so one request never asks twice.
     """
-    existing_report = await db.execute(
-        select(Report).filter(Report.event_id == event_id, Report.user_id == user_id)
-    )
-    if existing_event_report := existing_report.scalars().first():
-        return True, int(existing_event_report.id)
+    memo = _participation_memo(db)
+    if (user_id, event_id) in memo:
+        return memo[(user_id, event_id)]
 
-    existing_vote_result = await db.execute(
-        select(Vote).join(Report).filter(Report.event_id == event_id, Vote.user_id == user_id)
+    own_report = select(Report.id.label("report_id"), literal(0).label("priority")).filter(
+        Report.event_id == event_id, Report.user_id == user_id
+    )
+    voted_report = (
+        select(Vote.report_id, literal(1))
+        .join(Report, Report.id == Vote.report_id)
+        .filter(Report.event_id == event_id, Vote.user_id == user_id)
+    )
+    candidates = union_all(own_report, voted_report).subquery()
+    result = await db.execute(
+        select(candidates.c.report_id).order_by(candidates.c.priority).limit(1)
     )
-    if existing_vote := existing_vote_result.scalars().first():
-        return True, int(existing_vote.report_id)
+    report_id = result.scalar_one_or_none()
 
-    return False, None
+    memo[(user_id, event_id)] = (True, int(report_id)) if report_id is not None else (False, None)
+    return memo[(user_id, event_id)]
@@ -12,8 +12,9 @@ from app.core import security
 from app.core.config import settings
 from app.core.constants import RateLimit
 from app.core.limiter import limiter
-from app.db.session import get_db
+from app.db.session import get_write_db
 from app.models import User
+from app.services.identity_service import UserIdentity
 
 router = APIRouter()
 
@@ -38,7 +39,7 @@ class MagicLinkRequest(BaseModel):
 )
 @limiter.limit(RateLimit.MAGIC_LINK_REQUEST)
 async def request_magic_link(
-    request: Request, request_data: MagicLinkRequest, db: AsyncSession = Depends(get_db)
+    request: Request, request_data: MagicLinkRequest, db: AsyncSession = Depends(get_write_db)
 ) -> dict[str, str]:
     """Generate a magic link and send it to the user's email. Auto-registers unknown addresses."""
     email = request_data.email
@@ -54,9 +55,7 @@ async def request_magic_link(
         await db.refresh(user)
 
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = security.create_access_token(
-        data={"sub": user.email, "role": user.role}, expires_delta=access_token_expires
-    )
+    access_token = security.create_session_token(user, expires_delta=access_token_expires)
 
     # In production, send email. Here, logging.
     # Dynamic base URL to match the user's current host (localhost vs 127.0.0.1)
@@ -126,6 +125,8 @@ async def verify_magic_link(
         401: {"description": "Missing or invalid session cookie"},
     },
 )
-async def read_users_me(current_user: User = Depends(deps.get_current_user)) -> dict[str, Any]:
+async def read_users_me(
+    current_user: UserIdentity = Depends(deps.get_current_user),
+) -> dict[str, Any]:
     """Return the email, role, and ID of the currently authenticated user."""
     return {"email": current_user.email, "role": current_user.role, "id": current_user.id}
@@ -1,12 +1,15 @@
+from collections.abc import Sequence
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 
-from app.db.session import get_db
+from app.core.http import UpstreamUnavailable
+from app.db.session import get_read_db
 from app.models import Composer
 from app.services import wikidata
+from app.services.search_service import SearchService
+from app.services.typeahead_service import ComposerSuggestion, TypeaheadService
 
 router = APIRouter()
 
@@ -17,38 +20,49 @@ router = APIRouter()
     summary="Search for composers by name",
     description=(
         "Search composers by name against the local database or Wikidata. "
-        "Local results are limited to 10 entries and match any substring. "
-        "Wikidata results are fetched live via SPARQL and include the Wikidata entity ID."
+        "Local results are limited to 10 entries, ranked by relevance; every word matches as a "
+        "prefix, ignoring accents (e.g. `dvor` finds Dvořák). "
+        "Wikidata results come from the Wikidata search API (cached for a day) and include the "
+        "Wikidata entity ID; while Wikidata is unavailable, local results are returned instead."
     ),
     responses={
         200: {"description": "List of matching composers"},
-        500: {"description": "Upstream search error (e.g. Wikidata unavailable)"},
+        500: {"description": "Unexpected search error"},
     },
 )
 async def search_composers(
     q: str = Query(..., min_length=2, description="Name of the composer to search for"),
     source: str = Query("local", description="Source to search: 'local' or 'wikidata'"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> list[Any]:
     """Search composers by name in the local DB or via the Wikidata SPARQL endpoint."""
     try:
         if source == "wikidata":
-            results = await wikidata.search_composer(q)
-            return results
+            try:
+                results = await wikidata.search_composer(q)
+                return results
+            except UpstreamUnavailable:
+                # Wikidata is down or its circuit is open: answer from what we have locally.
+                return await _search_local(db, q)
         else:
-            # Local search
-            stmt = select(Composer).filter(Composer.name.ilike(f"%{q}%")).limit(10)
-            result = await db.execute(stmt)
-            composers = result.scalars().all()
-            return [
-                {
-                    "id": c.id,
-                    "name": c.name,
-                    "wikidata_id": c.wikidata_id,
-                    "openopus_id": c.openopus_id,
-                    "is_verified": c.is_verified,
-                }
-                for c in composers
-            ]
+            return await _search_local(db, q)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+async def _search_local(db: AsyncSession, q: str) -> list[dict[str, Any]]:
+    # Local search: in-process typeahead index, FTS until it has loaded
+    composers: Sequence[Composer | ComposerSuggestion] | None
+    composers = await TypeaheadService.suggest_composers(db, q)
+    if composers is None:
+        composers = await SearchService.search_composers(db, q)
+    return [
+        {
+            "id": c.id,
+            "name": c.name,
+            "wikidata_id": c.wikidata_id,
+            "openopus_id": c.openopus_id,
+            "is_verified": c.is_verified,
+        }
+        for c in composers
+    ]
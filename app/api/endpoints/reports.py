@@ -6,10 +6,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import deps
 from app.core.constants import RateLimit
 from app.core.limiter import limiter
-from app.db.session import get_db
-from app.models import Report, User
+from app.db.session import get_write_db
+from app.models import Report
 from app.schemas.report import ReportCreate, ReportResponse
 from app.services.consensus import ConsensusService
+from app.services.identity_service import UserIdentity
 from app.services.report_service import ReportService
 
 templates = Jinja2Templates(directory="app/templates")
@@ -39,8 +40,8 @@ router = APIRouter()
 async def create_report(
     request: Request,
     report_in: ReportCreate,
-    current_user: User = Depends(deps.get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: UserIdentity = Depends(deps.get_current_user),
+    db: AsyncSession = Depends(get_write_db),
 ) -> Report:
     """Create a report linking a work to an exam event, casting an implicit vote for the submitter."""
     return await ReportService.submit_report(db, current_user, report_in)
@@ -65,14 +66,14 @@ async def create_report(
 async def vote_report(
     request: Request,
     report_id: int,
-    current_user: User | None = Depends(deps.get_current_user_optional),
-    db: AsyncSession = Depends(get_db),
+    current_user: UserIdentity | None = Depends(deps.get_current_user_optional),
+    db: AsyncSession = Depends(get_write_db),
 ) -> HTMLResponse:
     report = await ReportService.fetch_report_with_context(db, report_id)
     if not report:
         raise HTTPException(status_code=404, detail="Reporte no encontrado")
 
-    total_votes = sum(len(r.votes) for r in report.event.reports)
+    total_votes = report.event.total_votes
 
     if not current_user:
         item = ReportService.build_item_dict(report, total_votes)
@@ -91,24 +92,19 @@ async def vote_report(
             },
         )
 
-    has_participated, _ = await deps.check_user_event_participation(
-        db, int(current_user.id), int(report.event_id)
-    )
-    if has_participated:
-        raise HTTPException(status_code=400, detail="Ya has participado en esta convocatoria.")
+    vote_counts = await ReportService.cast_vote(db, int(current_user.id), report)
+    # Re-render from the context loaded above plus the counters the vote just wrote,
+    # instead of expiring the session and re-fetching every sibling report.
+    ReportService.apply_vote_counts(report, vote_counts)
 
-    await ReportService.cast_vote(db, int(current_user.id), report)
-
-    db.expire_all()
-    report = await ReportService.fetch_report_with_context(db, report_id)
-    assert report is not None
-
-    total_votes = sum(len(r.votes) for r in report.event.reports)
+    total_votes = report.event.total_votes
     target_item = ReportService.build_item_dict(report, total_votes)
+    # Every sibling card changes too: its percentage moved and its vote button is now
+    # "Participado".
     other_items = [
         ReportService.build_item_dict(r, total_votes)
         for r in report.event.reports
-        if r.id != report.id
+        if r.id != report.id and r.id in vote_counts
     ]
     event_status = ConsensusService.aggregate_event_reports(report.event.reports)["event_status"]
 
@@ -119,6 +115,7 @@ async def vote_report(
             "item": target_item,
             "other_items": other_items,
             "event_status": event_status,
+            "update_banner": True,
             "user_has_participated": True,
             "user_participation_report_id": report.id,
         },
@@ -142,14 +139,14 @@ async def vote_report(
 async def flag_report(
     request: Request,
     report_id: int,
-    current_user: User | None = Depends(deps.get_current_user_optional),
-    db: AsyncSession = Depends(get_db),
+    current_user: UserIdentity | None = Depends(deps.get_current_user_optional),
+    db: AsyncSession = Depends(get_write_db),
 ) -> HTMLResponse:
     report = await ReportService.fetch_report_with_context(db, report_id)
     if not report:
         raise HTTPException(status_code=404, detail="Reporte no encontrado")
 
-    total_votes = sum(len(r.votes) for r in report.event.reports)
+    total_votes = report.event.total_votes
 
     if not current_user:
         item = ReportService.build_item_dict(report, total_votes)
@@ -165,19 +162,9 @@ async def flag_report(
 
     await ReportService.set_flagged(db, report)
 
-    db.expire_all()
-    report = await ReportService.fetch_report_with_context(db, report_id)
-    assert report is not None
-
-    total_votes = sum(len(r.votes) for r in report.event.reports)
+    # A flag changes neither the counts nor the event status: only this card is
+    # re-rendered, from the context loaded above.
     target_item = ReportService.build_item_dict(report, total_votes)
-    target_item["is_flagged"] = True
-    other_items = [
-        ReportService.build_item_dict(r, total_votes)
-        for r in report.event.reports
-        if r.id != report.id
-    ]
-    event_status = ConsensusService.aggregate_event_reports(report.event.reports)["event_status"]
 
     user_has_participated, user_participation_report_id = await deps.check_user_event_participation(
         db, int(current_user.id), int(report.event_id)
@@ -188,8 +175,6 @@ async def flag_report(
         "partials/vote_updates.html",
         {
             "item": target_item,
-            "other_items": other_items,
-            "event_status": event_status,
             "user_has_participated": user_has_participated,
             "user_participation_report_id": user_participation_report_id,
         },
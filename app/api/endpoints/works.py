@@ -1,12 +1,17 @@
+from collections.abc import Sequence
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
-from app.db.session import get_db
-from app.models import Work
+from app.core.http import UpstreamUnavailable
+from app.db.session import get_read_db
+from app.models import Composer, Work
 from app.services import openopus
+from app.services.openopus_import_service import OpenOpusImportService
+from app.services.search_service import SearchService
+from app.services.typeahead_service import TypeaheadService, WorkSuggestion
 
 router = APIRouter()
 
@@ -17,13 +22,17 @@ router = APIRouter()
     summary="Search for musical works by title",
     description=(
         "Search works by title (and optionally nickname) against the local database or the OpenOpus API. "
-        "Local results match any substring of title or nickname and are capped at 20. "
-        "OpenOpus results require `composer_id` (the OpenOpus composer ID) and are fetched live."
+        "Local results match every word as a prefix of the title or nickname, ignoring accents, "
+        "ranked by relevance and capped at 20. "
+        "OpenOpus results require `composer_id` (the OpenOpus composer ID). They come from the "
+        "local mirror when that composer's catalogue has been imported, otherwise from a cached "
+        "copy of the catalogue; while OpenOpus is unavailable and nothing is cached, "
+        "the local works of the composer with that OpenOpus ID are returned instead."
     ),
     responses={
         200: {"description": "List of matching works"},
         400: {"description": "`composer_id` is required when `source=openopus`"},
-        500: {"description": "Upstream search error (e.g. OpenOpus unavailable)"},
+        500: {"description": "Unexpected search error"},
     },
 )
 async def search_works(
@@ -32,7 +41,7 @@ async def search_works(
     composer_id: str | None = Query(
         None, description="Composer ID (local integer ID for local search, OpenOpus ID for remote)"
     ),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> list[Any]:
     """Search musical works by title in the local DB or via the OpenOpus API."""
     try:
@@ -43,38 +52,54 @@ async def search_works(
                 raise HTTPException(
                     status_code=400, detail="composer_id is required for OpenOpus search"
                 )
-            results = await openopus.search_work(q, composer_id=composer_id)
+            # Catalogue imported by scripts/import_openopus.py: no need to ask OpenOpus.
+            mirrored_id = await OpenOpusImportService.mirrored_composer_id(db, composer_id)
+            if mirrored_id is not None:
+                return await _search_local(db, q, mirrored_id)
+            try:
+                results = await openopus.search_work(q, composer_id=composer_id)
+            except UpstreamUnavailable:
+                # OpenOpus is down or its circuit is open: search the works we already
+                # imported for the composer with this OpenOpus id.
+                local_id = await db.scalar(
+                    select(Composer.id).filter(Composer.openopus_id == composer_id)
+                )
+                return [] if local_id is None else await _search_local(db, q, local_id)
             # Map OpenOpus results to unified format if needed, but service now returns consistent dict
             return results
         else:
             # Local search
-            stmt = select(Work).filter(
-                (Work.title.ilike(f"%{q}%")) | (Work.nickname.ilike(f"%{q}%"))
-            )
-
+            local_composer_id = None
             if composer_id:
                 # Ensure composer_id is integer for local
                 try:
-                    c_id = int(composer_id)
-                    stmt = stmt.filter(Work.composer_id == c_id)
+                    local_composer_id = int(composer_id)
                 except ValueError:
                     pass  # Ignore invalid ID format for local search
-
-            stmt = stmt.limit(20)
-            result = await db.execute(stmt)
-            works = result.scalars().all()
-            return [
-                {
-                    "id": w.id,
-                    "title": w.title,
-                    "nickname": w.nickname,
-                    "openopus_id": w.openopus_id,
-                    "composer_id": w.composer_id,
-                    "is_verified": w.is_verified,
-                }
-                for w in works
-            ]
+            return await _search_local(db, q, local_composer_id)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+async def _search_local(
+    db: AsyncSession, q: str, local_composer_id: int | None
+) -> list[dict[str, Any]]:
+    # The typeahead index only covers per-composer lookups (the wizard's case).
+    works: Sequence[Work | WorkSuggestion] | None = None
+    if local_composer_id is not None:
+        works = await TypeaheadService.suggest_works(db, q, local_composer_id)
+    if works is None:
+        works = await SearchService.search_works(db, q, local_composer_id)
+    return [
+        {
+            "id": w.id,
+            "title": w.title,
+            "nickname": w.nickname,
+            "openopus_id": w.openopus_id,
+            "composer_id": w.composer_id,
+            "is_verified": w.is_verified,
+        }
+        for w in works
+    ]
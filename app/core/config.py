@@ -3,6 +3,9 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # Optional engine for read-only traffic (e.g. a PostgreSQL replica). Unset on SQLite,
+    # where reads open DATABASE_URL's file in read-only mode instead.
+    DATABASE_READ_URL: str | None = None
     SECRET_KEY: str
     ENVIRONMENT: str = "development"
     PROJECT_NAME: str = "WikiAnálisis"
@@ -20,6 +23,41 @@ class Settings(BaseSettings):
     # Monitoring
     SENTRY_DSN: str | None = None
 
+    # Cross-worker cache invalidation: "local", "database" or "redis" (see app/core/invalidation.py)
+    CACHE_BUS_BACKEND: str = "local"
+    REDIS_URL: str | None = None
+    # Worker processes serving the app (start.sh passes it to gunicorn as --workers).
+    WEB_CONCURRENCY: int = 1
+
+    # Memory all workers together may spend on open live-update streams (per VM). Each
+    # worker accepts this / WEB_CONCURRENCY / LiveUpdates.STREAM_MEMORY_KB streams, i.e.
+    # ~1300 per worker with start.sh's 4 workers, ~5200 with a single one.
+    LIVE_UPDATES_MEMORY_BUDGET_MB: int = 256
+
+    # Batch votes per worker into shared transactions instead of one commit per vote
+    # (see app/services/vote_queue_service.py).
+    VOTE_WRITE_BEHIND: bool = False
+
+    # Optional directory for cached OpenOpus work catalogues, so they survive restarts
+    # (see app/services/openopus.py). Unset keeps them in memory only.
+    OPENOPUS_CACHE_DIR: str | None = None
+
+    # SQLite connection profile, applied to every pooled connection (see app/db/session.py).
+    # WAL lets readers run alongside the single writer; busy_timeout makes a writer wait for
+    # the lock instead of failing with "database is locked" when the 4 workers collide.
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    # cache_size is per connection, not per database. Worst case per VM: workers x pooled
+    # connections (Database.WRITE_* + READ_* = 22) x cache, i.e. 4 x 22 x 2 MB ~ 176 MB
+    # with start.sh's defaults. Reads are mostly served from the mmap, which is the OS
+    # page cache and shared by every connection and worker, so a small cache is enough.
+    SQLITE_CACHE_SIZE: int = -2000  # negative = KiB, i.e. ~2 MB of page cache
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    # check_sqlite_pragmas warns at startup when that worst case exceeds this (per VM).
+    SQLITE_CACHE_BUDGET_MB: int = 256
+
     model_config = SettingsConfigDict(env_file=".env", env_ignore_empty=True)
 
 
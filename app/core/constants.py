@@ -2,6 +2,36 @@ class Pagination:
     DEFAULT_BATCH_SIZE = 10
 
 
+class Database:
+    # Write pool. Writes serialize on SQLite's lock anyway, so a few connections suffice.
+    WRITE_POOL_SIZE = 5
+    WRITE_POOL_MAX_OVERFLOW = 5
+    # Read-only pool (page views, search). Readers don't take SQLite's write lock under WAL,
+    # so a larger pool than the writer's adds concurrency without contention. Each
+    # connection carries its own SQLITE_CACHE_SIZE page cache: keep the total small.
+    READ_POOL_SIZE = 8
+    READ_POOL_MAX_OVERFLOW = 4
+
+
+class Http:
+    # Outbound calls sit on the request path (wizard search, report submit): fail fast
+    # rather than hold a worker on a slow upstream.
+    CONNECT_TIMEOUT_SECONDS = 3.0
+    READ_TIMEOUT_SECONDS = 5.0
+    POOL_TIMEOUT_SECONDS = 2.0
+    # Per-worker pool per upstream. Search upstreams see bursts of keystrokes; Turnstile
+    # only one call per report submission.
+    SEARCH_MAX_CONNECTIONS = 10
+    SEARCH_MAX_KEEPALIVE_CONNECTIONS = 5
+    TURNSTILE_MAX_CONNECTIONS = 2
+    # Idle connections are kept this long; long enough to span a user's wizard session.
+    KEEPALIVE_EXPIRY_SECONDS = 60.0
+    # Circuit breaker: consecutive upstream failures (timeouts, 5xx) before failing fast,
+    # and how long to fail fast before letting one trial request through.
+    BREAKER_FAILURE_THRESHOLD = 5
+    BREAKER_RESET_SECONDS = 30.0
+
+
 class Calendar:
     # Month (inclusive) at which the current year is used as anchor; before it, prior year is used.
     ACADEMIC_YEAR_CUTOFF_MONTH = 6
@@ -18,6 +48,70 @@ class Consensus:
     VERIFICATION_THRESHOLD = 0.75
 
 
+class Search:
+    # Local search result caps (composer step / work step of the contribution wizard).
+    COMPOSER_RESULTS_LIMIT = 10
+    WORK_RESULTS_LIMIT = 20
+    # bm25() column weights for works_fts: a title hit outranks a nickname hit.
+    WORK_TITLE_WEIGHT = 2.0
+    WORK_NICKNAME_WEIGHT = 1.0
+    # In-process typeahead: composers + works held per worker. Past this the index is not
+    # built and search falls back to FTS, bounding each worker's memory: ~190 bytes per
+    # entry (scripts/bench_typeahead.py), so ~45 MB per worker at the cap, twice that
+    # briefly while a rebuild is swapped in.
+    TYPEAHEAD_MAX_ENTRIES = 250_000
+    # Rows indexed between yields to the event loop while the index is (re)built.
+    TYPEAHEAD_BUILD_CHUNK = 5000
+    # Prefixes up to this length match too many composers to scan per keystroke, so their
+    # ranked top-k lists are precomputed; longer prefixes bisect and scan at most
+    # MAX_CANDIDATES keys.
+    TYPEAHEAD_PRECOMPUTED_PREFIX_LENGTH = 3
+    TYPEAHEAD_PREFIX_TOP_K = 20
+    TYPEAHEAD_MAX_CANDIDATES = 200
+    # Rows added outside this app (seed/import scripts) are picked up at least this often.
+    TYPEAHEAD_REFRESH_SECONDS = 300
+    # Full rebuild interval: catch-ups only add rows, so renames, relinked OpenOpus ids and
+    # deletions wait for this.
+    TYPEAHEAD_RELOAD_SECONDS = 3600
+
+
+class Sitemap:
+    # Protocol limit per sitemap file; past it /sitemap.xml becomes an index of child files.
+    MAX_URLS_PER_FILE = 50_000
+    # URLs per chunk written to the streamed response.
+    STREAM_CHUNK_URLS = 1000
+
+
+class LiveUpdates:
+    # Server-sent consensus updates on exam pages. Writes within one interval are coalesced
+    # into a single query per worker and at most one message per event.
+    COALESCE_INTERVAL_SECONDS = 1.0
+    # Comment line sent on idle streams so proxies keep them open and dead clients are
+    # noticed.
+    HEARTBEAT_SECONDS = 25.0
+    # Reconnect delay advertised to browsers (EventSource ``retry``).
+    RETRY_MILLISECONDS = 5000
+    # Measured resident memory of one idle open stream (2000 streams took a worker from
+    # 86 MB to 187 MB RSS). With Settings.LIVE_UPDATES_MEMORY_BUDGET_MB it sets how many
+    # streams a worker accepts; past that new ones get a 503 and the page stays static.
+    STREAM_MEMORY_KB = 50
+
+
+class VoteQueue:
+    # Write-behind vote ingestion (Settings.VOTE_WRITE_BEHIND): a batch is committed once it
+    # holds MAX_BATCH_VOTES votes or FLUSH_INTERVAL_SECONDS after its first vote, whichever
+    # comes first. The interval is the most a vote waits on a quiet site.
+    FLUSH_INTERVAL_SECONDS = 0.01
+    MAX_BATCH_VOTES = 200
+    # Votes waiting per worker; past it callers wait for room instead of growing the queue.
+    MAX_PENDING_VOTES = 5000
+    # A batch failing with a database error (usually "database is locked" while another
+    # worker holds the write lock) is retried this many times in all, backing off
+    # RETRY_BACKOFF_SECONDS more each time, before its votes are answered with a 503.
+    MAX_WRITE_ATTEMPTS = 3
+    RETRY_BACKOFF_SECONDS = 0.05
+
+
 class RateLimit:
     # slowapi limit strings, keyed by remote address (per-IP).
     MAGIC_LINK_REQUEST = "5/minute"
@@ -31,3 +125,41 @@ class Cache:
     # takes to show up rather than guarding against real staleness.
     REFERENCE_DATA_TTL_SECONDS = 3600
     REFERENCE_DATA_MAX_ENTRIES = 64
+    # Anonymous exam/discipline pages. Writes evict them on every worker through the
+    # invalidation bus; the TTL is a backstop if a relay is ever lost.
+    PAGE_CACHE_TTL_SECONDS = 60
+    PAGE_CACHE_MAX_ENTRIES = 512
+    # Cross-worker invalidation (database backend): how often each worker polls for keys
+    # published by the others, and how long published rows are kept before pruning.
+    INVALIDATION_POLL_INTERVAL_SECONDS = 0.1
+    INVALIDATION_RETENTION_SECONDS = 3600
+    # Redis backend: wait before resubscribing after the pub/sub connection drops.
+    INVALIDATION_RECONNECT_SECONDS = 1.0
+    # OpenOpus work catalogues barely change: served fresh for a day, then served stale for
+    # up to a week while a background refetch runs. Past that they are refetched inline.
+    OPENOPUS_CATALOGUE_TTL_SECONDS = 24 * 3600
+    OPENOPUS_CATALOGUE_STALE_SECONDS = 7 * 24 * 3600
+    OPENOPUS_CATALOGUE_MAX_ENTRIES = 256
+    # Wikidata lookups (per-worker LRU over the shared wikidata_cache table). Entities
+    # (names, dates) almost never change; search hits drift as items are edited; misses
+    # expire quickly so a newly created item becomes findable.
+    WIKIDATA_ENTITY_TTL_SECONDS = 30 * 24 * 3600
+    WIKIDATA_SEARCH_TTL_SECONDS = 24 * 3600
+    WIKIDATA_NEGATIVE_TTL_SECONDS = 3600
+    WIKIDATA_MEMORY_MAX_ENTRIES = 1024
+    # How often a worker sweeps expired rows out of wikidata_cache, piggybacking on a
+    # write it is already making.
+    WIKIDATA_PRUNE_INTERVAL_SECONDS = 3600
+    # Rendered sitemap files. Votes/reports clear them through the page invalidation keys;
+    # the TTL only bounds staleness from writes made outside the app (scripts).
+    SITEMAP_TTL_SECONDS = 3600
+    SITEMAP_MAX_ENTRIES = 64
+    # Signed-in user (id, email, role) by token subject, so authenticated requests skip the
+    # users lookup. Never kept past the token's expiry; "log out everywhere" evicts it
+    # explicitly, and the TTL bounds how long a role edited in the database goes unseen.
+    IDENTITY_TTL_SECONDS = 300
+    IDENTITY_MAX_ENTRIES = 4096
+    # Decoded JWTs by token hash: a page plus its HTMX partials present the same cookie
+    # several times within seconds, and each check would otherwise redo the HMAC.
+    TOKEN_MEMO_TTL_SECONDS = 30
+    TOKEN_MEMO_MAX_ENTRIES = 4096
@@ -0,0 +1,202 @@
+"""Shared outbound HTTP clients, one pooled ``httpx.AsyncClient`` per upstream.
+
+Creating a client per call pays a TCP + TLS handshake on every wizard keystroke and every
+report submission. The app lifespan starts one client per upstream and closes them on
+shutdown; scripts (and anything else running outside the app) get the same clients
+lazily on first use and should ``await http_clients.aclose()`` before exiting.
+
+Catalogue lookups go through ``http_clients.call``, which adds per upstream:
+
+- single-flight: identical in-flight calls (same key) share one request;
+- a concurrency cap at the pool size, so a call never queues for a connection;
+- a circuit breaker: after ``Http.BREAKER_FAILURE_THRESHOLD`` consecutive failures calls
+  fail fast for ``Http.BREAKER_RESET_SECONDS``, then a single trial call decides whether
+  to close it again.
+
+Each of these raises ``UpstreamUnavailable`` instead of waiting out a timeout, so callers
+can serve cached or local results.
+
+HTTP/2 is negotiated when the optional ``h2`` package is installed (``httpx[http2]``);
+otherwise the clients fall back to HTTP/1.1 keep-alive.
+"""
+
+import asyncio
+import importlib.util
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+import httpx
+
+from app.core.constants import Http
+
+OPENOPUS = "openopus"
+WIKIDATA = "wikidata"
+TURNSTILE = "turnstile"
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+T = TypeVar("T")
+
+
+class UpstreamUnavailable(Exception):
+    """The upstream is failing, its circuit is open, or it is at its concurrency cap."""
+
+
+@dataclass(frozen=True, slots=True)
+class Upstream:
+    max_connections: int
+    max_keepalive_connections: int
+    headers: dict[str, str] | None = None
+    follow_redirects: bool = False
+
+
+UPSTREAMS: dict[str, Upstream] = {
+    OPENOPUS: Upstream(
+        max_connections=Http.SEARCH_MAX_CONNECTIONS,
+        max_keepalive_connections=Http.SEARCH_MAX_KEEPALIVE_CONNECTIONS,
+    ),
+    WIKIDATA: Upstream(
+        max_connections=Http.SEARCH_MAX_CONNECTIONS,
+        max_keepalive_connections=Http.SEARCH_MAX_KEEPALIVE_CONNECTIONS,
+        headers={"User-Agent": "ExamRecordbot/1.0 (exam-record-project; contact@example.com)"},
+        follow_redirects=True,
+    ),
+    TURNSTILE: Upstream(
+        max_connections=Http.TURNSTILE_MAX_CONNECTIONS,
+        max_keepalive_connections=Http.TURNSTILE_MAX_CONNECTIONS,
+    ),
+}
+
+
+def build_client(
+    upstream: Upstream, transport: httpx.AsyncBaseTransport | None = None
+) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=transport,
+        headers=upstream.headers,
+        follow_redirects=upstream.follow_redirects,
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=upstream.max_connections,
+            max_keepalive_connections=upstream.max_keepalive_connections,
+            keepalive_expiry=Http.KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        timeout=httpx.Timeout(
+            Http.READ_TIMEOUT_SECONDS,
+            connect=Http.CONNECT_TIMEOUT_SECONDS,
+            pool=Http.POOL_TIMEOUT_SECONDS,
+        ),
+    )
+
+
+def _is_upstream_failure(exc: Exception) -> bool:
+    """Errors that say the upstream is unhealthy (as opposed to e.g. a 404 for bad input)."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500 or exc.response.status_code == 429
+    return isinstance(exc, httpx.TransportError)
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_seconds: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.trial_running = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        """Closed: yes. Open: no, until the reset time, then one trial call at a time."""
+        if self.opened_at is None:
+            return True
+        if self.trial_running or time.monotonic() - self.opened_at < self.reset_seconds:
+            return False
+        self.trial_running = True
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.trial_running or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self.trial_running = False
+
+
+class HttpClientRegistry:
+    def __init__(self, transport: httpx.AsyncBaseTransport | None = None) -> None:
+        self._transport = transport  # tests point every client at a fake upstream
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._breakers = {
+            name: CircuitBreaker(Http.BREAKER_FAILURE_THRESHOLD, Http.BREAKER_RESET_SECONDS)
+            for name in UPSTREAMS
+        }
+        self._active = dict.fromkeys(UPSTREAMS, 0)
+        self._inflight: dict[tuple[str, Hashable], asyncio.Future[Any]] = {}
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """The shared client for upstream ``name``, created on first use."""
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._clients[name] = build_client(UPSTREAMS[name], self._transport)
+        return client
+
+    def breaker(self, name: str) -> CircuitBreaker:
+        return self._breakers[name]
+
+    async def call(
+        self, name: str, key: Hashable, fetch: Callable[[httpx.AsyncClient], Awaitable[T]]
+    ) -> T:
+        """Run ``fetch(client)`` against upstream ``name`` behind single-flight (by ``key``),
+        the concurrency cap and the circuit breaker. Raises UpstreamUnavailable instead of
+        waiting on an unhealthy upstream.
+        """
+        inflight = self._inflight.get((name, key))
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._guarded(name, fetch))
+            self._inflight[(name, key)] = inflight
+            inflight.add_done_callback(lambda _: self._inflight.pop((name, key), None))
+        # Shielded: one caller going away (client disconnect) doesn't cancel the others.
+        return await asyncio.shield(inflight)
+
+    async def _guarded(self, name: str, fetch: Callable[[httpx.AsyncClient], Awaitable[T]]) -> T:
+        if self._active[name] >= UPSTREAMS[name].max_connections:
+            raise UpstreamUnavailable(f"{name}: too many concurrent requests")
+        breaker = self._breakers[name]
+        if not breaker.allow():
+            raise UpstreamUnavailable(f"{name}: circuit open")
+
+        self._active[name] += 1
+        try:
+            result = await fetch(self.get(name))
+        except Exception as e:
+            if not _is_upstream_failure(e):
+                breaker.record_success()  # it answered; the request itself was bad
+                raise
+            breaker.record_failure()
+            raise UpstreamUnavailable(f"{name}: {e!r}") from e
+        finally:
+            self._active[name] -= 1
+            breaker.trial_running = False  # also when cancelled mid-trial
+        breaker.record_success()
+        return result
+
+    def start(self) -> None:
+        for name in UPSTREAMS:
+            self.get(name)
+
+    async def aclose(self) -> None:
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+
+http_clients = HttpClientRegistry()
@@ -0,0 +1,214 @@
+"""Cross-worker cache invalidation.
+
+Each gunicorn worker keeps its own in-process caches (reference data, rendered pages).
+Writers call ``invalidation_bus.publish(key, ...)``: matching handlers in the current
+process run immediately, and the keys are relayed through a backend so every other
+worker evicts them too.
+
+Backends (``settings.CACHE_BUS_BACKEND``):
+
+- ``local``: no relay — single process, tests, scripts.
+- ``database``: rows in the ``cache_invalidations`` table, polled by every worker. Needs
+  nothing beyond the app database, which suits the single-machine SQLite deployment.
+  SQLite only: workers poll for ids above the last one seen, which relies on ids
+  committing in order (SQLite's single writer). On PostgreSQL a transaction can commit
+  a lower id after a higher one is already visible, and that key would be skipped.
+- ``redis``: Redis pub/sub via ``REDIS_URL`` (requires the optional ``redis`` package).
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from collections.abc import Callable
+from contextlib import suppress
+from datetime import datetime, timedelta, timezone
+from typing import Any, Protocol
+
+from sqlalchemy import delete, func
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.core.constants import Cache
+from app.db.session import AsyncSessionLocal
+from app.models import CacheInvalidation
+
+logger = logging.getLogger("uvicorn")
+
+Deliver = Callable[[list[str]], None]
+
+
+class InvalidationBackend(Protocol):
+    async def connect(self) -> None:
+        """Start receiving: anything published after this returns reaches ``listen``."""
+        ...
+
+    async def publish(self, keys: list[str], origin: str) -> None: ...
+
+    async def listen(self, origin: str, deliver: Deliver) -> None:
+        """Run forever, passing keys published by *other* origins to ``deliver``."""
+        ...
+
+
+class DatabaseInvalidationBackend:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        poll_interval: float = Cache.INVALIDATION_POLL_INTERVAL_SECONDS,
+    ) -> None:
+        self._session_factory = session_factory
+        self._poll_interval = poll_interval
+        self._last_id = 0
+
+    async def connect(self) -> None:
+        async with self._session_factory() as session:
+            dialect = session.get_bind().dialect.name
+            if dialect != "sqlite":
+                raise RuntimeError(
+                    f"CACHE_BUS_BACKEND=database requires SQLite (got {dialect}); use redis"
+                )
+            result = await session.execute(select(func.max(CacheInvalidation.id)))
+            self._last_id = result.scalar() or 0
+
+    async def publish(self, keys: list[str], origin: str) -> None:
+        async with self._session_factory() as session:
+            session.add_all([CacheInvalidation(key=key, origin=origin) for key in keys])
+            await session.commit()
+
+    async def listen(self, origin: str, deliver: Deliver) -> None:
+        next_prune = datetime.now(timezone.utc)
+
+        while True:
+            await asyncio.sleep(self._poll_interval)
+            try:
+                async with self._session_factory() as session:
+                    result = await session.execute(
+                        select(
+                            CacheInvalidation.id, CacheInvalidation.key, CacheInvalidation.origin
+                        )
+                        .filter(CacheInvalidation.id > self._last_id)
+                        .order_by(CacheInvalidation.id)
+                    )
+                    rows = result.tuples().all()
+                    if rows:
+                        self._last_id = rows[-1][0]
+                        keys = [key for _, key, row_origin in rows if row_origin != origin]
+                        if keys:
+                            deliver(keys)
+
+                    now = datetime.now(timezone.utc)
+                    if now >= next_prune:
+                        retention = timedelta(seconds=Cache.INVALIDATION_RETENTION_SECONDS)
+                        await session.execute(
+                            delete(CacheInvalidation).filter(
+                                CacheInvalidation.created_at < now - retention
+                            )
+                        )
+                        await session.commit()
+                        next_prune = now + retention
+            except Exception:
+                logger.exception("Cache invalidation poll failed; retrying")
+
+
+class RedisInvalidationBackend:
+    CHANNEL = "exam-record:cache-invalidation"
+
+    def __init__(self, url: str) -> None:
+        import redis.asyncio as redis  # type: ignore[import-not-found]
+
+        self._redis: Any = redis.from_url(url)
+        self._pubsub: Any = None
+
+    async def connect(self) -> None:
+        self._pubsub = self._redis.pubsub()
+        await self._pubsub.subscribe(self.CHANNEL)
+
+    async def publish(self, keys: list[str], origin: str) -> None:
+        await self._redis.publish(self.CHANNEL, json.dumps({"origin": origin, "keys": keys}))
+
+    async def listen(self, origin: str, deliver: Deliver) -> None:
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    payload = json.loads(message["data"])
+                    if payload["origin"] != origin:
+                        deliver(payload["keys"])
+            except Exception:
+                # Keys published while disconnected are lost; entries still expire by TTL.
+                logger.exception("Cache invalidation subscription dropped; reconnecting")
+            await asyncio.sleep(Cache.INVALIDATION_RECONNECT_SECONDS)
+            with suppress(Exception):
+                await self._pubsub.aclose()
+            try:
+                await self.connect()
+            except Exception:
+                logger.exception("Cache invalidation resubscribe failed; retrying")
+
+
+class InvalidationBus:
+    def __init__(self) -> None:
+        self.origin = uuid.uuid4().hex
+        self._handlers: list[tuple[str, Callable[[str], None]]] = []
+        self._backend: InvalidationBackend | None = None
+        self._outbox: asyncio.Queue[list[str]] | None = None
+        self._tasks: list[asyncio.Task[None]] = []
+
+    def subscribe(self, prefix: str, handler: Callable[[str], None]) -> None:
+        """Call ``handler(key)`` for every published key starting with ``prefix``."""
+        self._handlers.append((prefix, handler))
+
+    def publish(self, *keys: str) -> None:
+        """Evict ``keys`` in this process now and relay them to the other workers."""
+        self._deliver(list(keys))
+        if self._outbox is not None:
+            self._outbox.put_nowait(list(keys))
+
+    def _deliver(self, keys: list[str]) -> None:
+        for key in keys:
+            for prefix, handler in self._handlers:
+                if key.startswith(prefix):
+                    handler(key)
+
+    async def start(self, backend: InvalidationBackend) -> None:
+        await backend.connect()
+        self._backend = backend
+        self._outbox = asyncio.Queue()
+        self._tasks = [
+            asyncio.create_task(backend.listen(self.origin, self._deliver)),
+            asyncio.create_task(self._relay()),
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+        self._outbox = None
+        self._backend = None
+
+    async def _relay(self) -> None:
+        assert self._outbox is not None and self._backend is not None
+        while True:
+            keys = await self._outbox.get()
+            try:
+                await self._backend.publish(keys, self.origin)
+            except Exception:
+                logger.exception("Failed to relay cache invalidation for %s", keys)
+
+
+def build_backend() -> InvalidationBackend | None:
+    """Backend selected by ``settings.CACHE_BUS_BACKEND``; None means local-only."""
+    if settings.CACHE_BUS_BACKEND == "database":
+        return DatabaseInvalidationBackend(AsyncSessionLocal)
+    if settings.CACHE_BUS_BACKEND == "redis":
+        assert settings.REDIS_URL, "CACHE_BUS_BACKEND=redis requires REDIS_URL"
+        return RedisInvalidationBackend(settings.REDIS_URL)
+    return None
+
+
+invalidation_bus = InvalidationBus()
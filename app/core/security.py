@@ -1,9 +1,24 @@
+import hashlib
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Any, cast
 
 import jwt
+from cachetools import TTLCache
 
 from app.core.config import settings
+from app.core.constants import Cache
+from app.models import User
+
+# Session token claims: "ver" (this number), "sub" (email), "uid", "role" and "gen" (the
+# user's token_generation at issue time). Tokens issued before carry only "sub" and "role".
+SESSION_TOKEN_VERSION = 2
+
+# Decoded payloads (None for a rejected token) by SHA-256 of the token, so a token
+# presented again within a few seconds skips signature verification.
+_verified_tokens: TTLCache[bytes, dict[str, Any] | None] = TTLCache(
+    maxsize=Cache.TOKEN_MEMO_MAX_ENTRIES, ttl=Cache.TOKEN_MEMO_TTL_SECONDS
+)
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
@@ -19,9 +34,38 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     return encoded_jwt
 
 
+def create_session_token(user: User, expires_delta: timedelta | None = None) -> str:
+    """A session token for ``user``: enough claims to build the principal without a lookup."""
+    return create_access_token(
+        {
+            "ver": SESSION_TOKEN_VERSION,
+            "sub": user.email,
+            "uid": user.id,
+            "role": user.role,
+            "gen": user.token_generation,
+        },
+        expires_delta,
+    )
+
+
 def verify_token(token: str) -> dict | None:
+    key = hashlib.sha256(token.encode()).digest()
+    if key in _verified_tokens:
+        payload = _verified_tokens[key]
+        # A memoized token may have expired since it was verified.
+        if payload is None or payload.get("exp", 0) > time.time():
+            return payload
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return cast(dict[str, Any], payload)
+        payload = cast(
+            dict[str, Any],
+            jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]),
+        )
     except jwt.PyJWTError:
-        return None
+        payload = None
+    _verified_tokens[key] = payload
+    return payload
+
+
+def clear_token_memo() -> None:
+    """Forget verified tokens. Used by tests."""
+    _verified_tokens.clear()
@@ -0,0 +1,91 @@
+"""SQLite FTS5 index over composer names and work titles/nicknames.
+
+External-content FTS5 tables mirror ``composers`` and ``works``; triggers keep them in
+sync on every insert/update/delete, so the index never needs touching from app code.
+``unicode61 remove_diacritics 2`` folds accents (Frédéric -> frederic, Dvořák -> dvorak)
+and the ``prefix`` option indexes short prefixes for typeahead-style ``tok*`` queries.
+
+The migration creates the same objects for existing databases; here they are attached to
+``Base.metadata`` so ``create_all`` (tests, benchmarks) builds them too.
+"""
+
+from typing import Any
+
+from sqlalchemy import MetaData, event
+from sqlalchemy.engine import Connection
+
+from app.db.base import Base
+
+SEARCH_INDEX_TABLES = ("composers_fts", "works_fts")
+
+SQLITE_SEARCH_INDEX_DDL = [
+    """
+    CREATE VIRTUAL TABLE composers_fts USING fts5(
+        name,
+        content='composers', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER composers_fts_ai AFTER INSERT ON composers BEGIN
+        INSERT INTO composers_fts(rowid, name) VALUES (new.id, new.name);
+    END
+    """,
+    """
+    CREATE TRIGGER composers_fts_ad AFTER DELETE ON composers BEGIN
+        INSERT INTO composers_fts(composers_fts, rowid, name) VALUES ('delete', old.id, old.name);
+    END
+    """,
+    """
+    CREATE TRIGGER composers_fts_au AFTER UPDATE OF name ON composers BEGIN
+        INSERT INTO composers_fts(composers_fts, rowid, name) VALUES ('delete', old.id, old.name);
+        INSERT INTO composers_fts(rowid, name) VALUES (new.id, new.name);
+    END
+    """,
+    """
+    CREATE VIRTUAL TABLE works_fts USING fts5(
+        title, nickname,
+        content='works', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER works_fts_ai AFTER INSERT ON works BEGIN
+        INSERT INTO works_fts(rowid, title, nickname) VALUES (new.id, new.title, new.nickname);
+    END
+    """,
+    """
+    CREATE TRIGGER works_fts_ad AFTER DELETE ON works BEGIN
+        INSERT INTO works_fts(works_fts, rowid, title, nickname)
+        VALUES ('delete', old.id, old.title, old.nickname);
+    END
+    """,
+    """
+    CREATE TRIGGER works_fts_au AFTER UPDATE OF title, nickname ON works BEGIN
+        INSERT INTO works_fts(works_fts, rowid, title, nickname)
+        VALUES ('delete', old.id, old.title, old.nickname);
+        INSERT INTO works_fts(rowid, title, nickname) VALUES (new.id, new.title, new.nickname);
+    END
+    """,
+]
+
+
+def is_search_index_table(name: str | None) -> bool:
+    """True for the FTS5 tables and their shadow tables (``composers_fts_data``, ...)."""
+    return name is not None and name.startswith(SEARCH_INDEX_TABLES)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_search_index(target: MetaData, connection: Connection, **kw: Any) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+    for statement in SQLITE_SEARCH_INDEX_DDL:
+        connection.exec_driver_sql(statement)
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _drop_search_index(target: MetaData, connection: Connection, **kw: Any) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+    for table in SEARCH_INDEX_TABLES:
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {table}")
@@ -1,13 +1,155 @@
+import logging
 from collections.abc import AsyncGenerator
+from typing import Any
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from app.core.config import settings
+from app.core.constants import Database
+from app.db.base import Base
 
-engine = create_async_engine(settings.DATABASE_URL, echo=settings.ENVIRONMENT == "development")
+logger = logging.getLogger("uvicorn")
+
+
+def sqlite_pragmas() -> dict[str, str | int]:
+    """The connection-time PRAGMAs from the SQLite profile in Settings."""
+    return {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+    }
+
+
+def apply_sqlite_pragmas(sync_engine: Engine, pragmas: dict[str, str | int]) -> None:
+    """Run ``pragmas`` on every new DBAPI connection the engine's pool opens."""
+
+    @event.listens_for(sync_engine, "connect")
+    def _set_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def sqlite_cache_worst_case_mb(cache_size: int, page_size: int = 4096) -> int:
+    """Page cache every pooled connection of every worker could hold, in MB.
+
+    ``cache_size`` is the PRAGMA value: negative is KiB, positive is pages.
+    """
+    per_connection = -cache_size * 1024 if cache_size < 0 else cache_size * page_size
+    connections = Database.WRITE_POOL_SIZE + Database.WRITE_POOL_MAX_OVERFLOW
+    if read_database_url() is not None:
+        connections += Database.READ_POOL_SIZE + Database.READ_POOL_MAX_OVERFLOW
+    return per_connection * connections * settings.WEB_CONCURRENCY // (1024 * 1024)
+
+
+async def check_sqlite_pragmas(async_engine: AsyncEngine) -> dict[str, str]:
+    """Read back the profile from a live connection, warning about any that didn't stick.
+
+    journal_mode can silently stay ``delete`` (e.g. on filesystems without shared-memory
+    support), which would bring back the lock contention the profile is meant to remove.
+    """
+    effective: dict[str, str] = {}
+    async with async_engine.connect() as conn:
+        for name in sqlite_pragmas():
+            effective[name] = str((await conn.execute(text(f"PRAGMA {name}"))).scalar())
+
+    expected = settings.SQLITE_JOURNAL_MODE.lower()
+    if effective["journal_mode"].lower() != expected:
+        logger.warning(
+            "SQLite journal_mode is %s, expected %s", effective["journal_mode"], expected
+        )
+    worst_case_mb = sqlite_cache_worst_case_mb(int(effective["cache_size"]))
+    if worst_case_mb > settings.SQLITE_CACHE_BUDGET_MB:
+        logger.warning(
+            "SQLite page caches can reach %d MB across %d workers, over the %d MB budget "
+            "(SQLITE_CACHE_BUDGET_MB): lower SQLITE_CACHE_SIZE or the pool sizes",
+            worst_case_mb,
+            settings.WEB_CONCURRENCY,
+            settings.SQLITE_CACHE_BUDGET_MB,
+        )
+    logger.info("SQLite profile: %s", effective)
+    return effective
+
+
+def read_database_url() -> str | None:
+    """URL for the read engine, or None when reads should share the write engine.
+
+    DATABASE_READ_URL wins if set. Otherwise a file-backed SQLite URL is reopened as a
+    ``mode=ro`` URI, so page reads can never take the write lock.
+    """
+    if settings.DATABASE_READ_URL:
+        return settings.DATABASE_READ_URL
+    url = make_url(settings.DATABASE_URL)
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+    if url.query.get("uri") == "true":
+        return None  # Already a URI; don't second-guess its mode.
+    ro_url = url.set(
+        database=f"file:{url.database}", query={**url.query, "mode": "ro", "uri": "true"}
+    )
+    return ro_url.render_as_string(hide_password=False)
+
+
+# In-memory SQLite (tests) runs on a single static connection, which takes no pool sizing.
+_write_pool_args = (
+    {"pool_size": Database.WRITE_POOL_SIZE, "max_overflow": Database.WRITE_POOL_MAX_OVERFLOW}
+    if make_url(settings.DATABASE_URL).database not in (None, "", ":memory:")
+    else {}
+)
+engine = create_async_engine(
+    settings.DATABASE_URL, echo=settings.ENVIRONMENT == "development", **_write_pool_args
+)
+if engine.dialect.name == "sqlite":
+    apply_sqlite_pragmas(engine.sync_engine, sqlite_pragmas())
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 
+_read_url = read_database_url()
+if _read_url is None:
+    read_engine = engine
+else:
+    read_engine = create_async_engine(
+        _read_url,
+        echo=settings.ENVIRONMENT == "development",
+        pool_size=Database.READ_POOL_SIZE,
+        max_overflow=Database.READ_POOL_MAX_OVERFLOW,
+    )
+    if read_engine.dialect.name == "sqlite":
+        # journal_mode/synchronous are the writer's business (and a read-only
+        # connection can't switch journal mode); the rest apply to readers too.
+        read_pragmas = {
+            name: value
+            for name, value in sqlite_pragmas().items()
+            if name not in ("journal_mode", "synchronous")
+        }
+        apply_sqlite_pragmas(read_engine.sync_engine, read_pragmas)
+ReadSessionLocal = async_sessionmaker(read_engine, expire_on_commit=False)
+
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+async def get_write_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         yield session
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Session on the read engine, for handlers that never write."""
+    async with ReadSessionLocal() as session:
+        yield session
+
+
+def dialect_insert(db: AsyncSession, model: type[Base]) -> postgresql.Insert | sqlite.Insert:
+    """An INSERT supporting ON CONFLICT for the session's backend (PostgreSQL or SQLite)."""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
@@ -1,25 +1,78 @@
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import Depends, FastAPI, Request
-from fastapi.responses import HTMLResponse, Response
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import joinedload
 
 from app.api import deps
 from app.api.api import api_router
 from app.core.config import settings
+from app.core.http import http_clients
+from app.core.invalidation import build_backend, invalidation_bus
 from app.core.limiter import limiter
 from app.core.monitoring import init_sentry
-from app.db.session import get_db
+from app.db.session import (
+    AsyncSessionLocal,
+    ReadSessionLocal,
+    check_sqlite_pragmas,
+    engine,
+    get_read_db,
+    get_write_db,
+)
 from app.models import Discipline, ExamEvent, Region, Report, User
 from app.services.exam_service import ExamService
+from app.services.identity_service import IdentityService, UserIdentity
+from app.services.live_update_service import LiveUpdateService
+from app.services.page_cache_service import PageCacheService
 from app.services.reference_data_service import ReferenceDataService
+from app.services.report_service import ReportService
+from app.services.sitemap_service import SitemapService
+from app.services.typeahead_service import TypeaheadService
+from app.services.vote_queue_service import VoteQueueService
+
+logger = logging.getLogger("uvicorn")
 
 init_sentry()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    if engine.dialect.name == "sqlite":
+        await check_sqlite_pragmas(engine)
+    backend = build_backend()
+    if backend is not None:
+        await invalidation_bus.start(backend)
+    http_clients.start()
+    if backend is None and settings.WEB_CONCURRENCY > 1:
+        # A vote would only reach the streams of the worker that handled it.
+        logger.error(
+            "Live updates disabled: %d workers share no invalidation bus "
+            "(set CACHE_BUS_BACKEND to database or redis)",
+            settings.WEB_CONCURRENCY,
+        )
+    else:
+        LiveUpdateService.start(ReadSessionLocal)
+    if settings.VOTE_WRITE_BEHIND:
+        VoteQueueService.start(AsyncSessionLocal, ReportService.write_vote_batch)
+    # Built in the background: search falls back to SearchService until it is ready.
+    TypeaheadService.start(ReadSessionLocal)
+    try:
+        yield
+    finally:
+        await VoteQueueService.stop()
+        await TypeaheadService.stop()
+        await LiveUpdateService.stop()
+        await http_clients.aclose()
+        await invalidation_bus.stop()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description=(
@@ -30,6 +83,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    lifespan=lifespan,
 )
 templates = Jinja2Templates(directory="app/templates")
 
@@ -43,8 +97,8 @@ app.mount("/static", StaticFiles(directory="app/static"), name="static")
 @app.get("/", response_class=HTMLResponse)
 async def root(
     request: Request,
-    db: AsyncSession = Depends(get_db),
-    current_user: User | None = Depends(deps.get_current_user_optional),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserIdentity | None = Depends(deps.get_current_user_optional),
 ) -> HTMLResponse:
     result = await db.execute(
         select(Region.slug, Discipline.slug)
@@ -66,6 +120,21 @@ async def logout() -> Response:
     return response
 
 
+@app.post("/logout/all")
+async def logout_everywhere(
+    db: AsyncSession = Depends(get_write_db),
+    current_user: UserIdentity = Depends(deps.get_current_user),
+) -> Response:
+    """Sign out every device: revokes all session tokens (and unused magic links) issued
+    to the user so far, then clears this browser's cookie."""
+    user = await db.get(User, current_user.id)
+    if user is not None:
+        await IdentityService.revoke_tokens(db, user)
+    response = Response(status_code=303, headers={"Location": "/"})
+    response.delete_cookie(key="access_token")
+    return response
+
+
 @app.get("/exams/{region_slug}/{discipline_slug}", response_class=HTMLResponse)
 async def discipline_page(
     request: Request,
@@ -74,9 +143,17 @@ async def discipline_page(
     cursor: int | None = None,
     partial: bool = False,
     sparse_mode: bool = True,
-    db: AsyncSession = Depends(get_db),
-    current_user: User | None = Depends(deps.get_current_user_optional),
-) -> HTMLResponse:
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserIdentity | None = Depends(deps.get_current_user_optional),
+) -> Response:
+    cache_key = None
+    if current_user is None:
+        cache_key = PageCacheService.key_for(
+            request, cursor=cursor, partial=partial, sparse_mode=sparse_mode
+        )
+    if cache_key and (page := PageCacheService.get(cache_key)):
+        return PageCacheService.respond(request, page)
+
     context = await ExamService.get_discipline_context(
         db, region_slug, discipline_slug, cursor, sparse_mode, current_user
     )
@@ -85,7 +162,13 @@ async def discipline_page(
     if partial and not context["years"]:
         return HTMLResponse("")
     template = "partials/year_list.html" if partial else "discipline.html"
-    return templates.TemplateResponse(request, template, context)
+    response = templates.TemplateResponse(request, template, context)
+    if cache_key is None:
+        return response
+
+    tag = PageCacheService.discipline_tag(context["region"].id, context["discipline"].id)
+    page = PageCacheService.store(cache_key, bytes(response.body), {tag})
+    return PageCacheService.respond(request, page)
 
 
 @app.get("/exams/{region_slug}/{discipline_slug}/{year}", response_class=HTMLResponse)
@@ -94,15 +177,57 @@ async def exam_page(
     region_slug: str,
     discipline_slug: str,
     year: int,
-    db: AsyncSession = Depends(get_db),
-    current_user: User | None = Depends(deps.get_current_user_optional),
-) -> HTMLResponse:
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserIdentity | None = Depends(deps.get_current_user_optional),
+) -> Response:
+    cache_key = PageCacheService.key_for(request) if current_user is None else None
+    if cache_key and (page := PageCacheService.get(cache_key)):
+        return PageCacheService.respond(request, page)
+
     context = await ExamService.get_exam_context(
         db, region_slug, discipline_slug, year, current_user
     )
     if context is None:
         return HTMLResponse(content="<h1>Convocatoria no encontrada</h1>", status_code=404)
-    return templates.TemplateResponse(request, "event.html", context)
+    response = templates.TemplateResponse(request, "event.html", context)
+    if cache_key is None:
+        return response
+
+    event = context["event"]
+    tags = {
+        PageCacheService.event_tag(event.id),
+        PageCacheService.discipline_tag(event.region_id, event.discipline_id),
+    }
+    page = PageCacheService.store(cache_key, bytes(response.body), tags)
+    return PageCacheService.respond(request, page)
+
+
+@app.get("/exams/{region_slug}/{discipline_slug}/{year}/live")
+async def exam_live_updates(
+    region_slug: str,
+    discipline_slug: str,
+    year: int,
+    # Released before streaming starts: an open stream must not hold a pooled connection.
+    db: AsyncSession = Depends(get_read_db, scope="function"),
+) -> Response:
+    """Server-sent consensus deltas for the exam page (see LiveUpdateService)."""
+    event_id = await db.scalar(
+        select(ExamEvent.id)
+        .join(Region)
+        .join(Discipline)
+        .filter(
+            Region.slug == region_slug, Discipline.slug == discipline_slug, ExamEvent.year == year
+        )
+    )
+    if event_id is None:
+        return Response(status_code=404)
+    if LiveUpdateService.is_full():
+        return Response(status_code=503, headers={"Retry-After": "60"})
+    return StreamingResponse(
+        LiveUpdateService.stream(event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.get("/exams/{region_slug}/{discipline_slug}/{year}/contribute", response_class=HTMLResponse)
@@ -111,8 +236,8 @@ async def contribute_page(
     region_slug: str,
     discipline_slug: str,
     year: int,
-    db: AsyncSession = Depends(get_db),
-    current_user: User | None = Depends(deps.get_current_user_optional),
+    db: AsyncSession = Depends(get_write_db),
+    current_user: UserIdentity | None = Depends(deps.get_current_user_optional),
 ) -> HTMLResponse:
     # 1. Check if event exists
     stmt = (
@@ -174,33 +299,18 @@ Sitemap: https://exam-record.com/sitemap.xml
     return Response(content=content, media_type="text/plain")
 
 
-@app.get("/sitemap.xml", response_class=HTMLResponse)
-async def sitemap_xml(request: Request, db: AsyncSession = Depends(get_db)) -> Response:
-    stmt = select(ExamEvent).options(joinedload(ExamEvent.region), joinedload(ExamEvent.discipline))
-    result = await db.execute(stmt)
-    events = result.scalars().all()
-
-    base_url = str(request.base_url).rstrip("/")
-
-    xml_content = ['<?xml version="1.0" encoding="UTF-8"?>']
-    xml_content.append('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">')
-
-    # Home Page (?) - We don't have one exposed yet, maybe just the base
-    # xml_content.append(f'<url><loc>{base_url}/</loc></url>')
-
-    for event in events:
-        loc = f"{base_url}/exams/{event.region.slug}/{event.discipline.slug}/{event.year}"
-        xml_content.append(f"""
-            <url>
-                <loc>{loc}</loc>
-                <changefreq>weekly</changefreq>
-                <priority>0.8</priority>
-            </url>
-        """)
+@app.get("/sitemap.xml")
+async def sitemap_xml(request: Request, db: AsyncSession = Depends(get_read_db)) -> Response:
+    return await SitemapService.respond(db, str(request.base_url).rstrip("/"))
 
-    xml_content.append("</urlset>")
 
-    return Response(content="".join(xml_content), media_type="application/xml")
+@app.get("/sitemaps/events-{page}.xml")
+async def sitemap_page_xml(
+    request: Request, page: int, db: AsyncSession = Depends(get_read_db)
+) -> Response:
+    if page < 1:
+        return Response(status_code=404)
+    return await SitemapService.respond(db, str(request.base_url).rstrip("/"), page)
 
 
 if __name__ == "__main__":
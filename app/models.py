@@ -1,8 +1,20 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String, UniqueConstraint
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    false,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.db import search_index  # noqa: F401  (registers the FTS5 index with create_all)
 from app.db.base import Base
 
 
@@ -12,6 +24,8 @@ class User(Base):
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     email: Mapped[str] = mapped_column(String, unique=True, index=True)
     role: Mapped[str] = mapped_column(String, default="Visitor")
+    # Carried in session tokens as "gen"; bumping it revokes every token issued before.
+    token_generation: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=True
     )
@@ -47,6 +61,8 @@ class ExamEvent(Base):
     year: Mapped[int] = mapped_column()
     region_id: Mapped[int] = mapped_column(ForeignKey("regions.id"))
     discipline_id: Mapped[int] = mapped_column(ForeignKey("disciplines.id"))
+    # Denormalized sum of Report.vote_count for this event, maintained by ReportService.
+    total_votes: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
 
     region: Mapped["Region"] = relationship("Region", back_populates="events")
     discipline: Mapped["Discipline"] = relationship("Discipline", back_populates="events")
@@ -54,6 +70,8 @@ class ExamEvent(Base):
 
     __table_args__ = (
         UniqueConstraint("year", "region_id", "discipline_id", name="uix_year_region_discipline"),
+        # Discipline timeline filters on region+discipline across all years.
+        Index("ix_exam_events_region_discipline_year", "region_id", "discipline_id", "year"),
     )
 
 
@@ -65,6 +83,11 @@ class Composer(Base):
     wikidata_id: Mapped[str | None] = mapped_column(String, unique=True, index=True)
     openopus_id: Mapped[str | None] = mapped_column(String, unique=True, index=True)
     is_verified: Mapped[bool] = mapped_column(Boolean, default=False, nullable=True)
+    # Set once scripts/import_openopus.py has imported the composer's whole OpenOpus
+    # catalogue; OpenOpus work searches for the composer are then answered locally.
+    catalogue_imported_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
 
     works: Mapped[list["Work"]] = relationship("Work", back_populates="composer")
 
@@ -97,6 +120,8 @@ class Report(Base):
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=True
     )
     is_flagged: Mapped[bool] = mapped_column(Boolean, default=False, nullable=True)
+    # Denormalized count of Vote rows, maintained by ReportService.
+    vote_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
 
     user: Mapped["User"] = relationship("User", back_populates="reports")
     event: Mapped["ExamEvent"] = relationship("ExamEvent", back_populates="reports")
@@ -105,7 +130,11 @@ class Report(Base):
         "Vote", back_populates="report", cascade="all, delete-orphan"
     )
 
-    __table_args__ = (UniqueConstraint("event_id", "work_id", name="uix_event_work_report"),)
+    __table_args__ = (
+        UniqueConstraint("event_id", "work_id", name="uix_event_work_report"),
+        # Participation check: "has this user reported in this event?"
+        Index("ix_reports_event_user", "event_id", "user_id"),
+    )
 
 
 class Vote(Base):
@@ -120,3 +149,81 @@ class Vote(Base):
 
     user: Mapped["User"] = relationship("User", back_populates="votes")
     report: Mapped["Report"] = relationship("Report", back_populates="votes")
+
+    # Participation check: "which reports has this user voted on?"
+    __table_args__ = (Index("ix_votes_user_report", "user_id", "report_id"),)
+
+
+# One row per (user, event) the user has voted in — their own report's implicit vote or an
+# upvote. The primary key makes a second vote in the same event fail on insert, even when
+# two requests race across workers.
+class UserEventParticipation(Base):
+    __tablename__ = "user_event_participation"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    event_id: Mapped[int] = mapped_column(ForeignKey("exam_events.id"), primary_key=True)
+    report_id: Mapped[int] = mapped_column(ForeignKey("reports.id"))
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=True
+    )
+
+
+# Materialized per-event consensus, refreshed by ConsensusService on every vote/report/flag
+# write so list pages can read badges without loading reports.
+class EventConsensus(Base):
+    __tablename__ = "event_consensus"
+
+    event_id: Mapped[int] = mapped_column(ForeignKey("exam_events.id"), primary_key=True)
+    report_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    total_votes: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    event_status: Mapped[str] = mapped_column(String, default="empty", server_default="empty")
+    top_report_id: Mapped[int | None] = mapped_column(ForeignKey("reports.id"))
+    top_percentage: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    has_verified: Mapped[bool] = mapped_column(Boolean, default=False, server_default=false())
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=True,
+    )
+
+    event: Mapped["ExamEvent"] = relationship("ExamEvent")
+    top_report: Mapped["Report | None"] = relationship("Report")
+
+
+# Keys published on the cross-worker invalidation bus (database backend), polled by every
+# worker and pruned after Cache.INVALIDATION_RETENTION_SECONDS. AUTOINCREMENT so ids keep
+# growing after a prune empties the table: workers poll for ids above the last one seen.
+class CacheInvalidation(Base):
+    __tablename__ = "cache_invalidations"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    key: Mapped[str] = mapped_column(String)
+    origin: Mapped[str] = mapped_column(String)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=True
+    )
+
+
+# Persistent tier of the Wikidata lookup cache (app/services/wikidata.py), shared by all
+# workers and kept across restarts. A NULL payload records a miss (negative entry).
+class WikidataCacheEntry(Base):
+    __tablename__ = "wikidata_cache"
+
+    # "search:<query>" or "entity:<Q-id>"
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    payload: Mapped[str | None] = mapped_column(Text, nullable=True)
+    fetched_at: Mapped[float] = mapped_column(Float)  # time.time()
+
+
+# Small key/value facts about the database itself, e.g. the hash of the reference data
+# last seeded by scripts/seed.py (so boots with unchanged seed lists skip seeding).
+class AppMetadata(Base):
+    __tablename__ = "app_metadata"
+
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    value: Mapped[str] = mapped_column(String)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=True
+    )
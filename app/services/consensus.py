@@ -1,7 +1,10 @@
 from typing import Any
 
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
 from app.core.constants import Consensus
-from app.models import Report
+from app.models import EventConsensus, Report
 from app.services.work_service import WorkService
 
 
@@ -25,22 +28,27 @@ class ConsensusService:
 
         return {"status": status, "percentage": percentage}
 
+    @staticmethod
+    def calculate_event_status(total_votes: int, has_verified: bool) -> str:
+        """Event-level status shown in the consensus banner."""
+        if total_votes == 0:
+            return "empty"
+        if total_votes == 1:
+            return "neutral"
+        return "resolved" if has_verified else "disputed"
+
     @staticmethod
     def aggregate_event_reports(reports: list[Report]) -> dict[str, Any]:
         """
         Aggregates a list of reports for an event into view models.
         Returns serialized dicts ready for Jinja2.
         """
-        total_votes = 0
-
-        # 1. Count Total Votes
-        # Note: Report.votes is expected to be loaded selectinload
-        for report in reports:
-            total_votes += len(report.votes)
+        # Uses the denormalized Report.vote_count counters — never touches Vote rows.
+        total_votes = sum(report.vote_count for report in reports)
 
         works_list = []
         for report in reports:
-            votes_count = len(report.votes)
+            votes_count = report.vote_count
             metrics = ConsensusService.calculate_work_status(votes_count, total_votes)
 
             works_list.append(
@@ -62,14 +70,65 @@ class ConsensusService:
 
         # Event Level Logic
         has_verified = any(w["status"] == "verified" for w in works_list)
-        event_status = "neutral"
-        if total_votes == 0:
-            event_status = "empty"
-        elif total_votes == 1:
-            event_status = "neutral"
-        elif has_verified:
-            event_status = "resolved"
-        else:
-            event_status = "disputed"
+        event_status = ConsensusService.calculate_event_status(total_votes, has_verified)
 
         return {"works": works_list, "total_votes": total_votes, "event_status": event_status}
+
+    @staticmethod
+    async def event_vote_counts(db: AsyncSession, event_id: int) -> list[tuple[int, int]]:
+        """(report id, vote_count) for every report of the event, most-voted first."""
+        result = await db.execute(
+            select(Report.id, Report.vote_count)
+            .filter(Report.event_id == event_id)
+            .order_by(Report.vote_count.desc(), Report.id)
+        )
+        return list(result.tuples().all())
+
+    @staticmethod
+    async def refresh_event_snapshot(
+        db: AsyncSession, event_id: int, vote_counts: list[tuple[int, int]] | None = None
+    ) -> EventConsensus:
+        """Recompute the EventConsensus row for one event from the Report.vote_count counters
+        (``vote_counts``, as returned by ``event_vote_counts``, if the caller already has them).
+
+        Called inside the write transaction (no commit), so the snapshot commits or rolls
+        back together with the vote/report/flag that changed it.
+        """
+        rows = (
+            vote_counts
+            if vote_counts is not None
+            else await ConsensusService.event_vote_counts(db, event_id)
+        )
+        total_votes = sum(votes for _, votes in rows)
+
+        top_report_id = None
+        top_percentage = 0
+        has_verified = False
+        if rows:
+            top_report_id, top_votes = rows[0]
+            metrics = ConsensusService.calculate_work_status(top_votes, total_votes)
+            top_percentage = metrics["percentage"]
+            # Only the most-voted report can clear the verification threshold.
+            has_verified = metrics["status"] == "verified"
+
+        snapshot = await db.get(EventConsensus, event_id)
+        if snapshot is None:
+            snapshot = EventConsensus(event_id=event_id)
+            db.add(snapshot)
+        snapshot.report_count = len(rows)
+        snapshot.total_votes = total_votes
+        snapshot.event_status = ConsensusService.calculate_event_status(total_votes, has_verified)
+        snapshot.top_report_id = top_report_id
+        snapshot.top_percentage = top_percentage
+        snapshot.has_verified = has_verified
+        await db.flush()
+        return snapshot
+
+    @staticmethod
+    async def refresh_all_snapshots(db: AsyncSession) -> None:
+        """Recompute the snapshot of every event that has reports or a stale snapshot."""
+        reported = select(Report.event_id).distinct()
+        snapshotted = select(EventConsensus.event_id)
+        result = await db.execute(reported.union(snapshotted))
+        for event_id in result.scalars().all():
+            await ConsensusService.refresh_event_snapshot(db, event_id)
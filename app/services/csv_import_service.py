@@ -0,0 +1,117 @@
+from dataclasses import dataclass
+
+from sqlalchemy import insert, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.db.session import dialect_insert
+from app.models import Composer, Work
+from app.services.openopus_import_service import OpenOpusImportService
+
+
+@dataclass(frozen=True, slots=True)
+class CsvWork:
+    composer_name: str
+    title: str
+    nickname: str | None = None
+    wikidata_id: str | None = None  # the composer's
+    openopus_id: str | None = None  # the work's
+
+
+class CsvImportService:
+    """Chunked import of work lists (e.g. a teacher's CSV): composers are resolved with one
+    ``IN`` query per chunk and works written in bulk, instead of two lookups per row.
+    Nothing is committed here; callers commit per chunk.
+    """
+
+    @staticmethod
+    async def resolve_composers(db: AsyncSession, rows: list[CsvWork]) -> dict[str, int]:
+        """{composer name: local id} for the chunk, creating the composers that are missing.
+
+        A matching ``wikidata_id`` wins over the name; otherwise the oldest composer of that
+        name is used, as the row-by-row importer did.
+        """
+        wikidata_ids = {r.wikidata_id: r.composer_name for r in rows if r.wikidata_id}
+        names = {r.composer_name for r in rows}
+        result = await db.execute(
+            select(Composer.id, Composer.name, Composer.wikidata_id)
+            .filter(or_(Composer.name.in_(names), Composer.wikidata_id.in_(wikidata_ids)))
+            .order_by(Composer.id)
+        )
+        existing = result.tuples().all()
+
+        ids: dict[str, int] = {}
+        for composer_id, _, wikidata_id in existing:
+            if wikidata_id in wikidata_ids:
+                ids.setdefault(wikidata_ids[wikidata_id], composer_id)
+        for composer_id, name, _ in existing:
+            if name in names:
+                ids.setdefault(name, composer_id)
+
+        missing: dict[str, dict[str, str | bool | None]] = {}
+        for r in rows:
+            if r.composer_name not in ids and r.composer_name not in missing:
+                missing[r.composer_name] = {
+                    "name": r.composer_name,
+                    "wikidata_id": r.wikidata_id,
+                    "is_verified": True,
+                }
+        if missing:
+            await db.execute(
+                dialect_insert(db, Composer).on_conflict_do_nothing(), list(missing.values())
+            )
+            created = await db.execute(
+                select(Composer.id, Composer.name)
+                .filter(Composer.name.in_(missing))
+                .order_by(Composer.id)
+            )
+            for composer_id, name in created.tuples():
+                ids.setdefault(name, composer_id)
+        return ids
+
+    @staticmethod
+    async def add_works(
+        db: AsyncSession, rows: list[CsvWork], composer_ids: dict[str, int]
+    ) -> tuple[int, int]:
+        """Write the chunk's works; returns (written, skipped as already present).
+
+        Rows with an ``openopus_id`` are upserted on it; the rest are inserted unless the
+        composer already has a work with that title.
+        """
+        linked = [
+            (
+                composer_ids[r.composer_name],
+                {"id": r.openopus_id, "title": r.title, "nickname": r.nickname},
+            )
+            for r in rows
+            if r.openopus_id and r.composer_name in composer_ids
+        ]
+        written = await OpenOpusImportService.upsert_works(db, linked) if linked else 0
+
+        unlinked = {
+            (composer_ids[r.composer_name], r.title): r
+            for r in rows
+            if not r.openopus_id and r.composer_name in composer_ids
+        }
+        if unlinked:
+            result = await db.execute(
+                select(Work.composer_id, Work.title).filter(
+                    Work.composer_id.in_({composer_id for composer_id, _ in unlinked}),
+                    Work.title.in_({title for _, title in unlinked}),
+                )
+            )
+            present = set(result.tuples().all())
+            new = [
+                {
+                    "title": title,
+                    "nickname": r.nickname,
+                    "composer_id": composer_id,
+                    "is_verified": True,
+                }
+                for (composer_id, title), r in unlinked.items()
+                if (composer_id, title) not in present
+            ]
+            if new:
+                await db.execute(insert(Work), new)
+            written += len(new)
+        return written, len(rows) - written
@@ -6,11 +6,12 @@ from sqlalchemy.future import select
 from sqlalchemy.orm import joinedload
 
 from app.api import deps
-from app.core.constants import Calendar, Consensus, Pagination
-from app.models import Discipline, ExamEvent, Region, Report, User, Work
+from app.core.constants import Calendar, Pagination
+from app.models import Discipline, ExamEvent, Region, Report, Work
 from app.services.consensus import ConsensusService
+from app.services.identity_service import UserIdentity
 from app.services.reference_data_service import ReferenceDataService
-from app.services.work_service import WorkService
+from app.services.timeline_service import TimelineService
 
 
 class ExamService:
@@ -20,14 +21,13 @@ class ExamService:
         region_slug: str,
         discipline_slug: str,
         year: int,
-        current_user: User | None,
+        current_user: UserIdentity | None,
     ) -> dict[str, Any] | None:
         """Return template context for the exam page, or None if the event doesn't exist."""
         stmt = (
             select(ExamEvent)
             .options(
                 joinedload(ExamEvent.reports).joinedload(Report.work).joinedload(Work.composer),
-                joinedload(ExamEvent.reports).selectinload(Report.votes),
                 joinedload(ExamEvent.region),
                 joinedload(ExamEvent.discipline),
             )
@@ -74,7 +74,7 @@ class ExamService:
         discipline_slug: str,
         cursor: int | None,
         sparse_mode: bool,
-        current_user: User | None,
+        current_user: UserIdentity | None,
     ) -> dict[str, Any] | None:
         """Return template context for the discipline page, or None if region/discipline not found."""
         region = await ReferenceDataService.get_region_by_slug(db, region_slug)
@@ -91,13 +91,9 @@ class ExamService:
 
         batch_size = Pagination.DEFAULT_BATCH_SIZE
 
-        # Years that have data in the DB
-        result_years = await db.execute(
-            select(ExamEvent.year)
-            .join(ExamEvent.reports)
-            .filter(ExamEvent.region_id == region.id, ExamEvent.discipline_id == discipline.id)
-        )
-        db_years = set(result_years.scalars().all())
+        # Per-year summaries for every year with data, in one query
+        timeline = await TimelineService.get_years(db, region.id, discipline.id)
+        db_years = set(timeline)
 
         # Build the full sorted year list for this view
         if sparse_mode:
@@ -120,26 +116,10 @@ class ExamService:
         batch_years = filtered_years[:batch_size]
         show_more = len(filtered_years) > batch_size
 
-        # Fetch events for the batch with enough data for badge display
-        stmt = (
-            select(ExamEvent)
-            .options(
-                joinedload(ExamEvent.reports).joinedload(Report.work).joinedload(Work.composer),
-                joinedload(ExamEvent.reports).selectinload(Report.votes),
-            )
-            .filter(
-                ExamEvent.region_id == region.id,
-                ExamEvent.discipline_id == discipline.id,
-                ExamEvent.year.in_(batch_years),
-            )
-        )
-        result = await db.execute(stmt)
-        events_map = {e.year: e for e in result.unique().scalars().all()}
-
         # Build per-year display data
         years_data = []
         for year in batch_years:
-            event = events_map.get(year)  # type: ignore[call-overload]
+            entry = timeline.get(year)
             item: dict[str, Any] = {
                 "year": year,
                 "has_event": False,
@@ -151,50 +131,23 @@ class ExamService:
                 "badge_status": "empty",
             }
 
-            if event and len(event.reports) > 0:
+            if entry:
                 item["has_event"] = True
-                report_count = len(event.reports)
+                report_count = entry.report_count
                 item["report_count"] = report_count
                 item["status"] = (
                     f"{report_count} Aportación"
                     if report_count == 1
                     else f"{report_count} Aportaciones"
                 )
-
-                total_event_votes = sum(len(r.votes) for r in event.reports)
-                has_verified = False
-                work_stats: list[dict[str, Any]] = []
-
-                for report in event.reports:
-                    vote_count = len(report.votes)
-                    consensus_rate = vote_count / total_event_votes if total_event_votes > 0 else 0
-                    is_verified = (
-                        vote_count >= Consensus.MIN_VOTES_FOR_VERIFICATION
-                        and consensus_rate >= Consensus.VERIFICATION_THRESHOLD
-                    )
-                    if is_verified:
-                        has_verified = True
-                    work_stats.append(
-                        {"report": report, "votes": vote_count, "is_verified": is_verified}
-                    )
-
-                work_stats.sort(key=lambda x: x["votes"], reverse=True)
-
-                if work_stats:
-                    top = work_stats[0]
+                if entry.top_work_title is not None:
                     item["best_work"] = {
-                        "title": top["report"].work.title,
-                        "composer": top["report"].work.composer.name,
-                        "imslp_url": WorkService.get_score_url(top["report"].work),
-                        "is_verified": top["is_verified"],
+                        "title": entry.top_work_title,
+                        "composer": entry.top_composer_name,
+                        "imslp_url": entry.top_score_url,
+                        "is_verified": entry.has_verified,
                     }
-
-                if total_event_votes < Consensus.MIN_VOTES_FOR_VERIFICATION:
-                    item["badge_status"] = "neutral"
-                elif has_verified:
-                    item["badge_status"] = "verified"
-                else:
-                    item["badge_status"] = "disputed"
+                item["badge_status"] = entry.badge_status
 
             years_data.append(item)
 
@@ -0,0 +1,111 @@
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from cachetools import TLRUCache
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.constants import Cache
+from app.core.invalidation import invalidation_bus
+from app.core.security import SESSION_TOKEN_VERSION
+from app.models import User
+
+IDENTITY_KEY_PREFIX = "identity:"
+
+
+# The signed-in principal handed to endpoints and templates in place of the User row.
+@dataclass(frozen=True, slots=True)
+class UserIdentity:
+    id: int
+    email: str
+    role: str
+
+
+@dataclass(frozen=True, slots=True)
+class _CachedIdentity:
+    identity: UserIdentity
+    token_generation: int
+    expires_at: float  # time.time()
+
+
+class IdentityService:
+    """Signed-in users resolved from their session token, cached per worker by subject
+    (email) so authenticated page views and HTMX partials don't query ``users`` every
+    time. Holds plain snapshots, never ORM instances; an entry lives at most
+    ``Cache.IDENTITY_TTL_SECONDS`` and never past the expiry of the token that loaded it.
+    """
+
+    _identities: TLRUCache[str, _CachedIdentity] = TLRUCache(
+        maxsize=Cache.IDENTITY_MAX_ENTRIES,
+        ttu=lambda _key, cached, _now: cached.expires_at,
+        timer=time.time,
+    )
+
+    @staticmethod
+    async def resolve(db: AsyncSession, claims: dict[str, Any]) -> UserIdentity | None:
+        """The principal named by a verified token's claims, or None if the user is gone or
+        the token was revoked (issued before the user's current token_generation).
+
+        Session tokens carry the user id, so a cache miss is a primary-key lookup; older
+        tokens (subject and role only) are looked up by email and count as generation 0.
+        """
+        email = claims.get("sub")
+        if not isinstance(email, str):
+            return None
+        cached = IdentityService._identities.get(email)
+        if cached is None:
+            user_id = claims.get("uid") if claims.get("ver") == SESSION_TOKEN_VERSION else None
+            cached = await IdentityService._load(
+                db,
+                User.id == user_id if isinstance(user_id, int) else User.email == email,
+                float(claims.get("exp", 0)),
+            )
+        if cached is None or cached.identity.email != email:
+            return None
+        if claims.get("gen", 0) != cached.token_generation:
+            return None
+        return cached.identity
+
+    @staticmethod
+    async def _load(
+        db: AsyncSession, condition: Any, token_expires_at: float
+    ) -> _CachedIdentity | None:
+        result = await db.execute(
+            select(User.id, User.email, User.role, User.token_generation).filter(condition)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None  # not cached: the address may sign up next
+
+        cached = _CachedIdentity(
+            identity=UserIdentity(id=row.id, email=row.email, role=row.role),
+            token_generation=row.token_generation,
+            expires_at=min(time.time() + Cache.IDENTITY_TTL_SECONDS, token_expires_at),
+        )
+        IdentityService._identities[row.email] = cached
+        return cached
+
+    @staticmethod
+    async def revoke_tokens(db: AsyncSession, user: User) -> None:
+        """Invalidate every session token issued to ``user`` so far, on every worker."""
+        user.token_generation += 1
+        await db.commit()
+        IdentityService.invalidate(user.email)
+
+    @staticmethod
+    def invalidate(email: str) -> None:
+        """Evict ``email``'s identity in every worker (via the invalidation bus)."""
+        invalidation_bus.publish(IDENTITY_KEY_PREFIX + email)
+
+    @staticmethod
+    def _evict(bus_key: str) -> None:
+        IdentityService._identities.pop(bus_key.removeprefix(IDENTITY_KEY_PREFIX), None)
+
+    @staticmethod
+    def reset_cache() -> None:
+        """Clear cached identities. Used by tests."""
+        IdentityService._identities.clear()
+
+
+invalidation_bus.subscribe(IDENTITY_KEY_PREFIX, IdentityService._evict)
@@ -0,0 +1,220 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.core.constants import LiveUpdates
+from app.core.invalidation import invalidation_bus
+from app.models import Report
+from app.services.consensus import ConsensusService
+from app.services.page_cache_service import EVENT_PAGE_KEY_PREFIX
+
+logger = logging.getLogger("uvicorn")
+
+
+# One open event stream. ``pending`` holds the updates it hasn't sent yet, merged into a
+# single delta, so a slow client costs at most one event's worth of state.
+@dataclass(eq=False, slots=True)
+class _Subscriber:
+    wake: asyncio.Event = field(default_factory=asyncio.Event)
+    pending: dict[str, Any] | None = None
+
+
+class LiveUpdateService:
+    """Server-sent consensus updates for exam pages.
+
+    Every report/vote/flag reaches each worker through the invalidation bus as an event
+    page key; events with open streams are marked dirty, and once per
+    ``LiveUpdates.COALESCE_INTERVAL_SECONDS`` one query reads the vote counters of all of
+    them. Each stream then gets only what changed since the previous update:
+
+        {"total_votes": 5, "event_status": "disputed",
+         "reports": {"12": {"votes": 3, "percentage": 60, "status": "disputed", "flagged": false}}}
+    """
+
+    _subscribers: defaultdict[int, set[_Subscriber]] = defaultdict(set)
+    _subscriber_count = 0
+    _dirty: set[int] = set()
+    # Last state sent per event (same shape as a delta, with every report), for diffing
+    # and to bring new subscribers up to date.
+    _state: dict[int, dict[str, Any]] = {}
+    _flusher: asyncio.Task[None] | None = None
+
+    @staticmethod
+    def max_subscribers() -> int:
+        """Open streams this worker accepts: its share of the VM's stream memory budget."""
+        budget_kb = (
+            settings.LIVE_UPDATES_MEMORY_BUDGET_MB * 1024 // max(settings.WEB_CONCURRENCY, 1)
+        )
+        return budget_kb // LiveUpdates.STREAM_MEMORY_KB
+
+    @staticmethod
+    def is_full() -> bool:
+        return LiveUpdateService._subscriber_count >= LiveUpdateService.max_subscribers()
+
+    @staticmethod
+    async def stream(event_id: int) -> AsyncIterator[str]:
+        """``text/event-stream`` body for one client, until it disconnects."""
+        subscriber = _Subscriber()
+        LiveUpdateService._subscribe(event_id, subscriber)
+        try:
+            yield f"retry: {LiveUpdates.RETRY_MILLISECONDS}\n\n"
+            while True:
+                try:
+                    await asyncio.wait_for(subscriber.wake.wait(), LiveUpdates.HEARTBEAT_SECONDS)
+                except TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                subscriber.wake.clear()
+                delta, subscriber.pending = subscriber.pending, None
+                if delta:
+                    data = json.dumps(delta, separators=(",", ":"))
+                    yield f"event: consensus\ndata: {data}\n\n"
+        finally:
+            LiveUpdateService._unsubscribe(event_id, subscriber)
+
+    @staticmethod
+    def _subscribe(event_id: int, subscriber: _Subscriber) -> None:
+        LiveUpdateService._subscribers[event_id].add(subscriber)
+        LiveUpdateService._subscriber_count += 1
+        state = LiveUpdateService._state.get(event_id)
+        if state is not None:
+            # The page may predate the last update sent to the others.
+            LiveUpdateService._push(subscriber, state)
+
+    @staticmethod
+    def _unsubscribe(event_id: int, subscriber: _Subscriber) -> None:
+        subscribers = LiveUpdateService._subscribers.get(event_id)
+        if subscribers is None or subscriber not in subscribers:
+            return
+        subscribers.discard(subscriber)
+        LiveUpdateService._subscriber_count -= 1
+        if not subscribers:
+            del LiveUpdateService._subscribers[event_id]
+            LiveUpdateService._state.pop(event_id, None)
+            LiveUpdateService._dirty.discard(event_id)
+
+    @staticmethod
+    def _push(subscriber: _Subscriber, delta: dict[str, Any]) -> None:
+        # Deltas are shared between subscribers and never mutated; merging builds a new one.
+        pending = subscriber.pending
+        if pending is None:
+            subscriber.pending = delta
+        else:
+            subscriber.pending = {
+                **pending,
+                **delta,
+                "reports": {**pending["reports"], **delta["reports"]},
+            }
+        subscriber.wake.set()
+
+    @staticmethod
+    def _mark_dirty(bus_key: str) -> None:
+        event_id = int(bus_key.removeprefix(EVENT_PAGE_KEY_PREFIX))
+        if event_id in LiveUpdateService._subscribers:
+            LiveUpdateService._dirty.add(event_id)
+
+    @staticmethod
+    def consensus_state(rows: list[tuple[int, int, bool | None]]) -> dict[str, Any]:
+        """Full state of one event from its (report id, vote_count, is_flagged) rows."""
+        total_votes = sum(votes for _, votes, _ in rows)
+        reports = {}
+        for report_id, votes, flagged in rows:
+            metrics = ConsensusService.calculate_work_status(votes, total_votes)
+            reports[str(report_id)] = {
+                "votes": votes,
+                "percentage": metrics["percentage"],
+                "status": metrics["status"],
+                "flagged": bool(flagged),
+            }
+        has_verified = any(r["status"] == "verified" for r in reports.values())
+        return {
+            "total_votes": total_votes,
+            "event_status": ConsensusService.calculate_event_status(total_votes, has_verified),
+            "reports": reports,
+        }
+
+    @staticmethod
+    def _diff(previous: dict[str, Any] | None, state: dict[str, Any]) -> dict[str, Any] | None:
+        if previous is None:
+            return state
+        reports = {
+            report_id: report
+            for report_id, report in state["reports"].items()
+            if previous["reports"].get(report_id) != report
+        }
+        if not reports and all(previous[k] == state[k] for k in ("total_votes", "event_status")):
+            return None
+        return {**state, "reports": reports}
+
+    @staticmethod
+    async def flush(db: AsyncSession) -> None:
+        """Send the dirty events' changes to their subscribers (one query for all of them)."""
+        event_ids = LiveUpdateService._dirty & LiveUpdateService._subscribers.keys()
+        LiveUpdateService._dirty.clear()
+        if not event_ids:
+            return
+
+        result = await db.execute(
+            select(Report.event_id, Report.id, Report.vote_count, Report.is_flagged)
+            .filter(Report.event_id.in_(event_ids))
+            .order_by(Report.id)
+        )
+        rows: defaultdict[int, list[tuple[int, int, bool | None]]] = defaultdict(list)
+        for event_id, report_id, votes, flagged in result.tuples():
+            rows[event_id].append((report_id, votes, flagged))
+
+        for event_id in event_ids:
+            subscribers = LiveUpdateService._subscribers.get(event_id)
+            if not subscribers:
+                continue  # every client left while the query ran
+            state = LiveUpdateService.consensus_state(rows[event_id])
+            delta = LiveUpdateService._diff(LiveUpdateService._state.get(event_id), state)
+            LiveUpdateService._state[event_id] = state
+            if delta is not None:
+                for subscriber in subscribers:
+                    LiveUpdateService._push(subscriber, delta)
+
+    @staticmethod
+    def start(session_factory: async_sessionmaker[AsyncSession]) -> None:
+        """Start this worker's flusher (app startup)."""
+        LiveUpdateService._flusher = asyncio.create_task(LiveUpdateService._run(session_factory))
+
+    @staticmethod
+    async def stop() -> None:
+        task, LiveUpdateService._flusher = LiveUpdateService._flusher, None
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+    @staticmethod
+    async def _run(session_factory: async_sessionmaker[AsyncSession]) -> None:
+        while True:
+            await asyncio.sleep(LiveUpdates.COALESCE_INTERVAL_SECONDS)
+            if not LiveUpdateService._dirty:
+                continue
+            try:
+                async with session_factory() as session:
+                    await LiveUpdateService.flush(session)
+            except Exception:
+                logger.exception("Live update flush failed; retrying")
+
+    @staticmethod
+    def reset_cache() -> None:
+        """Forget subscribers and sent state. Used by tests."""
+        LiveUpdateService._subscribers.clear()
+        LiveUpdateService._subscriber_count = 0
+        LiveUpdateService._dirty.clear()
+        LiveUpdateService._state.clear()
+
+
+invalidation_bus.subscribe(EVENT_PAGE_KEY_PREFIX, LiveUpdateService._mark_dirty)
@@ -1,10 +1,189 @@
-from typing import cast
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, cast
 
 import httpx
+from cachetools import LRUCache
+
+from app.core.config import settings
+from app.core.constants import Cache
+from app.core.http import OPENOPUS, http_clients
+from app.services.typeahead_service import normalize
+
+logger = logging.getLogger("uvicorn")
 
 OPENOPUS_API_URL = "https://api.openopus.org"
 
 
+@dataclass(frozen=True, slots=True)
+class CatalogueWork:
+    openopus_id: str
+    title: str
+    nickname: str
+    # normalize(title) + NUL + normalize(nickname): one ``in`` test per work, and the
+    # separator (never produced by normalize) keeps a match from spanning both fields.
+    search_key: str
+
+
+@dataclass(frozen=True, slots=True)
+class Catalogue:
+    works: tuple[CatalogueWork, ...]
+    fetched_at: float  # time.time(), so ages survive a restart via the disk store
+
+
+def build_catalogue(raw_works: list[dict[str, Any]], fetched_at: float) -> Catalogue:
+    works = []
+    for work in raw_works:
+        title = work.get("title") or ""
+        nickname = work.get("nickname") or ""
+        works.append(
+            CatalogueWork(
+                openopus_id=str(work.get("id")),
+                title=title,
+                nickname=nickname,
+                search_key=f"{normalize(title)}\0{normalize(nickname)}",
+            )
+        )
+    return Catalogue(works=tuple(works), fetched_at=fetched_at)
+
+
+class WorkCatalogueCache:
+    """Per-composer OpenOpus work catalogues, so a search filters a cached list instead of
+    downloading thousands of works per keystroke.
+
+    Fresh for ``Cache.OPENOPUS_CATALOGUE_TTL_SECONDS``; after that the cached catalogue is
+    still served for up to ``OPENOPUS_CATALOGUE_STALE_SECONDS`` while a background task
+    refetches it. Older (or missing) catalogues are fetched inline, falling back to the
+    stale copy if OpenOpus fails. With ``settings.OPENOPUS_CACHE_DIR`` set, catalogues are
+    also written to disk and reloaded from there after a restart.
+    """
+
+    _catalogues: LRUCache[str, Catalogue] = LRUCache(maxsize=Cache.OPENOPUS_CATALOGUE_MAX_ENTRIES)
+    _refreshes: dict[str, asyncio.Task[None]] = {}
+
+    @staticmethod
+    async def get(composer_id: str) -> Catalogue:
+        catalogue = WorkCatalogueCache._catalogues.get(composer_id)
+        if catalogue is None:
+            catalogue = await WorkCatalogueCache._read_disk(composer_id)
+            if catalogue is not None:
+                WorkCatalogueCache._catalogues[composer_id] = catalogue
+
+        if catalogue is not None:
+            age = time.time() - catalogue.fetched_at
+            if age < Cache.OPENOPUS_CATALOGUE_TTL_SECONDS:
+                return catalogue
+            stale_limit = (
+                Cache.OPENOPUS_CATALOGUE_TTL_SECONDS + Cache.OPENOPUS_CATALOGUE_STALE_SECONDS
+            )
+            if age < stale_limit:
+                WorkCatalogueCache._schedule_refresh(composer_id)
+                return catalogue
+
+        try:
+            return await WorkCatalogueCache._fetch(composer_id)
+        except Exception:
+            if catalogue is None:
+                raise
+            logger.warning("OpenOpus refetch failed for composer %s; serving stale", composer_id)
+            return catalogue
+
+    @staticmethod
+    async def _fetch(composer_id: str) -> Catalogue:
+        # Fetch all works for the composer
+        url = f"{OPENOPUS_API_URL}/work/list/composer/{composer_id}/genre/all.json"
+
+        async def fetch(client: httpx.AsyncClient) -> list[dict[str, Any]]:
+            response = await client.get(url)
+            # OpenOpus might return 404 if composer not found or invalid: cache it as empty
+            if response.status_code == 404:
+                return []
+            response.raise_for_status()
+            return cast(list[dict[str, Any]], response.json().get("works") or [])
+
+        # Single-flight: a burst of keystrokes for an uncached composer shares one download.
+        raw_works = await http_clients.call(OPENOPUS, url, fetch)
+
+        catalogue = build_catalogue(raw_works, time.time())
+        WorkCatalogueCache._catalogues[composer_id] = catalogue
+        await WorkCatalogueCache._write_disk(composer_id, raw_works, catalogue.fetched_at)
+        return catalogue
+
+    @staticmethod
+    def _schedule_refresh(composer_id: str) -> None:
+        if composer_id in WorkCatalogueCache._refreshes:
+            return
+        task = asyncio.create_task(WorkCatalogueCache._refresh(composer_id))
+        WorkCatalogueCache._refreshes[composer_id] = task
+        task.add_done_callback(lambda _: WorkCatalogueCache._refreshes.pop(composer_id, None))
+
+    @staticmethod
+    async def _refresh(composer_id: str) -> None:
+        try:
+            await WorkCatalogueCache._fetch(composer_id)
+        except Exception:
+            logger.warning("Background OpenOpus refresh failed for composer %s", composer_id)
+
+    @staticmethod
+    def _disk_path(composer_id: str) -> Path | None:
+        if not settings.OPENOPUS_CACHE_DIR:
+            return None
+        return Path(settings.OPENOPUS_CACHE_DIR) / f"works_{composer_id}.json"
+
+    @staticmethod
+    async def _read_disk(composer_id: str) -> Catalogue | None:
+        path = WorkCatalogueCache._disk_path(composer_id)
+        if path is None:
+            return None
+
+        def read() -> Catalogue | None:
+            try:
+                stored = json.loads(path.read_text(encoding="utf-8"))
+                return build_catalogue(stored["works"], stored["fetched_at"])
+            except FileNotFoundError:
+                return None
+            except (OSError, ValueError, KeyError):
+                logger.warning("Ignoring unreadable OpenOpus cache file %s", path)
+                return None
+
+        return await asyncio.to_thread(read)
+
+    @staticmethod
+    async def _write_disk(composer_id: str, raw_works: list[dict[str, Any]], at: float) -> None:
+        path = WorkCatalogueCache._disk_path(composer_id)
+        if path is None:
+            return
+        trimmed = [
+            {"id": w.get("id"), "title": w.get("title"), "nickname": w.get("nickname")}
+            for w in raw_works
+        ]
+
+        def write() -> None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write-then-rename: concurrent workers never read a half-written file.
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({"fetched_at": at, "works": trimmed}), encoding="utf-8")
+            os.replace(tmp, path)
+
+        try:
+            await asyncio.to_thread(write)
+        except OSError:
+            logger.warning("Could not write OpenOpus cache file %s", path)
+
+    @staticmethod
+    def reset_cache() -> None:
+        """Clear cached catalogues (memory only). Used by tests."""
+        for task in WorkCatalogueCache._refreshes.values():
+            task.cancel()
+        WorkCatalogueCache._refreshes.clear()
+        WorkCatalogueCache._catalogues.clear()
+
+
 async def get_popular_composers() -> list[dict]:
     """
     Fetch popular composers from OpenOpus to seed the database.
@@ -12,12 +191,14 @@ async def get_popular_composers() -> list[dict]:
     """
     url = f"{OPENOPUS_API_URL}/composer/list/pop.json"
 
-    async with httpx.AsyncClient() as client:
+    async def fetch(client: httpx.AsyncClient) -> Any:
         # OpenOpus sometimes requires a User-Agent or acts quirky, but usually standard GET works.
         # Wait, the docs say GET is fine.
         response = await client.get(url)
         response.raise_for_status()
-        data = response.json()
+        return response.json()
+
+    data = await http_clients.call(OPENOPUS, url, fetch)
 
     # OpenOpus structure: { "status": ..., "composers": [ ... ] }
     return cast(list[dict], data.get("composers", []))
@@ -28,37 +209,27 @@ async def search_work(query: str, composer_id: str | None = None) -> list[dict]:
     Search for works in OpenOpus.
     Since the global search endpoint seems deprecated/broken, we use the strategy:
     If composer_id is provided, fetch ALL works for that composer and filter locally.
+    The catalogue is cached (see WorkCatalogueCache), so only the filter runs per keystroke.
     """
-    if not composer_id:
+    if not composer_id or not composer_id.isdigit():
         # Global search is not reliably available via simple API.
-        # We require a composer_id to scope the search.
+        # We require a (numeric) composer_id to scope the search.
         return []
 
-    # Fetch all works for the composer
-    url = f"{OPENOPUS_API_URL}/work/list/composer/{composer_id}/genre/all.json"
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url)
-        # OpenOpus might return 404 if composer not found or invalid
-        if response.status_code == 404:
-            return []
-        response.raise_for_status()
-        data = response.json()
-
-    all_works = data.get("works", [])
-
-    # Filter works by query (case-insensitive)
-    query_lower = query.lower()
+    # Accent- and case-insensitive substring match against the pre-folded keys
+    needle = normalize(query)
+    if not needle:
+        return []  # punctuation only: "" would match the whole catalogue
+    catalogue = await WorkCatalogueCache.get(composer_id)
     return [
         {
-            "title": work.get("title", ""),
-            "nickname": work.get("nickname", ""),
-            "openopus_id": str(work.get("id")),
+            "title": work.title,
+            "nickname": work.nickname,
+            "openopus_id": work.openopus_id,
             "is_verified": True,  # It comes from OpenOpus
         }
-        for work in all_works
-        if query_lower in work.get("title", "").lower()
-        or query_lower in work.get("nickname", "").lower()
+        for work in catalogue.works
+        if needle in work.search_key
     ]
 
 
@@ -70,11 +241,13 @@ async def search_composer_by_name(name: str) -> list[dict]:
     url = f"{OPENOPUS_API_URL}/composer/list/search.json"
     data = {"criteria": name}
 
-    async with httpx.AsyncClient() as client:
+    async def fetch(client: httpx.AsyncClient) -> Any:
         response = await client.post(url, json=data)
         if response.status_code == 404:
-            return []
+            return {}
         response.raise_for_status()
-        res_data = response.json()
+        return response.json()
+
+    res_data = await http_clients.call(OPENOPUS, (url, name), fetch)
 
     return cast(list[dict], res_data.get("composers", []))
@@ -0,0 +1,146 @@
+from collections.abc import Collection
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import bindparam, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import aliased
+
+from app.db.session import dialect_insert
+from app.models import Composer, Work
+
+
+class OpenOpusImportService:
+    """Bulk upserts of OpenOpus composers/works keyed on ``openopus_id``: one statement per
+    batch instead of a lookup and an insert per row. Rows created before they were linked
+    to OpenOpus (same name, or same title for the composer) are adopted rather than
+    duplicated. Nothing is committed here; callers commit per batch.
+    """
+
+    @staticmethod
+    async def upsert_composers(db: AsyncSession, composers: list[dict[str, Any]]) -> dict[str, int]:
+        """Upsert OpenOpus composer payloads; returns {openopus_id: local composer id}."""
+        rows = {
+            str(c["id"]): {
+                "openopus_id": str(c["id"]),
+                "name": c.get("complete_name") or c.get("name"),
+                "is_verified": True,
+            }
+            for c in composers
+            if c.get("id") is not None and (c.get("complete_name") or c.get("name"))
+        }
+        if not rows:
+            return {}
+
+        # Adopt the oldest unlinked composer of the same name, unless the id is already taken.
+        unlinked, linked = aliased(Composer), aliased(Composer)
+        conn = await db.connection()
+        await conn.execute(
+            update(Composer)
+            .where(
+                Composer.id
+                == select(func.min(unlinked.id))
+                .filter(unlinked.name == bindparam("match_name"), unlinked.openopus_id.is_(None))
+                .scalar_subquery(),
+                ~select(linked.id).filter(linked.openopus_id == bindparam("link_id")).exists(),
+            )
+            .values(openopus_id=bindparam("link_id"), is_verified=True),
+            [{"match_name": r["name"], "link_id": r["openopus_id"]} for r in rows.values()],
+        )
+        stmt = dialect_insert(db, Composer)
+        await conn.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[Composer.openopus_id],
+                set_={"name": stmt.excluded.name, "is_verified": True},
+            ),
+            list(rows.values()),
+        )
+        result = await db.execute(
+            select(Composer.openopus_id, Composer.id).filter(Composer.openopus_id.in_(rows))
+        )
+        return {
+            openopus_id: composer_id for openopus_id, composer_id in result.tuples() if openopus_id
+        }
+
+    @staticmethod
+    async def upsert_works(db: AsyncSession, works: list[tuple[int, dict[str, Any]]]) -> int:
+        """Upsert (local composer id, OpenOpus work payload) pairs; returns rows written."""
+        rows = {
+            str(w["id"]): {
+                "openopus_id": str(w["id"]),
+                "title": w["title"],
+                "nickname": w.get("nickname") or w.get("subtitle") or None,
+                "composer_id": composer_id,
+                "is_verified": True,
+            }
+            for composer_id, w in works
+            if w.get("id") is not None and w.get("title")
+        }
+        if not rows:
+            return 0
+
+        unlinked, linked = aliased(Work), aliased(Work)
+        conn = await db.connection()
+        await conn.execute(
+            update(Work)
+            .where(
+                Work.id
+                == select(func.min(unlinked.id))
+                .filter(
+                    unlinked.composer_id == bindparam("match_composer"),
+                    unlinked.title == bindparam("match_title"),
+                    unlinked.openopus_id.is_(None),
+                )
+                .scalar_subquery(),
+                ~select(linked.id).filter(linked.openopus_id == bindparam("link_id")).exists(),
+            )
+            .values(openopus_id=bindparam("link_id"), is_verified=True),
+            [
+                {
+                    "match_composer": r["composer_id"],
+                    "match_title": r["title"],
+                    "link_id": r["openopus_id"],
+                }
+                for r in rows.values()
+            ],
+        )
+        stmt = dialect_insert(db, Work)
+        await conn.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[Work.openopus_id],
+                set_={
+                    "title": stmt.excluded.title,
+                    "nickname": stmt.excluded.nickname,
+                    "composer_id": stmt.excluded.composer_id,
+                    "is_verified": True,
+                },
+            ),
+            list(rows.values()),
+        )
+        return len(rows)
+
+    @staticmethod
+    async def mark_catalogues_imported(db: AsyncSession, composer_ids: Collection[int]) -> None:
+        """Record that these composers' complete OpenOpus catalogues are now local."""
+        if composer_ids:
+            await db.execute(
+                update(Composer)
+                .filter(Composer.id.in_(composer_ids))
+                .values(catalogue_imported_at=datetime.now(timezone.utc))
+            )
+
+    @staticmethod
+    async def mirrored_composer_id(db: AsyncSession, openopus_composer_id: str) -> int | None:
+        """Local id of this OpenOpus composer if its catalogue has been imported, else None.
+
+        Works linked one at a time (picked from OpenOpus results in the wizard, or from a
+        CSV) don't count: only ``mark_catalogues_imported`` switches a composer over.
+        """
+        composer_id: int | None = await db.scalar(
+            select(Composer.id).filter(
+                Composer.openopus_id == openopus_composer_id,
+                Composer.catalogue_imported_at.is_not(None),
+            )
+        )
+        return composer_id
@@ -0,0 +1,122 @@
+import hashlib
+from collections import defaultdict
+from dataclasses import dataclass
+from urllib.parse import urlencode
+
+from cachetools import TTLCache
+from fastapi import Request
+from fastapi.responses import HTMLResponse, Response
+
+from app.core.constants import Cache
+from app.core.invalidation import invalidation_bus
+
+PAGE_KEY_PREFIX = "page:"
+# Published by ReportService after every report/vote/flag (see PageCacheService.event_tag).
+EVENT_PAGE_KEY_PREFIX = PAGE_KEY_PREFIX + "event:"
+
+
+@dataclass(frozen=True, slots=True)
+class CachedPage:
+    body: bytes
+    etag: str
+    tags: frozenset[str]
+
+
+class _PageCache(TTLCache[str, CachedPage]):
+    """TTLCache that drops a page's tag index entries when it expires or is evicted."""
+
+    def expire(self, time: float | None = None) -> list[tuple[str, CachedPage]]:
+        expired = list(super().expire(time))
+        for key, page in expired:
+            PageCacheService._unindex(key, page)
+        return expired
+
+    def popitem(self) -> tuple[str, CachedPage]:
+        key, page = super().popitem()
+        PageCacheService._unindex(key, page)
+        return key, page
+
+
+class PageCacheService:
+    """Rendered-HTML cache for anonymous exam/discipline page views. Entries are tagged
+    with the event/discipline they render so ReportService can drop exactly the affected
+    pages after a vote, flag or report commits.
+    """
+
+    _pages: _PageCache = _PageCache(
+        maxsize=Cache.PAGE_CACHE_MAX_ENTRIES, ttl=Cache.PAGE_CACHE_TTL_SECONDS
+    )
+    # Only ever holds keys that are in _pages, so it is bounded by the same LRU.
+    _keys_by_tag: defaultdict[str, set[str]] = defaultdict(set)
+
+    @staticmethod
+    def event_tag(event_id: int) -> str:
+        return f"event:{event_id}"
+
+    @staticmethod
+    def discipline_tag(region_id: int, discipline_id: int) -> str:
+        return f"discipline:{region_id}:{discipline_id}"
+
+    @staticmethod
+    def key_for(request: Request, **params: object) -> str:
+        """Key for the page at this path rendered with the endpoint's parsed ``params``.
+
+        Built from the parameters the page actually depends on rather than the raw query
+        string, so unknown or reordered query parameters can't mint new entries.
+        """
+        query = urlencode(sorted((name, str(value)) for name, value in params.items()))
+        return f"{request.url.path}?{query}"
+
+    @staticmethod
+    def get(key: str) -> CachedPage | None:
+        return PageCacheService._pages.get(key)
+
+    @staticmethod
+    def store(key: str, body: bytes, tags: set[str]) -> CachedPage:
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        page = CachedPage(body=body, etag=etag, tags=frozenset(tags))
+        PageCacheService._pages[key] = page
+        for tag in tags:
+            PageCacheService._keys_by_tag[tag].add(key)
+        return page
+
+    @staticmethod
+    def invalidate(*tags: str) -> None:
+        """Evict pages carrying any of ``tags`` in every worker (via the invalidation bus)."""
+        invalidation_bus.publish(*(PAGE_KEY_PREFIX + tag for tag in tags))
+
+    @staticmethod
+    def _evict(bus_key: str) -> None:
+        tag = bus_key.removeprefix(PAGE_KEY_PREFIX)
+        for key in PageCacheService._keys_by_tag.pop(tag, set()):
+            page = PageCacheService._pages.pop(key, None)
+            if page is not None:
+                PageCacheService._unindex(key, page)
+
+    @staticmethod
+    def _unindex(key: str, page: CachedPage) -> None:
+        for tag in page.tags:
+            keys = PageCacheService._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del PageCacheService._keys_by_tag[tag]
+
+    @staticmethod
+    def respond(request: Request, page: CachedPage) -> Response:
+        """Serve a cached page, or a bodyless 304 if the client already holds this version."""
+        headers = {"ETag": page.etag, "Cache-Control": "no-cache", "Vary": "Cookie"}
+        if_none_match = request.headers.get("if-none-match", "")
+        client_etags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if page.etag in client_etags or "*" in client_etags:
+            return Response(status_code=304, headers=headers)
+        return HTMLResponse(content=page.body, headers=headers)
+
+    @staticmethod
+    def reset_cache() -> None:
+        """Clear cached pages. Used by tests to avoid state leaking across test data."""
+        PageCacheService._pages.clear()
+        PageCacheService._keys_by_tag.clear()
+
+
+invalidation_bus.subscribe(PAGE_KEY_PREFIX, PageCacheService._evict)
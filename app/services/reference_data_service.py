@@ -5,8 +5,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app.core.constants import Cache
+from app.core.invalidation import invalidation_bus
 from app.models import Discipline, Region
 
+REFERENCE_DATA_KEY = "reference-data"
+
 
 @dataclass(frozen=True)
 class RegionRef:
@@ -67,6 +70,14 @@ class ReferenceDataService:
 
     @staticmethod
     def reset_cache() -> None:
-        """Clear cached entries. Used by tests to avoid state leaking across test data."""
+        """Clear cached entries in every worker (via the invalidation bus). Also used by
+        tests to avoid state leaking across test data."""
+        invalidation_bus.publish(REFERENCE_DATA_KEY)
+
+    @staticmethod
+    def _clear(_key: str) -> None:
         ReferenceDataService._region_cache.clear()
         ReferenceDataService._discipline_cache.clear()
+
+
+invalidation_bus.subscribe(REFERENCE_DATA_KEY, ReferenceDataService._clear)
@@ -1,18 +1,26 @@
+from collections import Counter
 from typing import Any
 
-import httpx
 from fastapi import HTTPException
-from sqlalchemy import Select
+from sqlalchemy import Select, func, insert, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.api import deps
 from app.core.config import settings
-from app.models import Composer, ExamEvent, Report, User, Vote, Work
+from app.core.http import TURNSTILE, http_clients
+from app.db.session import dialect_insert
+from app.models import Composer, ExamEvent, Report, UserEventParticipation, Vote, Work
 from app.schemas.report import ComposerInput, ReportCreate, ScopeEnum, WorkInput
 from app.services import wikidata
 from app.services.consensus import ConsensusService
+from app.services.identity_service import UserIdentity
+from app.services.page_cache_service import PageCacheService
+from app.services.typeahead_service import TypeaheadService
+from app.services.vote_queue_service import QueuedVote, VoteQueueService
 from app.services.work_service import WorkService
 
 
@@ -23,17 +31,16 @@ class ReportService:
         if not token:
             raise HTTPException(status_code=400, detail="Falta validación Anti-Spam (Turnstile)")
 
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                "https://challenges.cloudflare.com/turnstile/v0/siteverify",
-                data={
-                    "secret": settings.TURNSTILE_SECRET_KEY,
-                    "response": token,
-                },
-            )
-            data = resp.json()
-            if not data.get("success"):
-                raise HTTPException(status_code=400, detail="Token Anti-Spam inválido")
+        resp = await http_clients.get(TURNSTILE).post(
+            "https://challenges.cloudflare.com/turnstile/v0/siteverify",
+            data={
+                "secret": settings.TURNSTILE_SECRET_KEY,
+                "response": token,
+            },
+        )
+        data = resp.json()
+        if not data.get("success"):
+            raise HTTPException(status_code=400, detail="Token Anti-Spam inválido")
 
     @staticmethod
     async def get_or_create_composer(db: AsyncSession, data: ComposerInput) -> Composer:
@@ -54,7 +61,7 @@ class ReportService:
                 return composer
             try:
                 wd_data = await wikidata.get_composer_by_id(data.wikidata_id)
-                name = wd_data.get("name") or data.name or "Compositor Desconocido"
+                name = wd_data.name or data.name or "Compositor Desconocido"
                 composer = Composer(name=name, wikidata_id=data.wikidata_id, is_verified=True)
                 db.add(composer)
                 await db.flush()
@@ -111,7 +118,7 @@ class ReportService:
 
     @staticmethod
     async def submit_report(
-        db: AsyncSession, current_user: User, report_in: ReportCreate
+        db: AsyncSession, current_user: UserIdentity, report_in: ReportCreate
     ) -> Report:
         """Full report submission: verify Turnstile, resolve entities, check participation,
         get/create report candidate, add vote, commit."""
@@ -131,20 +138,13 @@ class ReportService:
         # 3. Resolve Work
         work = await ReportService.get_or_create_work(db, report_in.work, int(composer.id))
 
-        # 4. Strict Participation Check
-        has_participated, _ = await deps.check_user_event_participation(
-            db, int(current_user.id), int(event.id)
-        )
-        if has_participated:
-            raise HTTPException(status_code=400, detail="Ya has participado en esta convocatoria.")
-
-        # 5. Build movement details string
+        # 4. Build movement details string
         full_details = report_in.movement_details
         if report_in.scope != ScopeEnum.WHOLE_WORK:
             prefix = f"[{report_in.scope.value}] "
             full_details = f"{prefix}{full_details}" if full_details else prefix
 
-        # 6. Get or create Report candidate
+        # 5. Get or create Report candidate
         existing = (
             await db.execute(
                 select(Report).filter(Report.event_id == event.id, Report.work_id == work.id)
@@ -164,18 +164,23 @@ class ReportService:
             db.add(report)
             await db.flush()
 
-        # 7. Add Vote
-        vote = Vote(user_id=current_user.id, report_id=report.id)
-        db.add(vote)
+        # 6. Add Vote (fails with 400 if the user already participated in this event)
+        await ReportService._record_vote(db, int(current_user.id), report)
+        await ConsensusService.refresh_event_snapshot(db, int(event.id))
 
         await db.commit()
+        await ReportService._invalidate_cached_pages(db, int(event.id))
+        if report_in.composer.id is None or report_in.work.id is None:
+            # A composer/work may have just been created: every worker's typeahead
+            # index pulls in new rows on its next suggestion.
+            TypeaheadService.invalidate()
         await db.refresh(report)
         return report
 
     @staticmethod
     def build_item_dict(report: Report, total_vs: int) -> dict[str, Any]:
         """Compute consensus metrics dict for a single report."""
-        vs_count = len(report.votes)
+        vs_count = report.vote_count
         m = ConsensusService.calculate_work_status(vs_count, total_vs)
         return {
             "report_id": report.id,
@@ -194,14 +199,11 @@ class ReportService:
         return (
             select(Report)
             .options(
-                selectinload(Report.votes),
                 joinedload(Report.work).joinedload(Work.composer),
                 joinedload(Report.event)
                 .selectinload(ExamEvent.reports)
-                .options(
-                    selectinload(Report.votes),
-                    joinedload(Report.work).joinedload(Work.composer),
-                ),
+                .joinedload(Report.work)
+                .joinedload(Work.composer),
             )
             .filter(Report.id == report_id)
         )
@@ -213,14 +215,170 @@ class ReportService:
         return result.unique().scalar_one_or_none()
 
     @staticmethod
-    async def cast_vote(db: AsyncSession, user_id: int, report: Report) -> None:
-        """Insert a Vote for the given report and commit."""
-        vote = Vote(user_id=user_id, report_id=report.id)
-        db.add(vote)
+    async def _record_vote(db: AsyncSession, user_id: int, report: Report) -> None:
+        """Add a Vote and bump the denormalized counters in the same transaction.
+
+        The UserEventParticipation row is inserted first: its primary key is the
+        one-vote-per-event rule, so a user who already participated (including a racing
+        request in another worker) gets a 400 and the whole transaction is rolled back.
+        The counters are incremented in SQL (``vote_count = vote_count + 1``) rather than
+        in Python so concurrent votes from other workers can't overwrite each other.
+        """
+        db.add(
+            UserEventParticipation(user_id=user_id, event_id=report.event_id, report_id=report.id)
+        )
+        try:
+            await db.flush()
+        except IntegrityError as e:
+            await db.rollback()
+            raise HTTPException(
+                status_code=400, detail="Ya has participado en esta convocatoria."
+            ) from e
+
+        db.add(Vote(user_id=user_id, report_id=report.id))
+        deps.remember_participation(db, user_id, int(report.event_id), int(report.id))
+        await db.execute(
+            update(Report).where(Report.id == report.id).values(vote_count=Report.vote_count + 1)
+        )
+        await db.execute(
+            update(ExamEvent)
+            .where(ExamEvent.id == report.event_id)
+            .values(total_votes=ExamEvent.total_votes + 1)
+        )
+
+    @staticmethod
+    async def cast_vote(db: AsyncSession, user_id: int, report: Report) -> dict[int, int]:
+        """Insert a Vote for the given report and commit.
+
+        Returns {report id: vote_count} for the event's reports as of the vote, read inside
+        the write transaction by the same query that refreshes the consensus snapshot.
+        With the write-behind queue running, the vote is committed in a batch by the
+        queue's writer (``write_vote_batch``) and this returns once that batch has committed.
+        """
+        event_id = int(report.event_id)
+        if VoteQueueService.is_running():
+            # Hand this session's connection back to the pool while the vote waits.
+            await db.commit()
+            counts = await VoteQueueService.submit(user_id, int(report.id), event_id)
+            if counts is not None:
+                deps.remember_participation(db, user_id, event_id, int(report.id))
+                return counts
+            # The writer stopped meanwhile (shutdown): write the vote here instead.
+        await ReportService._record_vote(db, user_id, report)
+        vote_counts = await ConsensusService.event_vote_counts(db, event_id)
+        await ConsensusService.refresh_event_snapshot(db, event_id, vote_counts)
+        await db.commit()
+        await ReportService._invalidate_cached_pages(db, event_id)
+        return dict(vote_counts)
+
+    @staticmethod
+    async def write_vote_batch(db: AsyncSession, votes: list[QueuedVote]) -> None:
+        """Write a batch of queued votes in one transaction, then settle each vote's future
+        with its event's counters (as ``cast_vote`` returns them) as soon as it commits.
+
+        Same rules as ``_record_vote``: the participation rows go in first, and a vote whose
+        user already participated in the event (earlier, elsewhere, or earlier in this
+        batch) is skipped with a 400 while the rest of the batch still commits.
+        """
+        by_participation: dict[tuple[int, int], QueuedVote] = {}
+        for vote in votes:
+            by_participation.setdefault((vote.user_id, vote.event_id), vote)
+        result = await db.execute(
+            dialect_insert(db, UserEventParticipation)
+            .on_conflict_do_nothing()
+            .returning(UserEventParticipation.user_id, UserEventParticipation.event_id),
+            [
+                {"user_id": v.user_id, "event_id": v.event_id, "report_id": v.report_id}
+                for v in by_participation.values()
+            ],
+        )
+        accepted = [by_participation[key] for key in result.tuples().all()]
+
+        event_counts: dict[int, dict[int, int]] = {}
+        if accepted:
+            await db.execute(
+                insert(Vote), [{"user_id": v.user_id, "report_id": v.report_id} for v in accepted]
+            )
+            for report_id, n in Counter(v.report_id for v in accepted).items():
+                await db.execute(
+                    update(Report)
+                    .where(Report.id == report_id)
+                    .values(vote_count=Report.vote_count + n)
+                )
+            for event_id, n in Counter(v.event_id for v in accepted).items():
+                await db.execute(
+                    update(ExamEvent)
+                    .where(ExamEvent.id == event_id)
+                    .values(total_votes=ExamEvent.total_votes + n)
+                )
+                vote_counts = await ConsensusService.event_vote_counts(db, event_id)
+                await ConsensusService.refresh_event_snapshot(db, event_id, vote_counts)
+                event_counts[event_id] = dict(vote_counts)
+        await db.commit()
+
+        # Settled before anything else can fail: a committed batch must not be retried.
+        accepted_votes = set(accepted)
+        for vote in votes:
+            if vote.done.done():
+                continue
+            if vote in accepted_votes:
+                vote.done.set_result(event_counts[vote.event_id])
+            else:
+                vote.done.set_exception(
+                    HTTPException(
+                        status_code=400, detail="Ya has participado en esta convocatoria."
+                    )
+                )
+        for event_id in event_counts:
+            await ReportService._invalidate_cached_pages(db, event_id)
+
+    @staticmethod
+    def apply_vote_counts(report: Report, vote_counts: dict[int, int]) -> None:
+        """Bring the event context loaded by ``fetch_report_with_context`` up to date with
+        the counters returned by ``cast_vote``, instead of expiring and re-fetching it.
+        """
+        event = report.event
+        for sibling in event.reports:
+            if sibling.id in vote_counts:
+                set_committed_value(sibling, "vote_count", vote_counts[sibling.id])
+        set_committed_value(event, "total_votes", sum(vote_counts.values()))
+
+    @staticmethod
+    async def recompute_vote_counters(db: AsyncSession) -> None:
+        """Rebuild Report.vote_count, ExamEvent.total_votes and the EventConsensus snapshots
+        from the Vote rows and commit.
+
+        Repair path for counters that drifted (e.g. votes inserted or deleted by hand);
+        see ``scripts/recount_votes.py``.
+        """
+        vote_count = (
+            select(func.count(Vote.id)).where(Vote.report_id == Report.id).scalar_subquery()
+        )
+        await db.execute(update(Report).values(vote_count=vote_count))
+        total_votes = (
+            select(func.coalesce(func.sum(Report.vote_count), 0))
+            .where(Report.event_id == ExamEvent.id)
+            .scalar_subquery()
+        )
+        await db.execute(update(ExamEvent).values(total_votes=total_votes))
+        await ConsensusService.refresh_all_snapshots(db)
         await db.commit()
 
     @staticmethod
     async def set_flagged(db: AsyncSession, report: Report) -> None:
-        """Mark a report as flagged and commit."""
+        """Mark a report as flagged and commit. The consensus snapshot is left alone: it
+        only depends on vote counts."""
         report.is_flagged = True  # type: ignore[assignment]
         await db.commit()
+        await ReportService._invalidate_cached_pages(db, int(report.event_id))
+
+    @staticmethod
+    async def _invalidate_cached_pages(db: AsyncSession, event_id: int) -> None:
+        """Drop cached anonymous pages showing this event (its exam page and its discipline
+        timeline). Runs after commit so a concurrent reader can't re-cache the old data."""
+        event = await db.get(ExamEvent, event_id)
+        assert event is not None  # callers just wrote a row referencing it
+        PageCacheService.invalidate(
+            PageCacheService.event_tag(event_id),
+            PageCacheService.discipline_tag(event.region_id, event.discipline_id),
+        )
@@ -0,0 +1,101 @@
+import re
+
+from sqlalchemy import Select, column, func, literal_column, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.constants import Search
+from app.models import Composer, Work
+
+_TOKEN = re.compile(r"\w+")
+
+# The FTS5 virtual tables (app/db/search_index.py) aren't mapped; these are just enough to
+# join on rowid and to name the table in MATCH / bm25().
+composers_fts = table("composers_fts", column("rowid"))
+works_fts = table("works_fts", column("rowid"))
+
+
+class SearchService:
+    """Local composer/work search. On SQLite it goes through the FTS5 index in
+    ``app/db/search_index.py`` (accent-insensitive, prefix matching, BM25 ranking); other
+    dialects fall back to an unranked substring match.
+    """
+
+    @staticmethod
+    def match_expression(q: str) -> str | None:
+        """Turn free text into an FTS5 query: every word must match as a prefix.
+
+        Words are quoted, so user input can never be parsed as FTS5 operators.
+        """
+        tokens = _TOKEN.findall(q)
+        if not tokens:
+            return None
+        return " ".join(f'"{token}"*' for token in tokens)
+
+    @staticmethod
+    def _uses_fts(db: AsyncSession) -> bool:
+        return db.get_bind().dialect.name == "sqlite"
+
+    @staticmethod
+    async def search_composers(
+        db: AsyncSession, q: str, limit: int = Search.COMPOSER_RESULTS_LIMIT
+    ) -> list[Composer]:
+        stmt: Select[tuple[Composer]]
+        if SearchService._uses_fts(db):
+            match = SearchService.match_expression(q)
+            if match is None:
+                return []
+            stmt = (
+                select(Composer)
+                .join(composers_fts, composers_fts.c.rowid == Composer.id)
+                .filter(literal_column("composers_fts").op("MATCH")(match))
+                .order_by(func.bm25(literal_column("composers_fts")))
+            )
+        else:
+            stmt = select(Composer).filter(Composer.name.ilike(f"%{q}%"))
+        result = await db.execute(stmt.limit(limit))
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def search_works(
+        db: AsyncSession,
+        q: str,
+        composer_id: int | None = None,
+        limit: int = Search.WORK_RESULTS_LIMIT,
+    ) -> list[Work]:
+        stmt: Select[tuple[Work]]
+        if SearchService._uses_fts(db):
+            match = SearchService.match_expression(q)
+            if match is None:
+                return []
+            stmt = (
+                select(Work)
+                .join(works_fts, works_fts.c.rowid == Work.id)
+                .filter(literal_column("works_fts").op("MATCH")(match))
+                .order_by(
+                    func.bm25(
+                        literal_column("works_fts"),
+                        Search.WORK_TITLE_WEIGHT,
+                        Search.WORK_NICKNAME_WEIGHT,
+                    )
+                )
+            )
+        else:
+            stmt = select(Work).filter(
+                (Work.title.ilike(f"%{q}%")) | (Work.nickname.ilike(f"%{q}%"))
+            )
+        if composer_id is not None:
+            stmt = stmt.filter(Work.composer_id == composer_id)
+        result = await db.execute(stmt.limit(limit))
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def rebuild_index(db: AsyncSession) -> None:
+        """Rebuild both FTS5 tables from their content tables and commit.
+
+        Triggers keep the index current; this is the repair path for rows written with
+        the triggers absent (e.g. a restored backup). See ``scripts/rebuild_search_index.py``.
+        """
+        await db.execute(text("INSERT INTO composers_fts(composers_fts) VALUES ('rebuild')"))
+        await db.execute(text("INSERT INTO works_fts(works_fts) VALUES ('rebuild')"))
+        await db.commit()
@@ -0,0 +1,178 @@
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+from cachetools import TTLCache
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import Select, case, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.constants import Cache, Sitemap
+from app.core.invalidation import invalidation_bus
+from app.models import Discipline, ExamEvent, Region, Report, Vote
+from app.services.page_cache_service import EVENT_PAGE_KEY_PREFIX
+
+XMLNS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+
+def _lastmod(at: datetime | None) -> str:
+    # <lastmod> is optional; leave it out rather than guess a date.
+    return f"<lastmod>{at.date().isoformat()}</lastmod>" if at is not None else ""
+
+
+@dataclass(frozen=True, slots=True)
+class SitemapEntry:
+    region_slug: str
+    discipline_slug: str
+    year: int
+    lastmod: datetime | None  # None: no report or vote has a timestamp
+
+
+class SitemapService:
+    """Sitemap of the exam pages that have data (at least one report), with ``lastmod``
+    from their latest report or vote. Past ``Sitemap.MAX_URLS_PER_FILE`` URLs,
+    /sitemap.xml becomes an index of numbered child files.
+
+    Files are streamed as they are rendered and kept per worker until a report or vote
+    changes an event.
+    """
+
+    _documents: TTLCache[str, bytes] = TTLCache(
+        maxsize=Cache.SITEMAP_MAX_ENTRIES, ttl=Cache.SITEMAP_TTL_SECONDS
+    )
+    # Bumped on invalidation, so a render that started before it isn't cached.
+    _generation = 0
+
+    @staticmethod
+    def _entries_query() -> Select[tuple[str, str, int, datetime | None]]:
+        last_report = (
+            select(Report.event_id, func.max(Report.created_at).label("at"))
+            .group_by(Report.event_id)
+            .subquery()
+        )
+        last_vote = (
+            select(Report.event_id, func.max(Vote.created_at).label("at"))
+            .join(Vote, Vote.report_id == Report.id)
+            .group_by(Report.event_id)
+            .subquery()
+        )
+        # created_at is nullable; a comparison with NULL would drop the other timestamp.
+        lastmod = case(
+            (last_report.c.at.is_(None), last_vote.c.at),
+            (last_vote.c.at > last_report.c.at, last_vote.c.at),
+            else_=last_report.c.at,
+        )
+        return (
+            select(Region.slug, Discipline.slug, ExamEvent.year, lastmod.label("lastmod"))
+            # Inner join: events created empty (contribute_page) are left out.
+            .join(last_report, last_report.c.event_id == ExamEvent.id)
+            .outerjoin(last_vote, last_vote.c.event_id == ExamEvent.id)
+            .join(Region, Region.id == ExamEvent.region_id)
+            .join(Discipline, Discipline.id == ExamEvent.discipline_id)
+            .order_by(ExamEvent.id)
+        )
+
+    @staticmethod
+    async def count(db: AsyncSession) -> int:
+        return await db.scalar(select(func.count(func.distinct(Report.event_id)))) or 0
+
+    @staticmethod
+    async def entries(db: AsyncSession, page: int | None = None) -> list[SitemapEntry]:
+        """Every entry, or those of child file ``page`` (1-based)."""
+        stmt = SitemapService._entries_query()
+        if page is not None:
+            stmt = stmt.offset((page - 1) * Sitemap.MAX_URLS_PER_FILE).limit(
+                Sitemap.MAX_URLS_PER_FILE
+            )
+        result = await db.execute(stmt)
+        return [SitemapEntry(*row) for row in result.tuples()]
+
+    @staticmethod
+    async def page_lastmods(db: AsyncSession) -> list[datetime | None]:
+        """Latest ``lastmod`` of each child file, in order, aggregated in the database so
+        the index never loads the entries themselves."""
+        numbered = (
+            SitemapService._entries_query()
+            .add_columns(func.row_number().over(order_by=ExamEvent.id).label("position"))
+            .order_by(None)
+            .subquery()
+        )
+        page = (numbered.c.position - 1) // Sitemap.MAX_URLS_PER_FILE
+        result = await db.scalars(
+            select(func.max(numbered.c.lastmod)).group_by(page).order_by(page)
+        )
+        return list(result)
+
+    @staticmethod
+    def render_urlset(base_url: str, entries: list[SitemapEntry]) -> Iterator[str]:
+        yield f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{XMLNS}">\n'
+        for start in range(0, len(entries), Sitemap.STREAM_CHUNK_URLS):
+            yield "".join(
+                f"<url><loc>{escape(base_url)}/exams/{escape(e.region_slug)}/"
+                f"{escape(e.discipline_slug)}/{e.year}</loc>"
+                f"{_lastmod(e.lastmod)}<changefreq>weekly</changefreq><priority>0.8</priority></url>\n"
+                for e in entries[start : start + Sitemap.STREAM_CHUNK_URLS]
+            )
+        yield "</urlset>\n"
+
+    @staticmethod
+    def render_index(base_url: str, lastmods: list[datetime | None]) -> Iterator[str]:
+        yield f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="{XMLNS}">\n'
+        for page, lastmod in enumerate(lastmods, start=1):
+            yield (
+                f"<sitemap><loc>{escape(base_url)}/sitemaps/events-{page}.xml</loc>"
+                f"{_lastmod(lastmod)}</sitemap>\n"
+            )
+        yield "</sitemapindex>\n"
+
+    @staticmethod
+    async def respond(db: AsyncSession, base_url: str, page: int | None = None) -> Response:
+        """/sitemap.xml (``page`` None) or child file ``page`` of the index."""
+        key = f"{base_url}/{page or ''}"
+        body = SitemapService._documents.get(key)
+        if body is not None:
+            return Response(content=body, media_type="application/xml")
+
+        generation = SitemapService._generation
+        chunks: Iterator[str]
+        if page is None and await SitemapService.count(db) > Sitemap.MAX_URLS_PER_FILE:
+            lastmods = await SitemapService.page_lastmods(db)
+            chunks = SitemapService.render_index(base_url, lastmods)
+        else:
+            entries = await SitemapService.entries(db, page)
+            if page is not None and not entries:
+                return Response(status_code=404)
+            chunks = SitemapService.render_urlset(base_url, entries)
+        return SitemapService._stream(key, chunks, generation)
+
+    @staticmethod
+    def _stream(key: str, chunks: Iterator[str], generation: int) -> StreamingResponse:
+        """Stream ``chunks`` to the client, caching the whole file once it has been sent
+        unless an invalidation arrived since ``generation``.
+        """
+
+        async def body() -> AsyncIterator[bytes]:
+            parts = []
+            for chunk in chunks:
+                data = chunk.encode()
+                parts.append(data)
+                yield data
+            if SitemapService._generation == generation:
+                SitemapService._documents[key] = b"".join(parts)
+
+        return StreamingResponse(body(), media_type="application/xml")
+
+    @staticmethod
+    def _clear(_key: str) -> None:
+        SitemapService._generation += 1
+        SitemapService._documents.clear()
+
+    @staticmethod
+    def reset_cache() -> None:
+        """Drop rendered files. Used by tests."""
+        SitemapService._clear("")
+
+
+invalidation_bus.subscribe(EVENT_PAGE_KEY_PREFIX, SitemapService._clear)
@@ -0,0 +1,80 @@
+from dataclasses import dataclass
+
+from sqlalchemy import case
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.constants import Consensus
+from app.models import Composer, EventConsensus, ExamEvent, Report, Work
+from app.services.work_service import WorkService
+
+
+@dataclass(frozen=True, slots=True)
+class TimelineYear:
+    year: int
+    report_count: int
+    total_votes: int
+    badge_status: str
+    has_verified: bool
+    top_work_title: str | None
+    top_composer_name: str | None
+    top_score_url: str | None
+
+
+class TimelineService:
+    """Per-year summaries for the discipline timeline in one query: the per-event aggregate
+    is already materialized in ``event_consensus``, so this only joins the top report's
+    work/composer and derives the badge with a portable ``CASE``.
+    """
+
+    @staticmethod
+    async def get_years(
+        db: AsyncSession, region_id: int, discipline_id: int
+    ) -> dict[int, TimelineYear]:
+        """Return every year with at least one report, keyed by year."""
+        badge_status = case(
+            (EventConsensus.total_votes < Consensus.MIN_VOTES_FOR_VERIFICATION, "neutral"),
+            (EventConsensus.has_verified, "verified"),
+            else_="disputed",
+        )
+        stmt = (
+            select(
+                ExamEvent.year,
+                EventConsensus.report_count,
+                EventConsensus.total_votes,
+                badge_status,
+                EventConsensus.has_verified,
+                Work.title,
+                Work.imslp_url,
+                Composer.name,
+            )
+            .join(EventConsensus, EventConsensus.event_id == ExamEvent.id)
+            .outerjoin(Report, Report.id == EventConsensus.top_report_id)
+            .outerjoin(Work, Work.id == Report.work_id)
+            .outerjoin(Composer, Composer.id == Work.composer_id)
+            .filter(
+                ExamEvent.region_id == region_id,
+                ExamEvent.discipline_id == discipline_id,
+                EventConsensus.report_count > 0,
+            )
+        )
+        result = await db.execute(stmt)
+
+        years: dict[int, TimelineYear] = {}
+        for row in result.tuples().all():
+            year, report_count, total_votes, badge, has_verified, title, imslp_url, composer = row
+            years[year] = TimelineYear(
+                year=year,
+                report_count=report_count,
+                total_votes=total_votes,
+                badge_status=badge,
+                has_verified=has_verified,
+                top_work_title=title,
+                top_composer_name=composer,
+                top_score_url=(
+                    WorkService.build_score_url(title, composer, imslp_url)
+                    if title is not None
+                    else None
+                ),
+            )
+        return years
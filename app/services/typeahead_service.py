@@ -0,0 +1,387 @@
+import asyncio
+import bisect
+import heapq
+import itertools
+import logging
+import time
+import unicodedata
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.future import select
+
+from app.core.constants import Search
+from app.core.invalidation import invalidation_bus
+from app.models import Composer, Work
+
+logger = logging.getLogger("uvicorn")
+
+TYPEAHEAD_KEY = "typeahead"
+
+# Plain column selects: loading 500k Work ORM instances would dwarf the index itself.
+_COMPOSER_COLUMNS = select(
+    Composer.id, Composer.name, Composer.wikidata_id, Composer.openopus_id, Composer.is_verified
+)
+_WORK_COLUMNS = select(
+    Work.id, Work.title, Work.nickname, Work.openopus_id, Work.composer_id, Work.is_verified
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ComposerSuggestion:
+    id: int
+    name: str
+    wikidata_id: str | None
+    openopus_id: str | None
+    is_verified: bool
+    normalized: str
+
+
+@dataclass(frozen=True, slots=True)
+class WorkSuggestion:
+    id: int
+    title: str
+    nickname: str | None
+    openopus_id: str | None
+    composer_id: int
+    is_verified: bool
+    normalized: str
+
+
+def normalize(value: str) -> str:
+    """Casefolded, accent-free, punctuation-free words: "Dvořák, A." -> "dvorak a"."""
+    decomposed = unicodedata.normalize("NFKD", value)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+    return " ".join("".join(ch if ch.isalnum() else " " for ch in stripped).split())
+
+
+def _matches_all(normalized: str, tokens: list[str]) -> bool:
+    """Every token is a prefix of some word of ``normalized``."""
+    padded = f" {normalized}"
+    return all(f" {token}" in padded for token in tokens)
+
+
+def _composer_suggestion(row: Row[Any]) -> ComposerSuggestion:
+    return ComposerSuggestion(
+        id=row.id,
+        name=row.name,
+        wikidata_id=row.wikidata_id,
+        openopus_id=row.openopus_id,
+        is_verified=bool(row.is_verified),
+        normalized=normalize(row.name),
+    )
+
+
+def _composer_keys(composer: ComposerSuggestion) -> list[tuple[str, int]]:
+    """(key, id) pairs for the sorted array: one key per word start."""
+    words = composer.normalized.split()
+    return [(" ".join(words[i:]), composer.id) for i in range(len(words))]
+
+
+def _work_suggestion(row: Row[Any]) -> WorkSuggestion:
+    return WorkSuggestion(
+        id=row.id,
+        title=row.title,
+        nickname=row.nickname,
+        openopus_id=row.openopus_id,
+        composer_id=row.composer_id,
+        is_verified=bool(row.is_verified),
+        normalized=normalize(f"{row.title} {row.nickname or ''}"),
+    )
+
+
+def _composer_rank(composer: ComposerSuggestion, lead: str) -> tuple[bool, bool, int, str]:
+    """Sort key: first-word match, then verified, then shorter names."""
+    return (
+        not composer.normalized.startswith(lead),
+        not composer.is_verified,
+        len(composer.normalized),
+        composer.normalized,
+    )
+
+
+class TypeaheadService:
+    """In-process suggestions for the contribution wizard's composer and work steps.
+
+    Composers live in a sorted array of word-start keys ("johann sebastian bach",
+    "sebastian bach", "bach"), so a prefix is a bisect plus a short scan. Short prefixes,
+    whose ranges are too wide to scan, get their ranked top-k precomputed. Works are only
+    searched within the chosen composer, so they are grouped per composer and scanned.
+    Built by a background task started with the app, and rebuilt every
+    ``Search.TYPEAHEAD_RELOAD_SECONDS`` so renames, relinks and deletions made elsewhere
+    (e.g. the OpenOpus importer) show up; each rebuild is swapped in whole. In between,
+    new rows are pulled in incrementally (``id > last seen``) when a report submission
+    publishes ``TYPEAHEAD_KEY`` on the invalidation bus, or every
+    ``Search.TYPEAHEAD_REFRESH_SECONDS``. Until loaded, callers fall back to SearchService.
+    """
+
+    _loaded = False
+    _stale = False
+    _refreshed_at = 0.0
+    _last_composer_id = 0
+    _last_work_id = 0
+    _composers: dict[int, ComposerSuggestion] = {}
+    _composer_keys: list[str] = []
+    _composer_key_ids: list[int] = []
+    _top_by_prefix: dict[str, list[int]] = {}
+    _works_by_composer: dict[int, list[WorkSuggestion]] = {}
+    _work_count = 0
+    _loader: asyncio.Task[None] | None = None
+
+    @staticmethod
+    async def load(db: AsyncSession) -> None:
+        """Build the index from the database and swap it in, unless it would exceed the
+        memory cap. Yields to the event loop while building, so the worker keeps serving
+        requests meanwhile (from the previous index, or the fallback before the first)."""
+        composer_rows = (await db.execute(_COMPOSER_COLUMNS)).all()
+        work_rows = (await db.execute(_WORK_COLUMNS)).all()
+        entries = len(composer_rows) + len(work_rows)
+        if entries > Search.TYPEAHEAD_MAX_ENTRIES:
+            logger.warning(
+                "Typeahead index skipped: %d entries exceed the cap of %d",
+                entries,
+                Search.TYPEAHEAD_MAX_ENTRIES,
+            )
+            TypeaheadService.reset_cache()
+            return
+
+        composers: dict[int, ComposerSuggestion] = {}
+        pairs: list[tuple[str, int]] = []
+        for i, row in enumerate(composer_rows):
+            composer = composers[row.id] = _composer_suggestion(row)
+            pairs.extend(_composer_keys(composer))
+            if i % Search.TYPEAHEAD_BUILD_CHUNK == 0:
+                await asyncio.sleep(0)
+        pairs.sort()
+        top_by_prefix = await TypeaheadService._rank_short_prefixes(composers, pairs)
+        works_by_composer: dict[int, list[WorkSuggestion]] = {}
+        for i, work_row in enumerate(work_rows):
+            works_by_composer.setdefault(work_row.composer_id, []).append(
+                _work_suggestion(work_row)
+            )
+            if i % Search.TYPEAHEAD_BUILD_CHUNK == 0:
+                await asyncio.sleep(0)
+
+        # Rows created after the queries above come in through the next catch-up.
+        TypeaheadService._composers = composers
+        TypeaheadService._composer_keys = [key for key, _ in pairs]
+        TypeaheadService._composer_key_ids = [composer_id for _, composer_id in pairs]
+        TypeaheadService._top_by_prefix = top_by_prefix
+        TypeaheadService._works_by_composer = works_by_composer
+        TypeaheadService._work_count = len(work_rows)
+        TypeaheadService._last_composer_id = max(composers, default=0)
+        TypeaheadService._last_work_id = max((w.id for w in work_rows), default=0)
+        TypeaheadService._loaded = True
+        TypeaheadService._refreshed_at = time.monotonic()
+
+    @staticmethod
+    def start(session_factory: async_sessionmaker[AsyncSession]) -> None:
+        """Start this worker's loader (app startup): build now, rebuild periodically."""
+        TypeaheadService._loader = asyncio.create_task(TypeaheadService._run(session_factory))
+
+    @staticmethod
+    async def stop() -> None:
+        task, TypeaheadService._loader = TypeaheadService._loader, None
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+    @staticmethod
+    async def _run(session_factory: async_sessionmaker[AsyncSession]) -> None:
+        while True:
+            try:
+                async with session_factory() as session:
+                    await TypeaheadService.load(session)
+            except Exception:
+                # Search still works without it (SearchService fallback).
+                logger.exception("Typeahead index failed to load")
+            await asyncio.sleep(Search.TYPEAHEAD_RELOAD_SECONDS)
+
+    @staticmethod
+    def _add_composer(composer: ComposerSuggestion) -> None:
+        """Insert a new composer into the live index."""
+        TypeaheadService._composers[composer.id] = composer
+        TypeaheadService._last_composer_id = max(TypeaheadService._last_composer_id, composer.id)
+        for key, composer_id in _composer_keys(composer):
+            position = bisect.bisect_right(TypeaheadService._composer_keys, key)
+            TypeaheadService._composer_keys.insert(position, key)
+            TypeaheadService._composer_key_ids.insert(position, composer_id)
+            TypeaheadService._rank_into_short_prefixes(key, composer_id)
+
+    @staticmethod
+    async def _rank_short_prefixes(
+        composers: dict[int, ComposerSuggestion], pairs: list[tuple[str, int]]
+    ) -> dict[str, list[int]]:
+        """Top-k composer ids for every key prefix up to the precomputed length."""
+        top: dict[str, list[int]] = {}
+        for length in range(1, Search.TYPEAHEAD_PRECOMPUTED_PREFIX_LENGTH + 1):
+            long_enough = (pair for pair in pairs if len(pair[0]) >= length)
+            for prefix, group in itertools.groupby(long_enough, key=lambda pair: pair[0][:length]):
+                ids = {composer_id for _, composer_id in group}
+                top[prefix] = heapq.nsmallest(
+                    Search.TYPEAHEAD_PREFIX_TOP_K,
+                    ids,
+                    key=lambda composer_id: _composer_rank(composers[composer_id], prefix),
+                )
+            await asyncio.sleep(0)
+        return top
+
+    @staticmethod
+    def _rank_into_short_prefixes(key: str, composer_id: int) -> None:
+        composers = TypeaheadService._composers
+        for length in range(1, min(len(key), Search.TYPEAHEAD_PRECOMPUTED_PREFIX_LENGTH) + 1):
+            prefix = key[:length]
+            ids = TypeaheadService._top_by_prefix.setdefault(prefix, [])
+            if composer_id in ids:
+                continue
+            ids.append(composer_id)
+            ids.sort(key=lambda i: _composer_rank(composers[i], prefix))
+            del ids[Search.TYPEAHEAD_PREFIX_TOP_K :]
+
+    @staticmethod
+    def _add_work(work: WorkSuggestion) -> None:
+        """Insert a new work into the live index."""
+        TypeaheadService._works_by_composer.setdefault(work.composer_id, []).append(work)
+        TypeaheadService._last_work_id = max(TypeaheadService._last_work_id, work.id)
+        TypeaheadService._work_count += 1
+
+    @staticmethod
+    async def _catch_up(db: AsyncSession) -> None:
+        """Pull in composers/works created since the last load or catch-up."""
+        TypeaheadService._stale = False
+        TypeaheadService._refreshed_at = time.monotonic()
+        composers = (
+            await db.execute(
+                _COMPOSER_COLUMNS.filter(Composer.id > TypeaheadService._last_composer_id)
+            )
+        ).all()
+        works = (
+            await db.execute(_WORK_COLUMNS.filter(Work.id > TypeaheadService._last_work_id))
+        ).all()
+        if not TypeaheadService._loaded:
+            return  # reset while querying
+        # A rebuild may have been swapped in while querying: skip what it already holds.
+        composers = [c for c in composers if c.id > TypeaheadService._last_composer_id]
+        works = [w for w in works if w.id > TypeaheadService._last_work_id]
+        total = len(TypeaheadService._composers) + TypeaheadService._work_count
+        if total + len(composers) + len(works) > Search.TYPEAHEAD_MAX_ENTRIES:
+            logger.warning("Typeahead index disabled: catalogue outgrew the entry cap")
+            TypeaheadService.reset_cache()
+            return
+
+        for composer in composers:
+            TypeaheadService._add_composer(_composer_suggestion(composer))
+        for work in works:
+            TypeaheadService._add_work(_work_suggestion(work))
+
+    @staticmethod
+    async def _ensure_fresh(db: AsyncSession) -> bool:
+        if not TypeaheadService._loaded:
+            return False
+        age = time.monotonic() - TypeaheadService._refreshed_at
+        if TypeaheadService._stale or age > Search.TYPEAHEAD_REFRESH_SECONDS:
+            await TypeaheadService._catch_up(db)
+        return TypeaheadService._loaded
+
+    @staticmethod
+    def match_composers(q: str, limit: int) -> list[ComposerSuggestion]:
+        """Top ``limit`` composers whose words start with every word of ``q``.
+
+        Ranked: match on the first word of the name, then verified, then shorter names.
+        """
+        tokens = normalize(q).split()
+        if not tokens:
+            return []
+        composers = TypeaheadService._composers
+        if (
+            len(tokens) == 1
+            and len(tokens[0]) <= Search.TYPEAHEAD_PRECOMPUTED_PREFIX_LENGTH
+            and limit <= Search.TYPEAHEAD_PREFIX_TOP_K
+        ):
+            top = TypeaheadService._top_by_prefix.get(tokens[0], [])
+            return [composers[composer_id] for composer_id in top[:limit]]
+
+        lead = max(tokens, key=len)
+        keys = TypeaheadService._composer_keys
+        ids = TypeaheadService._composer_key_ids
+        seen: set[int] = set()
+        candidates: list[ComposerSuggestion] = []
+        position = bisect.bisect_left(keys, lead)
+        end = min(len(keys), position + Search.TYPEAHEAD_MAX_CANDIDATES)
+        while position < end and keys[position].startswith(lead):
+            composer_id = ids[position]
+            position += 1
+            if composer_id in seen:
+                continue
+            seen.add(composer_id)
+            suggestion = composers[composer_id]
+            if _matches_all(suggestion.normalized, tokens):
+                candidates.append(suggestion)
+        return heapq.nsmallest(limit, candidates, key=lambda c: _composer_rank(c, tokens[0]))
+
+    @staticmethod
+    def match_works(q: str, composer_id: int, limit: int) -> list[WorkSuggestion]:
+        """Top ``limit`` works of one composer whose title/nickname words start with every
+        word of ``q``. Ranked: match at the start of the title, then verified, then shorter."""
+        tokens = normalize(q).split()
+        if not tokens:
+            return []
+        works = TypeaheadService._works_by_composer.get(composer_id, [])
+        candidates = [w for w in works if _matches_all(w.normalized, tokens)]
+        candidates.sort(
+            key=lambda w: (
+                not w.normalized.startswith(tokens[0]),
+                not w.is_verified,
+                len(w.normalized),
+                w.normalized,
+            )
+        )
+        return candidates[:limit]
+
+    @staticmethod
+    async def suggest_composers(
+        db: AsyncSession, q: str, limit: int = Search.COMPOSER_RESULTS_LIMIT
+    ) -> list[ComposerSuggestion] | None:
+        """Suggestions from the in-process index, or None if it isn't loaded."""
+        if not await TypeaheadService._ensure_fresh(db):
+            return None
+        return TypeaheadService.match_composers(q, limit)
+
+    @staticmethod
+    async def suggest_works(
+        db: AsyncSession, q: str, composer_id: int, limit: int = Search.WORK_RESULTS_LIMIT
+    ) -> list[WorkSuggestion] | None:
+        """Suggestions from the in-process index, or None if it isn't loaded."""
+        if not await TypeaheadService._ensure_fresh(db):
+            return None
+        return TypeaheadService.match_works(q, composer_id, limit)
+
+    @staticmethod
+    def invalidate() -> None:
+        """Have every worker catch up with new composers/works on its next suggestion."""
+        invalidation_bus.publish(TYPEAHEAD_KEY)
+
+    @staticmethod
+    def _mark_stale(_key: str) -> None:
+        TypeaheadService._stale = True
+
+    @staticmethod
+    def reset_cache() -> None:
+        """Drop the index; suggestions return None until ``load`` runs again."""
+        TypeaheadService._loaded = False
+        TypeaheadService._stale = False
+        TypeaheadService._last_composer_id = 0
+        TypeaheadService._last_work_id = 0
+        TypeaheadService._composers = {}
+        TypeaheadService._composer_keys = []
+        TypeaheadService._composer_key_ids = []
+        TypeaheadService._top_by_prefix = {}
+        TypeaheadService._works_by_composer = {}
+        TypeaheadService._work_count = 0
+
+
+invalidation_bus.subscribe(TYPEAHEAD_KEY, TypeaheadService._mark_stale)
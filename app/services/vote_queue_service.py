@@ -0,0 +1,152 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from fastapi import HTTPException
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.constants import VoteQueue
+
+logger = logging.getLogger("uvicorn")
+
+
+# A validated vote waiting for its batch. ``done`` resolves to the event's
+# {report id: vote_count} once the batch has committed, or fails with the vote's error.
+@dataclass(eq=False, slots=True)
+class QueuedVote:
+    user_id: int
+    report_id: int
+    event_id: int
+    done: asyncio.Future[dict[int, int]]
+
+
+WriteBatch = Callable[[AsyncSession, list[QueuedVote]], Awaitable[None]]
+
+
+class VoteQueueService:
+    """Write-behind vote ingestion, enabled by ``settings.VOTE_WRITE_BEHIND``.
+
+    Requests put their vote on this worker's queue and wait for it; a single writer task
+    commits the votes in batches (see ``VoteQueue``), so under SQLite a burst of votes
+    costs one write lock and one commit per batch instead of one per vote. The caller is
+    only answered after the commit, so an acknowledged vote is durable.
+    """
+
+    _queue: asyncio.Queue[QueuedVote | None] | None = None
+    _writer: asyncio.Task[None] | None = None
+
+    @staticmethod
+    def is_running() -> bool:
+        return VoteQueueService._writer is not None
+
+    @staticmethod
+    async def submit(user_id: int, report_id: int, event_id: int) -> dict[int, int] | None:
+        """Queue a vote and wait until its batch has been written. Returns None without
+        queueing if the writer has stopped (shutdown), so the caller writes it directly."""
+        queue = VoteQueueService._queue
+        if queue is None:
+            return None
+        done: asyncio.Future[dict[int, int]] = asyncio.get_running_loop().create_future()
+        await queue.put(QueuedVote(user_id, report_id, event_id, done))
+        # Shielded: a client that disconnects doesn't pull its vote out of the batch.
+        return await asyncio.shield(done)
+
+    @staticmethod
+    def start(session_factory: async_sessionmaker[AsyncSession], write_batch: WriteBatch) -> None:
+        """Start this worker's writer (app startup). ``write_batch`` writes one batch in
+        the given session, commits and settles every vote's future."""
+        VoteQueueService._queue = asyncio.Queue(maxsize=VoteQueue.MAX_PENDING_VOTES)
+        VoteQueueService._writer = asyncio.create_task(
+            VoteQueueService._run(VoteQueueService._queue, session_factory, write_batch)
+        )
+
+    @staticmethod
+    async def stop() -> None:
+        """Write the votes already queued, then stop the writer."""
+        queue, writer = VoteQueueService._queue, VoteQueueService._writer
+        VoteQueueService._queue = VoteQueueService._writer = None
+        if queue is not None and writer is not None:
+            await queue.put(None)
+            await writer
+
+    @staticmethod
+    async def _run(
+        queue: asyncio.Queue[QueuedVote | None],
+        session_factory: async_sessionmaker[AsyncSession],
+        write_batch: WriteBatch,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await queue.get()
+            if first is None:
+                break
+            batch = [first]
+            deadline = loop.time() + VoteQueue.FLUSH_INTERVAL_SECONDS
+            while len(batch) < VoteQueue.MAX_BATCH_VOTES:
+                try:
+                    vote = await asyncio.wait_for(queue.get(), deadline - loop.time())
+                except TimeoutError:
+                    break
+                if vote is None:
+                    stopping = True
+                    break
+                batch.append(vote)
+            await VoteQueueService._write(session_factory, write_batch, batch)
+        # A submit that was waiting for room on a full queue can land behind the sentinel.
+        leftovers = await VoteQueueService._drain(queue)
+        for start in range(0, len(leftovers), VoteQueue.MAX_BATCH_VOTES):
+            batch = leftovers[start : start + VoteQueue.MAX_BATCH_VOTES]
+            await VoteQueueService._write(session_factory, write_batch, batch)
+
+    @staticmethod
+    async def _drain(queue: asyncio.Queue[QueuedVote | None]) -> list[QueuedVote]:
+        """Empty ``queue``, letting in the submits still waiting for room: each get wakes
+        one, which puts its vote on its next step."""
+        votes = []
+        while True:
+            while not queue.empty():
+                vote = queue.get_nowait()
+                if vote is not None:
+                    votes.append(vote)
+            await asyncio.sleep(0)
+            if queue.empty():
+                return votes
+
+    @staticmethod
+    async def _write(
+        session_factory: async_sessionmaker[AsyncSession],
+        write_batch: WriteBatch,
+        batch: list[QueuedVote],
+    ) -> None:
+        for attempt in range(1, VoteQueue.MAX_WRITE_ATTEMPTS + 1):
+            # A failure after the commit leaves the votes settled: never write them twice.
+            pending = [vote for vote in batch if not vote.done.done()]
+            if not pending:
+                return
+            try:
+                async with session_factory() as session:
+                    await write_batch(session, pending)
+                return
+            except OperationalError:
+                if attempt == VoteQueue.MAX_WRITE_ATTEMPTS:
+                    logger.exception("Vote batch of %d failed; giving up", len(pending))
+                    break
+                logger.warning(
+                    "Vote batch of %d failed (attempt %d); retrying", len(pending), attempt
+                )
+                await asyncio.sleep(VoteQueue.RETRY_BACKOFF_SECONDS * attempt)
+            except Exception:
+                logger.exception("Vote batch of %d failed", len(pending))
+                break
+        for vote in batch:
+            if not vote.done.done():
+                vote.done.set_exception(
+                    HTTPException(
+                        status_code=503,
+                        detail="No se pudo registrar el voto. Inténtalo de nuevo.",
+                        headers={"Retry-After": "1"},
+                    )
+                )
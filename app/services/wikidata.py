@@ -1,12 +1,208 @@
+import json
+import logging
+import re
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+
 import httpx
+from cachetools import LRUCache
+from sqlalchemy import and_, delete, or_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.future import select
+
+from app.core.constants import Cache
+from app.core.http import WIKIDATA, http_clients
+from app.db.session import AsyncSessionLocal
+from app.models import WikidataCacheEntry
+
+logger = logging.getLogger("uvicorn")
 
 WIKIDATA_API_URL = "https://www.wikidata.org/w/api.php"
+# wbgetentities accepts at most 50 ids per request.
+WIKIDATA_BATCH_SIZE = 50
+
+_ENTITY_ID = re.compile(r"Q[1-9]\d*")
+
+# Properties kept from an entity's claims; everything else is dropped on parse.
+DATE_OF_BIRTH = "P569"
+DATE_OF_DEATH = "P570"
+OCCUPATION = "P106"
+
+
+@dataclass(frozen=True, slots=True)
+class WikidataEntity:
+    wikidata_id: str
+    name: str | None
+    birth_year: int | None
+    death_year: int | None
+    occupation_ids: tuple[str, ...]  # e.g. ("Q36834",) for composer
+
+
+def _statement_values(claims: dict[str, Any], prop: str) -> list[Any]:
+    """Datavalues of a property's statements, preferred rank first, deprecated skipped."""
+    statements = sorted(
+        (s for s in claims.get(prop, []) if s.get("rank") != "deprecated"),
+        key=lambda s: s.get("rank") != "preferred",
+    )
+    values = []
+    for statement in statements:
+        datavalue = statement.get("mainsnak", {}).get("datavalue")
+        if datavalue is not None:
+            values.append(datavalue.get("value"))
+    return values
+
+
+def _year(claims: dict[str, Any], prop: str) -> int | None:
+    # Wikidata times look like "+1770-12-17T00:00:00Z" (or "-0384-..." BCE).
+    for value in _statement_values(claims, prop):
+        match = re.match(r"([+-]\d+)-", value.get("time", "")) if isinstance(value, dict) else None
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def parse_entity(wikidata_id: str, entity: dict[str, Any]) -> WikidataEntity:
+    """Project a wbgetentities entity onto the few fields the app uses."""
+    claims = entity.get("claims", {})
+    return WikidataEntity(
+        wikidata_id=wikidata_id,
+        name=entity.get("labels", {}).get("en", {}).get("value"),
+        birth_year=_year(claims, DATE_OF_BIRTH),
+        death_year=_year(claims, DATE_OF_DEATH),
+        occupation_ids=tuple(
+            value["id"]
+            for value in _statement_values(claims, OCCUPATION)
+            if isinstance(value, dict) and "id" in value
+        ),
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class CachedLookup:
+    payload: Any  # None: Wikidata had nothing for this key
+    fetched_at: float
+
+
+class WikidataCache:
+    """Two-tier cache for Wikidata lookups: a per-worker LRU in front of the shared
+    ``wikidata_cache`` table, so a composer looked up once is not fetched again by any
+    worker, or after a restart. Misses are cached too, for a shorter TTL.
+
+    Only entity lookups reach the table. Search results are keyed by whatever the user
+    has typed so far, so persisting them would write a row per keystroke, taking the
+    SQLite write lock on the read path; they stay in the per-worker LRU.
+    """
+
+    _memory: LRUCache[str, CachedLookup] = LRUCache(maxsize=Cache.WIKIDATA_MEMORY_MAX_ENTRIES)
+    # Write engine: the search endpoints only hold read-only sessions.
+    session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal
+    _next_prune: float = 0.0
+
+    @staticmethod
+    def _is_persisted(key: str) -> bool:
+        return key.startswith("entity:")
+
+    @staticmethod
+    def _is_fresh(key: str, lookup: CachedLookup) -> bool:
+        if lookup.payload is None:
+            ttl = Cache.WIKIDATA_NEGATIVE_TTL_SECONDS
+        elif key.startswith("entity:"):
+            ttl = Cache.WIKIDATA_ENTITY_TTL_SECONDS
+        else:
+            ttl = Cache.WIKIDATA_SEARCH_TTL_SECONDS
+        return time.time() - lookup.fetched_at < ttl
+
+    @staticmethod
+    async def get_many(keys: list[str]) -> dict[str, CachedLookup]:
+        """Fresh entries for ``keys``: memory first, then one query for the rest."""
+        found: dict[str, CachedLookup] = {}
+        missing = []
+        for key in keys:
+            lookup = WikidataCache._memory.get(key)
+            if lookup is not None and WikidataCache._is_fresh(key, lookup):
+                found[key] = lookup
+            elif WikidataCache._is_persisted(key):
+                missing.append(key)
+        if not missing:
+            return found
+
+        try:
+            async with WikidataCache.session_factory() as session:
+                result = await session.execute(
+                    select(WikidataCacheEntry).filter(WikidataCacheEntry.key.in_(missing))
+                )
+                rows = result.scalars().all()
+        except SQLAlchemyError:
+            logger.warning("Wikidata cache table unavailable; using memory only", exc_info=True)
+            return found
+
+        for row in rows:
+            payload = json.loads(row.payload) if row.payload is not None else None
+            lookup = CachedLookup(payload=payload, fetched_at=row.fetched_at)
+            if WikidataCache._is_fresh(row.key, lookup):
+                WikidataCache._memory[row.key] = lookup
+                found[row.key] = lookup
+        return found
+
+    @staticmethod
+    async def put_many(payloads: dict[str, Any]) -> None:
+        """Store payloads (None for a miss) in memory, and entity lookups in the table."""
+        now = time.time()
+        for key, payload in payloads.items():
+            WikidataCache._memory[key] = CachedLookup(payload=payload, fetched_at=now)
+        persisted = {k: v for k, v in payloads.items() if WikidataCache._is_persisted(k)}
+        if not persisted:
+            return
+        try:
+            async with WikidataCache.session_factory() as session:
+                for key, payload in persisted.items():
+                    await session.merge(
+                        WikidataCacheEntry(
+                            key=key,
+                            payload=json.dumps(payload) if payload is not None else None,
+                            fetched_at=now,
+                        )
+                    )
+                if now >= WikidataCache._next_prune:
+                    WikidataCache._next_prune = now + Cache.WIKIDATA_PRUNE_INTERVAL_SECONDS
+                    await WikidataCache._prune(session, now)
+                await session.commit()
+        except SQLAlchemyError:
+            logger.warning("Could not persist Wikidata cache entries", exc_info=True)
+
+    @staticmethod
+    async def _prune(session: AsyncSession, now: float) -> None:
+        """Delete rows past their TTL; nothing else would ever remove them."""
+        await session.execute(
+            delete(WikidataCacheEntry).where(
+                or_(
+                    WikidataCacheEntry.fetched_at < now - Cache.WIKIDATA_ENTITY_TTL_SECONDS,
+                    and_(
+                        WikidataCacheEntry.payload.is_(None),
+                        WikidataCacheEntry.fetched_at < now - Cache.WIKIDATA_NEGATIVE_TTL_SECONDS,
+                    ),
+                )
+            )
+        )
+
+    @staticmethod
+    def reset_cache() -> None:
+        """Clear the in-process tier. Used by tests."""
+        WikidataCache._memory.clear()
+        WikidataCache._next_prune = 0.0
 
 
 async def search_composer(query: str) -> list[dict]:
     """
     Search for a composer on Wikidata.
     """
+    cache_key = "search:" + " ".join(query.casefold().split())
+    cached = (await WikidataCache.get_many([cache_key])).get(cache_key)
+    if cached is not None:
+        return cached.payload or []
+
     params = {
         "action": "wbsearchentities",
         "search": query,
@@ -19,12 +215,12 @@ async def search_composer(query: str) -> list[dict]:
         "limit": "10",
     }
 
-    headers = {"User-Agent": "ExamRecordbot/1.0 (exam-record-project; contact@example.com)"}
-
-    async with httpx.AsyncClient(headers=headers) as client:
+    async def fetch(client: httpx.AsyncClient) -> Any:
         response = await client.get(WIKIDATA_API_URL, params=params)
         response.raise_for_status()
-        data = response.json()
+        return response.json()
+
+    data = await http_clients.call(WIKIDATA, cache_key, fetch)
 
     results = []
     for item in data.get("search", []):
@@ -40,30 +236,73 @@ async def search_composer(query: str) -> list[dict]:
                     "description": item.get("description"),
                 }
             )
+
+    await WikidataCache.put_many({cache_key: results or None})
     return results
 
 
-async def get_composer_by_id(wikidata_id: str) -> dict:
+async def get_composer_by_id(wikidata_id: str) -> WikidataEntity:
     """
     Fetch details for a specific Wikidata ID.
-    Using the entity data endpoint.
+    Raises LookupError if Wikidata has no such entity.
     """
-    url = f"https://www.wikidata.org/wiki/Special:EntityData/{wikidata_id}.json"
+    composer = (await get_composers_by_ids([wikidata_id])).get(wikidata_id)
+    if composer is None:
+        raise LookupError(f"Wikidata entity {wikidata_id} not found")
+    return composer
 
-    headers = {"User-Agent": "ExamRecordbot/1.0 (exam-record-project; contact@example.com)"}
 
-    async with httpx.AsyncClient(headers=headers, follow_redirects=True) as client:
-        response = await client.get(url)
-        response.raise_for_status()
-        data = response.json()
+async def get_composers_by_ids(wikidata_ids: list[str]) -> dict[str, WikidataEntity]:
+    """
+    Fetch details for many Wikidata IDs, keyed by ID; unknown IDs are left out.
+    Cached IDs are served from the cache, the rest via wbgetentities in batches of 50.
+    """
+    ids = list(dict.fromkeys(i for i in wikidata_ids if _ENTITY_ID.fullmatch(i)))
+    cached = await WikidataCache.get_many([f"entity:{i}" for i in ids])
+    composers = {
+        i: _entity_from_payload(lookup.payload)
+        for i in ids
+        if (lookup := cached.get(f"entity:{i}")) is not None and lookup.payload is not None
+    }
+
+    to_fetch = [i for i in ids if f"entity:{i}" not in cached]
+    for start in range(0, len(to_fetch), WIKIDATA_BATCH_SIZE):
+        batch = to_fetch[start : start + WIKIDATA_BATCH_SIZE]
+        fetched = await _fetch_entities(batch)
+        await WikidataCache.put_many(
+            {f"entity:{i}": asdict(fetched[i]) if i in fetched else None for i in batch}
+        )
+        composers.update(fetched)
+    return composers
+
 
-    entities = data.get("entities", {})
-    entity = entities.get(wikidata_id, {})
+def _entity_from_payload(payload: dict[str, Any]) -> WikidataEntity:
+    return WikidataEntity(**{**payload, "occupation_ids": tuple(payload["occupation_ids"])})
 
-    # Extract labels, claims etc.
-    # This can get complex. For MVP, let's just return the raw entity or a slightly cleaned up version.
-    return {
-        "wikidata_id": wikidata_id,
-        "name": entity.get("labels", {}).get("en", {}).get("value"),
-        "claims": entity.get("claims", {}),  # Contains structured data like dates
+
+async def _fetch_entities(wikidata_ids: list[str]) -> dict[str, WikidataEntity]:
+    params = {
+        "action": "wbgetentities",
+        "ids": "|".join(wikidata_ids),
+        "props": "labels|claims",
+        "languages": "en",
+        "format": "json",
     }
+
+    async def fetch(client: httpx.AsyncClient) -> Any:
+        response = await client.get(WIKIDATA_API_URL, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    data = await http_clients.call(WIKIDATA, ("entities", *wikidata_ids), fetch)
+    if "error" in data:
+        raise RuntimeError(f"Wikidata error: {data['error'].get('info', data['error'])}")
+
+    composers: dict[str, WikidataEntity] = {}
+    for entity_id, entity in data.get("entities", {}).items():
+        if "missing" in entity:
+            continue
+        # A redirected (merged) item comes back under its target id.
+        requested_id = entity.get("redirects", {}).get("from", entity_id)
+        composers[requested_id] = parse_entity(requested_id, entity)
+    return composers
@@ -15,5 +15,13 @@ class WorkService:
             return work.imslp_url  # type: ignore[return-value]
 
         composer_name = work.composer.name if work.composer else ""
-        query_str = f"\\ site:imslp.org {composer_name} {work.title}"
+        return WorkService.build_score_url(work.title, composer_name, None)
+
+    @staticmethod
+    def build_score_url(title: str, composer_name: str | None, imslp_url: str | None) -> str:
+        """Column-level variant of get_score_url for queries that don't load ORM rows."""
+        if imslp_url:
+            return imslp_url
+
+        query_str = f"\\ site:imslp.org {composer_name or ''} {title}"
         return f"https://duckduckgo.com/?q={urllib.parse.quote(query_str)}"
@@ -0,0 +1,149 @@
+"""Benchmark the discipline timeline page: query count and latency.
+
+Seeds a throwaway SQLite database with one region/discipline holding 25 years x 50 reports
+x 200 votes per report (250k vote rows), then times ``ExamService.get_discipline_context``
+against the previous eager-loading approach (every report, work, composer and vote of the
+batch) for comparison.
+
+    DATABASE_URL=sqlite+aiosqlite:///./unused.db SECRET_KEY=bench \
+        python scripts/bench_discipline_timeline.py
+"""
+
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.future import select
+from sqlalchemy.orm import joinedload
+
+from app.db.base import Base
+from app.models import Composer, Discipline, ExamEvent, Region, Report, User, Vote, Work
+from app.services.exam_service import ExamService
+from app.services.report_service import ReportService
+
+YEARS = 25
+REPORTS_PER_YEAR = 50
+VOTES_PER_REPORT = 200
+ITERATIONS = 10
+
+
+async def seed(session: AsyncSession) -> None:
+    session.add_all(
+        [Region(id=1, name="Bench", slug="bench"), Discipline(id=1, name="Piano", slug="piano")]
+    )
+    session.add_all([Composer(id=i, name=f"Composer {i}") for i in range(1, 11)])
+    await session.flush()
+    await session.execute(
+        insert(Work),
+        [
+            {"id": i, "title": f"Work {i}", "composer_id": 1 + i % 10}
+            for i in range(1, REPORTS_PER_YEAR + 1)
+        ],
+    )
+    await session.execute(
+        insert(User), [{"id": i, "email": f"u{i}@bench"} for i in range(1, VOTES_PER_REPORT + 1)]
+    )
+
+    first_year = 2026 - YEARS
+    await session.execute(
+        insert(ExamEvent),
+        [
+            {"id": y, "year": first_year + y, "region_id": 1, "discipline_id": 1}
+            for y in range(1, YEARS + 1)
+        ],
+    )
+    report_id = 0
+    for event_id in range(1, YEARS + 1):
+        reports, votes = [], []
+        for work_id in range(1, REPORTS_PER_YEAR + 1):
+            report_id += 1
+            reports.append(
+                {"id": report_id, "user_id": 1, "event_id": event_id, "work_id": work_id}
+            )
+            votes.extend(
+                {"user_id": v, "report_id": report_id} for v in range(1, VOTES_PER_REPORT + 1)
+            )
+        await session.execute(insert(Report), reports)
+        await session.execute(insert(Vote), votes)
+    await session.commit()
+    await ReportService.recompute_vote_counters(session)
+
+
+async def legacy_discipline_batch(session: AsyncSession) -> None:
+    """The pre-snapshot read path: year query plus eager load of the whole batch."""
+    result = await session.execute(
+        select(ExamEvent.year)
+        .join(ExamEvent.reports)
+        .filter(ExamEvent.region_id == 1, ExamEvent.discipline_id == 1)
+    )
+    years = sorted(set(result.scalars().all()), reverse=True)[:10]
+    result = await session.execute(
+        select(ExamEvent)
+        .options(
+            joinedload(ExamEvent.reports).joinedload(Report.work).joinedload(Work.composer),
+            joinedload(ExamEvent.reports).selectinload(Report.votes),
+        )
+        .filter(ExamEvent.region_id == 1, ExamEvent.discipline_id == 1, ExamEvent.year.in_(years))
+    )
+    for ev in result.unique().scalars().all():
+        sum(len(r.votes) for r in ev.reports)
+
+
+async def timeline(session: AsyncSession) -> None:
+    await ExamService.get_discipline_context(session, "bench", "piano", None, True, None)
+
+
+async def measure(
+    factory: async_sessionmaker[AsyncSession],
+    counter: dict[str, int],
+    fn: Callable[[AsyncSession], Awaitable[Any]],
+) -> tuple[int, list[float]]:
+    timings = []
+    queries = 0
+    for _ in range(ITERATIONS):
+        async with factory() as session:
+            counter["n"] = 0
+            start = time.perf_counter()
+            await fn(session)
+            timings.append((time.perf_counter() - start) * 1000)
+            queries = counter["n"]
+    return queries, timings
+
+
+async def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp}/bench.db")
+        factory = async_sessionmaker(engine, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        print(f"Seeding {YEARS} years x {REPORTS_PER_YEAR} reports x {VOTES_PER_REPORT} votes...")
+        async with factory() as session:
+            await seed(session)
+
+        counter = {"n": 0}
+
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def _count(*_: Any) -> None:
+            counter["n"] += 1
+
+        print(f"{'path':<24}{'queries':>8}{'median ms':>12}{'p95 ms':>10}")
+        for label, fn in (("legacy eager-load", legacy_discipline_batch), ("timeline", timeline)):
+            queries, timings = await measure(factory, counter, fn)
+            p95 = statistics.quantiles(timings, n=20)[-1]
+            print(f"{label:<24}{queries:>8}{statistics.median(timings):>12.1f}{p95:>10.1f}")
+
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
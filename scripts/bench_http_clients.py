@@ -0,0 +1,109 @@
+"""Benchmark outbound calls: a new ``httpx.AsyncClient`` per call vs the shared registry.
+
+Starts a local HTTPS stub (uvicorn, throwaway self-signed certificate) that answers like
+the OpenOpus work list, then times sequential GETs made the old way (client per call, so a
+TCP + TLS handshake each time) and through ``http_clients`` (pooled keep-alive). Against
+the real upstreams every handshake also pays network round trips, so the saving per call
+is larger than measured here on loopback.
+
+    DATABASE_URL=sqlite+aiosqlite:///./unused.db SECRET_KEY=bench \\
+        python scripts/bench_http_clients.py
+"""
+
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+import uvicorn
+
+from app.core.http import HTTP2_AVAILABLE, OPENOPUS, http_clients
+
+PORT = 8765
+CALLS = 200
+BODY = b'{"status": {"success": "true"}, "works": []}'
+
+
+async def stub_app(scope: dict[str, Any], receive: Any, send: Any) -> None:
+    if scope["type"] != "http":
+        return
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json")],
+        }
+    )
+    await send({"type": "http.response.body", "body": BODY})
+
+
+def self_signed_cert(directory: str) -> tuple[str, str]:
+    cert, key = f"{directory}/cert.pem", f"{directory}/key.pem"
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1"]
+        + ["-keyout", key, "-out", cert, "-subj", "/CN=localhost"]
+        + ["-addext", "subjectAltName=DNS:localhost,IP:127.0.0.1"],
+        check=True,
+        capture_output=True,
+    )
+    return cert, key
+
+
+async def per_call_client(url: str) -> None:
+    async with httpx.AsyncClient() as client:
+        (await client.get(url)).raise_for_status()
+
+
+async def shared_client(url: str) -> None:
+    (await http_clients.get(OPENOPUS).get(url)).raise_for_status()
+
+
+async def measure(fn: Callable[[str], Awaitable[None]], url: str) -> list[float]:
+    await fn(url)  # warm-up (first shared call opens the pooled connection)
+    timings = []
+    for _ in range(CALLS):
+        start = time.perf_counter()
+        await fn(url)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    return timings
+
+
+async def main(url: str) -> None:
+    print(f"{CALLS} sequential GETs to {url} (HTTP/2 available: {HTTP2_AVAILABLE})")
+    print(f"{'path':<24}{'median us':>12}{'p95 us':>12}")
+    for label, fn in (("client per call", per_call_client), ("shared registry", shared_client)):
+        timings = await measure(fn, url)
+        p95 = statistics.quantiles(timings, n=20)[-1]
+        print(f"{label:<24}{statistics.median(timings):>12.0f}{p95:>12.0f}")
+    await http_clients.aclose()
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        cert, key = self_signed_cert(tmp)
+        # httpx trusts SSL_CERT_FILE when set, so both paths verify against the stub cert.
+        os.environ["SSL_CERT_FILE"] = cert
+        server = uvicorn.Server(
+            uvicorn.Config(
+                stub_app, port=PORT, ssl_certfile=cert, ssl_keyfile=key, log_level="warning"
+            )
+        )
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        while not server.started:
+            time.sleep(0.05)
+        try:
+            asyncio.run(main(f"https://localhost:{PORT}/work/list/composer/145/genre/all.json"))
+        finally:
+            server.should_exit = True
+            thread.join()
@@ -0,0 +1,167 @@
+"""Benchmark the participation check against a database with 1M votes.
+
+Seeds a throwaway SQLite database with 200 events x 50 reports and 1M votes spread over
+10k users, then times the previous two-query check against the single UNION query in
+``deps.check_user_event_participation``, with and without the composite indexes
+``ix_reports_event_user`` / ``ix_votes_user_report``.
+
+    DATABASE_URL=sqlite+aiosqlite:///./unused.db SECRET_KEY=bench \\
+        python scripts/bench_participation.py
+"""
+
+import asyncio
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.future import select
+
+from app.api import deps
+from app.db.base import Base
+from app.models import Composer, Discipline, ExamEvent, Region, Report, User, Vote, Work
+
+EVENTS = 200
+REPORTS_PER_EVENT = 50
+USERS = 10_000
+VOTES = 1_000_000
+CHECKS = 2_000
+BATCH = 50_000
+
+
+async def seed(session: AsyncSession) -> None:
+    session.add_all(
+        [
+            Region(id=1, name="Bench", slug="bench"),
+            Discipline(id=1, name="Piano", slug="piano"),
+            Composer(id=1, name="Composer"),
+        ]
+    )
+    await session.flush()
+    await session.execute(
+        insert(Work),
+        [
+            {"id": i, "title": f"Work {i}", "composer_id": 1}
+            for i in range(1, REPORTS_PER_EVENT + 1)
+        ],
+    )
+    await session.execute(
+        insert(User), [{"id": i, "email": f"u{i}@bench"} for i in range(1, USERS + 1)]
+    )
+    await session.execute(
+        insert(ExamEvent),
+        [
+            {"id": e, "year": 1000 + e, "region_id": 1, "discipline_id": 1}
+            for e in range(1, EVENTS + 1)
+        ],
+    )
+    await session.execute(
+        insert(Report),
+        [
+            {
+                "id": (e - 1) * REPORTS_PER_EVENT + w,
+                "user_id": 1 + (e * REPORTS_PER_EVENT + w) % USERS,
+                "event_id": e,
+                "work_id": w,
+            }
+            for e in range(1, EVENTS + 1)
+            for w in range(1, REPORTS_PER_EVENT + 1)
+        ],
+    )
+
+    rng = random.Random(0)
+    report_count = EVENTS * REPORTS_PER_EVENT
+    for _ in range(VOTES // BATCH):
+        await session.execute(
+            insert(Vote),
+            [
+                {"user_id": rng.randint(1, USERS), "report_id": rng.randint(1, report_count)}
+                for _ in range(BATCH)
+            ],
+        )
+    await session.commit()
+
+
+async def legacy_check(db: AsyncSession, user_id: int, event_id: int) -> tuple[bool, int | None]:
+    """The previous implementation: own Report first, then a Vote join Report."""
+    existing_report = await db.execute(
+        select(Report).filter(Report.event_id == event_id, Report.user_id == user_id)
+    )
+    if report := existing_report.scalars().first():
+        return True, int(report.id)
+    existing_vote = await db.execute(
+        select(Vote).join(Report).filter(Report.event_id == event_id, Vote.user_id == user_id)
+    )
+    if vote := existing_vote.scalars().first():
+        return True, int(vote.report_id)
+    return False, None
+
+
+async def measure(
+    factory: async_sessionmaker[AsyncSession],
+    pairs: list[tuple[int, int]],
+    fn: Callable[[AsyncSession, int, int], Awaitable[Any]],
+) -> list[float]:
+    timings = []
+    for user_id, event_id in pairs:
+        # Fresh session per check, like one request, so the memo never hits.
+        async with factory() as session:
+            start = time.perf_counter()
+            await fn(session, user_id, event_id)
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+async def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp}/bench.db")
+        factory = async_sessionmaker(engine, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        print(f"Seeding {EVENTS * REPORTS_PER_EVENT} reports and {VOTES} votes...")
+        async with factory() as session:
+            await seed(session)
+
+        rng = random.Random(1)
+        pairs = [(rng.randint(1, USERS), rng.randint(1, EVENTS)) for _ in range(CHECKS)]
+
+        print(f"{'indexes':<10}{'path':<12}{'median ms':>12}{'p95 ms':>10}")
+        for indexed in (False, True):
+            async with engine.begin() as conn:
+                if indexed:
+                    await conn.execute(
+                        text("CREATE INDEX ix_reports_event_user ON reports (event_id, user_id)")
+                    )
+                    await conn.execute(
+                        text("CREATE INDEX ix_votes_user_report ON votes (user_id, report_id)")
+                    )
+                else:
+                    await conn.execute(text("DROP INDEX ix_reports_event_user"))
+                    await conn.execute(text("DROP INDEX ix_votes_user_report"))
+                await conn.execute(text("ANALYZE"))
+
+            for label, fn in (
+                ("two-query", legacy_check),
+                ("union", deps.check_user_event_participation),
+            ):
+                timings = await measure(factory, pairs, fn)
+                p95 = statistics.quantiles(timings, n=20)[-1]
+                print(
+                    f"{'yes' if indexed else 'no':<10}{label:<12}"
+                    f"{statistics.median(timings):>12.3f}{p95:>10.3f}"
+                )
+
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
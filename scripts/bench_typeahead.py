@@ -0,0 +1,155 @@
+"""Benchmark the in-process typeahead index against the FTS5 search it fronts.
+
+Seeds a throwaway SQLite database with 20k composers and 200k works (10 per composer),
+loads ``TypeaheadService`` from it, and reports load time, the index's memory footprint
+(tracemalloc) and per-query latency for the wizard's composer and work steps.
+
+    DATABASE_URL=sqlite+aiosqlite:///./unused.db SECRET_KEY=bench \\
+        python scripts/bench_typeahead.py
+"""
+
+import asyncio
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.db.base import Base
+from app.models import Composer, Work
+from app.services.search_service import SearchService
+from app.services.typeahead_service import TypeaheadService
+
+COMPOSERS = 20_000
+WORKS_PER_COMPOSER = 10
+QUERIES = 2_000
+BATCH = 50_000
+
+FIRST_NAMES = ["Johann", "Carl", "Franz", "Antonín", "Frédéric", "Béla", "Clara", "Fanny", "Isaac"]
+LAST_NAMES = ["Bach", "Dvořák", "Schubert", "Chopin", "Bartók", "Albéniz", "Müller", "Wagner"]
+FORMS = ["Sonata", "Étude", "Prelude", "Nocturne", "Partita", "Suite", "Concerto", "Ballade"]
+
+
+def composer_name(i: int) -> str:
+    return f"{FIRST_NAMES[i % 9]} {LAST_NAMES[(i // 9) % 8]} {i}"
+
+
+async def seed(session: AsyncSession) -> None:
+    await session.execute(
+        insert(Composer),
+        [
+            {"id": i, "name": composer_name(i), "is_verified": i % 3 == 0}
+            for i in range(1, COMPOSERS + 1)
+        ],
+    )
+    rows = [
+        {
+            "id": (c - 1) * WORKS_PER_COMPOSER + w,
+            "title": f"{FORMS[(c + w) % 8]} No. {w} in {'ABCDEFG'[w % 7]} minor",
+            "composer_id": c,
+        }
+        for c in range(1, COMPOSERS + 1)
+        for w in range(1, WORKS_PER_COMPOSER + 1)
+    ]
+    for start in range(0, len(rows), BATCH):
+        await session.execute(insert(Work), rows[start : start + BATCH])
+    await session.commit()
+
+
+def time_sync(fn: Callable[[], Any]) -> list[float]:
+    timings = []
+    for _ in range(QUERIES):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    return timings
+
+
+async def time_async(fn: Callable[[], Awaitable[Any]], iterations: int) -> list[float]:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn()
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    return timings
+
+
+def report(label: str, timings: list[float]) -> None:
+    p95 = statistics.quantiles(timings, n=20)[-1]
+    print(f"{label:<34}{statistics.median(timings):>12.1f}{p95:>12.1f}")
+
+
+async def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp}/bench.db")
+        factory = async_sessionmaker(engine, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        print(f"Seeding {COMPOSERS} composers and {COMPOSERS * WORKS_PER_COMPOSER} works...")
+        async with factory() as session:
+            await seed(session)
+
+        async with factory() as session:
+            start = time.perf_counter()
+            await TypeaheadService.load(session)
+            load_seconds = time.perf_counter() - start
+            # Second load under tracemalloc, only to measure what the index retains.
+            tracemalloc.start()
+            await TypeaheadService.load(session)
+            retained = sum(
+                stat.size
+                for stat in tracemalloc.take_snapshot().statistics("filename")
+                if "typeahead_service" in str(stat.traceback)
+            )
+            tracemalloc.stop()
+        print(f"load: {load_seconds:.2f}s, index retains {retained / 2**20:.0f} MiB")
+
+        rng = random.Random(0)
+        composer_queries = [rng.choice(LAST_NAMES + FIRST_NAMES)[:n] for n in (2, 3, 4, 5) * 50]
+        work_queries = [rng.choice(FORMS)[:n] for n in (2, 3, 4) * 50]
+
+        def composer_lookup() -> Any:
+            return TypeaheadService.match_composers(rng.choice(composer_queries), 10)
+
+        def work_lookup() -> Any:
+            return TypeaheadService.match_works(
+                rng.choice(work_queries), rng.randint(1, COMPOSERS), 20
+            )
+
+        print(f"{'path':<34}{'median us':>12}{'p95 us':>12}")
+        report("typeahead composers (top 10)", time_sync(composer_lookup))
+        report("typeahead works (top 20)", time_sync(work_lookup))
+
+        async with factory() as session:
+            report(
+                "fts5 composers (top 10)",
+                await time_async(
+                    lambda: SearchService.search_composers(session, rng.choice(composer_queries)),
+                    200,
+                ),
+            )
+            report(
+                "fts5 works (top 20)",
+                await time_async(
+                    lambda: SearchService.search_works(
+                        session, rng.choice(work_queries), rng.randint(1, COMPOSERS)
+                    ),
+                    200,
+                ),
+            )
+
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
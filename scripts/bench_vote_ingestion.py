@@ -0,0 +1,159 @@
+"""Benchmark vote ingestion: one commit per vote vs the write-behind queue.
+
+Spawns worker processes (standing in for the 4 gunicorn workers) against one throwaway
+SQLite database opened with the production profile (``Settings.SQLITE_*``), each casting
+votes through ``ReportService.cast_vote`` from many concurrent "requests". Runs once with
+direct commits and once with ``VoteQueueService`` batching, for both
+``synchronous=NORMAL`` (the profile) and ``synchronous=FULL`` (an fsync per commit), and
+reports votes/s, median and p95 latency per vote, and how many votes failed with
+"database is locked".
+
+    DATABASE_URL=sqlite+aiosqlite:///./unused.db SECRET_KEY=bench \\
+        python scripts/bench_vote_ingestion.py
+"""
+
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db.base import Base
+from app.db.session import apply_sqlite_pragmas, sqlite_pragmas
+from app.models import Composer, Discipline, ExamEvent, Region, Report, User, Work
+from app.services.report_service import ReportService
+from app.services.vote_queue_service import VoteQueueService
+
+WORKERS = 4
+CONCURRENCY = 16  # in-flight vote requests per worker
+USERS_PER_WORKER = 250
+VOTES_PER_USER = 3  # each in a different event
+EVENTS = 100
+REPORTS_PER_EVENT = 5
+
+
+async def seed(url: str) -> None:
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine)
+    async with factory() as session:
+        session.add_all(
+            [
+                Region(id=1, name="Bench", slug="bench"),
+                Discipline(id=1, name="Piano", slug="piano"),
+                Composer(id=1, name="Composer"),
+            ]
+        )
+        await session.flush()
+        reports = EVENTS * REPORTS_PER_EVENT
+        await session.execute(
+            insert(User),
+            [{"id": i, "email": f"u{i}@bench"} for i in range(1, WORKERS * USERS_PER_WORKER + 1)],
+        )
+        await session.execute(
+            insert(ExamEvent),
+            [
+                {"id": i, "year": 2000 + i, "region_id": 1, "discipline_id": 1}
+                for i in range(1, EVENTS + 1)
+            ],
+        )
+        await session.execute(
+            insert(Work),
+            [{"id": i, "title": f"Work {i}", "composer_id": 1} for i in range(1, reports + 1)],
+        )
+        await session.execute(
+            insert(Report),
+            [
+                {"id": i, "user_id": 1, "event_id": 1 + (i - 1) // REPORTS_PER_EVENT, "work_id": i}
+                for i in range(1, reports + 1)
+            ],
+        )
+        await session.commit()
+    await engine.dispose()
+
+
+async def worker(url: str, index: int, synchronous: str, queued: bool) -> dict[str, Any]:
+    engine = create_async_engine(url)
+    apply_sqlite_pragmas(engine.sync_engine, {**sqlite_pragmas(), "synchronous": synchronous})
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    if queued:
+        VoteQueueService.start(factory, ReportService.write_vote_batch)
+
+    first_user = 1 + index * USERS_PER_WORKER
+    votes = [
+        (user, 1 + ((user + k) % EVENTS) * REPORTS_PER_EVENT + user % REPORTS_PER_EVENT)
+        for user in range(first_user, first_user + USERS_PER_WORKER)
+        for k in range(VOTES_PER_USER)
+    ]
+    latencies: list[float] = []
+    locked = 0
+
+    async def requests() -> None:
+        nonlocal locked
+        while votes:
+            user_id, report_id = votes.pop()
+            start = time.perf_counter()
+            async with factory() as db:
+                report = await db.get(Report, report_id)
+                assert report is not None
+                try:
+                    await ReportService.cast_vote(db, user_id, report)
+                except OperationalError:
+                    # "database is locked": the request would have been a 500.
+                    locked += 1
+                    continue
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(requests() for _ in range(CONCURRENCY)))
+    elapsed = time.perf_counter() - started
+    if queued:
+        await VoteQueueService.stop()
+    await engine.dispose()
+    return {"latencies": latencies, "locked": locked, "elapsed": elapsed}
+
+
+def run_worker(url: str, index: int, synchronous: str, queued: bool) -> dict[str, Any]:
+    return asyncio.run(worker(url, index, synchronous, queued))
+
+
+def run(url: str, synchronous: str, queued: bool) -> None:
+    # A pool rather than bare processes, so a worker's exception surfaces here.
+    with ProcessPoolExecutor(WORKERS) as pool:
+        futures = [pool.submit(run_worker, url, i, synchronous, queued) for i in range(WORKERS)]
+        outcomes = [future.result() for future in futures]
+
+    latencies = [ms for o in outcomes for ms in o["latencies"]]
+    locked = sum(o["locked"] for o in outcomes)
+    elapsed = max(o["elapsed"] for o in outcomes)
+    p95 = statistics.quantiles(latencies, n=20)[-1]
+    print(
+        f"{synchronous:<8}{'queued' if queued else 'direct':<8}{len(latencies) / elapsed:>10.0f}"
+        f"{statistics.median(latencies):>12.2f}{p95:>10.2f}{locked:>8}"
+    )
+
+
+def main() -> None:
+    votes = WORKERS * USERS_PER_WORKER * VOTES_PER_USER
+    print(f"{WORKERS} workers x {CONCURRENCY} concurrent requests, {votes} votes per run")
+    print(f"{'sync':<8}{'mode':<8}{'votes/s':>10}{'median ms':>12}{'p95 ms':>10}{'locked':>8}")
+    for synchronous in ("NORMAL", "FULL"):
+        for queued in (False, True):
+            with tempfile.TemporaryDirectory() as tmp:
+                url = f"sqlite+aiosqlite:///{tmp}/votes.db"
+                asyncio.run(seed(url))
+                run(url, synchronous, queued)
+
+
+if __name__ == "__main__":
+    main()
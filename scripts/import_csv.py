@@ -1,68 +1,150 @@
+"""Import a CSV work list (``composer_name,work_title[,nickname,wikidata_id,openopus_id]``).
+
+The file is streamed in chunks of ``--chunk-rows`` rows; each chunk costs a couple of
+queries and bulk inserts and is committed on its own, after which the number of rows done
+is written to a checkpoint file. Re-running the same command resumes after the last
+committed chunk; the checkpoint is removed once the import completes.
+
+    python scripts/import_csv.py data/sample_works.csv
+    python scripts/import_csv.py teachers.csv --dry-run
+
+``wikidata_id`` identifies the composer, ``openopus_id`` the work.
+"""
+
+import argparse
 import asyncio
 import csv
+import itertools
 import os
 import sys
+import time
+from collections.abc import Iterator
+from pathlib import Path
 
 # Ensure project root is in path
 sys.path.append(os.getcwd())
 
-from sqlalchemy.future import select
+from app.db.session import AsyncSessionLocal, engine
+from app.services.csv_import_service import CsvImportService, CsvWork
 
-from app.db.session import AsyncSessionLocal
-from app.models import Composer, Work
+DEFAULT_CSV = Path("data/sample_works.csv")
+# Rows per chunk (and per commit): a few statements each, with IN lists well under
+# SQLite's bound-parameter limit.
+CHUNK_ROWS = 1000
 
 
-async def import_csv_data():
-    csv_path = "data/sample_works.csv"
-    if not os.path.exists(csv_path):
-        print(f"File not found: {csv_path}")
-        return
+def parse_row(row: dict[str, str | None]) -> CsvWork | None:
+    def field(name: str) -> str | None:
+        return (row.get(name) or "").strip() or None
+
+    composer_name, title = field("composer_name"), field("work_title")
+    if not composer_name or not title:
+        return None
+    return CsvWork(
+        composer_name=composer_name,
+        title=title,
+        nickname=field("nickname"),
+        wikidata_id=field("wikidata_id"),
+        openopus_id=field("openopus_id"),
+    )
+
+
+def iter_chunks(
+    reader: Iterator[dict[str, str | None]], size: int
+) -> Iterator[list[dict[str, str | None]]]:
+    while chunk := list(itertools.islice(reader, size)):
+        yield chunk
+
+
+def read_checkpoint(path: Path) -> int:
+    try:
+        return int(path.read_text())
+    except (FileNotFoundError, ValueError):
+        return 0
 
-    print(f"Importing works from {csv_path}...")
 
+def write_checkpoint(path: Path, rows_done: int) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(str(rows_done))
+    os.replace(tmp, path)
+
+
+async def import_chunk(rows: list[CsvWork], dry_run: bool) -> tuple[int, int]:
     async with AsyncSessionLocal() as db:
-        with open(csv_path, encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                composer_name = row.get("composer_name").strip()
-                work_title = row.get("work_title").strip()
-                nickname = row.get("nickname", "").strip()
-
-                if not composer_name or not work_title:
-                    continue
-
-                # 1. Find Composer
-                result = await db.execute(select(Composer).filter(Composer.name == composer_name))
-                composer = result.scalar_one_or_none()
-
-                if not composer:
-                    print(f"Composer not found: {composer_name}. Creating...")
-                    composer = Composer(name=composer_name, is_verified=True)
-                    db.add(composer)
-                    await db.flush()  # flush to get ID
-
-                # 2. Check/Create Work
-                # We check by title + composer_id for duplicate prevention
-                result = await db.execute(
-                    select(Work).filter(Work.title == work_title, Work.composer_id == composer.id)
-                )
-                work = result.scalar_one_or_none()
-
-                if not work:
-                    work = Work(
-                        title=work_title,
-                        nickname=nickname,
-                        composer_id=composer.id,
-                        is_verified=True,
-                    )
-                    db.add(work)
-                    print(f"Added Work: {work_title} ({composer_name})")
-                else:
-                    print(f"Skipped Work (exists): {work_title}")
-
-        await db.commit()
-    print("Import complete.")
+        composer_ids = await CsvImportService.resolve_composers(db, rows)
+        written, skipped = await CsvImportService.add_works(db, rows, composer_ids)
+        if dry_run:
+            await db.rollback()
+        else:
+            await db.commit()
+    return written, skipped
+
+
+async def import_csv_data(
+    csv_path: Path = DEFAULT_CSV,
+    *,
+    dry_run: bool = False,
+    checkpoint_path: Path | None = None,
+    chunk_rows: int = CHUNK_ROWS,
+) -> tuple[int, int]:
+    """Import ``csv_path``; returns (works written, rows skipped) for this run."""
+    if not csv_path.exists():
+        print(f"File not found: {csv_path}")
+        return 0, 0
+    checkpoint = checkpoint_path or csv_path.with_name(csv_path.name + ".checkpoint")
+    rows_done = 0 if dry_run else read_checkpoint(checkpoint)
+    if rows_done:
+        print(f"Resuming {csv_path} after row {rows_done} ({checkpoint})")
+    else:
+        print(f"Importing works from {csv_path}{' (dry run)' if dry_run else ''}...")
+
+    written_total = skipped_total = 0
+    started = time.perf_counter()
+    with open(csv_path, encoding="utf-8", newline="") as f:
+        reader = itertools.islice(csv.DictReader(f), rows_done, None)
+        for chunk in iter_chunks(reader, chunk_rows):
+            rows = [work for row in chunk if (work := parse_row(row)) is not None]
+            written, skipped = await import_chunk(rows, dry_run) if rows else (0, 0)
+            written_total += written
+            skipped_total += skipped + len(chunk) - len(rows)
+            rows_done += len(chunk)
+            if not dry_run:
+                write_checkpoint(checkpoint, rows_done)
+            elapsed = time.perf_counter() - started
+            print(
+                f"... {rows_done} rows, {written_total} works written, {skipped_total} skipped"
+                f" ({(written_total + skipped_total) / elapsed:,.0f} rows/s)"
+            )
+
+    if not dry_run:
+        checkpoint.unlink(missing_ok=True)
+    print(
+        f"Import {'dry run ' if dry_run else ''}complete: {written_total} works written, "
+        f"{skipped_total} rows skipped in {time.perf_counter() - started:.1f}s."
+    )
+    return written_total, skipped_total
+
+
+async def main(args: argparse.Namespace) -> None:
+    try:
+        await import_csv_data(
+            args.csv_path,
+            dry_run=args.dry_run,
+            checkpoint_path=args.checkpoint,
+            chunk_rows=args.chunk_rows,
+        )
+    finally:
+        await engine.dispose()
 
 
 if __name__ == "__main__":
-    asyncio.run(import_csv_data())
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("csv_path", type=Path, nargs="?", default=DEFAULT_CSV)
+    parser.add_argument(
+        "--dry-run", action="store_true", help="run every query, then roll back each chunk"
+    )
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument(
+        "--checkpoint", type=Path, help="checkpoint file (default: <csv_path>.checkpoint)"
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,136 @@
+"""Import an offline OpenOpus dump into Composer/Work rows (upserted on ``openopus_id``).
+
+Accepts either the full dump (one JSON file with a top-level ``composers`` array, each
+composer carrying its ``works``) or a directory of JSON files, each a dump like that or a
+saved ``work/list/composer/{id}/genre/all.json`` response (``composer`` + ``works``).
+The full dump is decoded one composer at a time and written in batches, so memory stays
+flat however large the catalogue is.
+
+    python scripts/import_openopus.py path/to/dump.json
+    python scripts/import_openopus.py path/to/openopus_dir/
+
+Once a composer's catalogue is imported, ``/api/works/search?source=openopus`` answers
+from the local rows instead of fetching OpenOpus.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, TextIO
+
+# Ensure project root is in path
+sys.path.append(os.getcwd())
+
+from app.db.session import AsyncSessionLocal, engine
+from app.services.openopus_import_service import OpenOpusImportService
+
+# Flush a batch once it holds this many works (or composers): a few statements per
+# batch, each well under SQLite's bound-parameter limit per row set.
+BATCH_WORKS = 5000
+BATCH_COMPOSERS = 500
+READ_CHUNK = 1 << 16
+
+
+def _array_start(buf: str, key: str) -> int:
+    found = buf.find(f'"{key}"')
+    return buf.find("[", found) if found >= 0 else -1
+
+
+def iter_array_items(f: TextIO, key: str) -> Iterator[Any]:
+    """Yield the items of the top-level array ``key`` without loading the whole file."""
+    decoder = json.JSONDecoder()
+    buf = ""
+    while (start := _array_start(buf, key)) < 0:
+        chunk = f.read(READ_CHUNK)
+        if not chunk:
+            return
+        buf += chunk
+    buf, pos = buf[start + 1 :], 0
+
+    while True:
+        while pos < len(buf) and buf[pos] in " \t\r\n,":
+            pos += 1
+        if pos < len(buf):
+            if buf[pos] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                pass  # the item runs past what has been read so far
+            else:
+                yield item
+                buf, pos = buf[end:], 0
+                continue
+        chunk = f.read(READ_CHUNK)
+        if not chunk:
+            if pos < len(buf):
+                raise ValueError(f"Truncated JSON: {buf[pos : pos + 80]!r}...")
+            return
+        buf, pos = buf[pos:] + chunk, 0
+
+
+def iter_composers(path: Path) -> Iterator[dict[str, Any]]:
+    """Composer payloads (with their ``works``) from a dump file or a directory of them."""
+    files = sorted(path.glob("*.json")) if path.is_dir() else [path]
+    for file in files:
+        with open(file, encoding="utf-8") as f:
+            head = f.read(READ_CHUNK)
+            f.seek(0)
+            if '"composers"' in head:
+                yield from iter_array_items(f, "composers")
+                continue
+            data = json.load(f)  # a single composer's work list: small
+        if isinstance(data.get("composer"), dict):
+            yield {**data["composer"], "works": data.get("works") or []}
+
+
+async def flush(composers: list[dict[str, Any]]) -> tuple[int, int]:
+    async with AsyncSessionLocal() as db:
+        local_ids = await OpenOpusImportService.upsert_composers(db, composers)
+        works = [
+            (local_ids[str(c["id"])], work)
+            for c in composers
+            if str(c.get("id")) in local_ids
+            for work in c.get("works") or []
+        ]
+        written = await OpenOpusImportService.upsert_works(db, works)
+        await OpenOpusImportService.mark_catalogues_imported(
+            db, {local_ids[str(c["id"])] for c in composers if str(c.get("id")) in local_ids}
+        )
+        await db.commit()
+    return len(local_ids), written
+
+
+async def import_openopus(path: Path) -> None:
+    composers_total = works_total = 0
+    batch: list[dict[str, Any]] = []
+    batch_works = 0
+    for composer in iter_composers(path):
+        batch.append(composer)
+        batch_works += len(composer.get("works") or [])
+        if batch_works >= BATCH_WORKS or len(batch) >= BATCH_COMPOSERS:
+            composers, works = await flush(batch)
+            composers_total, works_total = composers_total + composers, works_total + works
+            print(f"... {composers_total} composers, {works_total} works")
+            batch, batch_works = [], 0
+    if batch:
+        composers, works = await flush(batch)
+        composers_total, works_total = composers_total + composers, works_total + works
+    print(f"Import complete: {composers_total} composers, {works_total} works.")
+
+
+async def main(path: Path) -> None:
+    try:
+        await import_openopus(path)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", type=Path, help="OpenOpus dump file or directory of JSON files")
+    asyncio.run(main(parser.parse_args().path))
@@ -0,0 +1,150 @@
+"""Load-test SQLite read/write concurrency with and without the connection profile.
+
+Spawns writer and reader processes (standing in for gunicorn workers) against one
+throwaway database file. Writers mirror a vote (insert a Vote, bump the report counter,
+commit); readers mirror the exam page (load an event's reports). Each run reports
+throughput, p95 latency and "database is locked" failures, first with a bare engine (the
+previous setup), then with the pragmas from ``Settings.SQLITE_*``.
+
+    DATABASE_URL=sqlite+aiosqlite:///./unused.db SECRET_KEY=bench \\
+        python scripts/load_test_sqlite.py
+"""
+
+import asyncio
+import multiprocessing
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import insert, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.future import select
+
+from app.db.base import Base
+from app.db.session import apply_sqlite_pragmas, sqlite_pragmas
+from app.models import Composer, Discipline, ExamEvent, Region, Report, User, Vote, Work
+
+WRITERS = 4
+READERS = 4
+DURATION_SECONDS = 10
+REPORTS = 50
+# Per-connection lock wait for the bare engine: sqlite3's own default.
+BARE_TIMEOUT_SECONDS = 5.0
+
+
+async def seed(url: str) -> None:
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine)
+    async with factory() as session:
+        session.add_all(
+            [
+                Region(id=1, name="Load", slug="load"),
+                Discipline(id=1, name="Piano", slug="piano"),
+                Composer(id=1, name="Composer"),
+                User(id=1, email="load@test"),
+                ExamEvent(id=1, year=2025, region_id=1, discipline_id=1),
+            ]
+        )
+        await session.flush()
+        await session.execute(
+            insert(Work),
+            [{"id": i, "title": f"Work {i}", "composer_id": 1} for i in range(1, REPORTS + 1)],
+        )
+        await session.execute(
+            insert(Report),
+            [{"id": i, "user_id": 1, "event_id": 1, "work_id": i} for i in range(1, REPORTS + 1)],
+        )
+        await session.commit()
+    await engine.dispose()
+
+
+async def worker(url: str, profile: bool, role: str, deadline: float) -> dict[str, Any]:
+    engine = create_async_engine(url, connect_args={"timeout": BARE_TIMEOUT_SECONDS})
+    if profile:
+        apply_sqlite_pragmas(engine.sync_engine, sqlite_pragmas())
+    factory = async_sessionmaker(engine)
+    latencies: list[float] = []
+    locked = 0
+    i = 0
+    while time.monotonic() < deadline:
+        i += 1
+        start = time.perf_counter()
+        try:
+            async with factory() as session:
+                if role == "write":
+                    report_id = 1 + i % REPORTS
+                    session.add(Vote(user_id=1, report_id=report_id))
+                    await session.execute(
+                        update(Report)
+                        .where(Report.id == report_id)
+                        .values(vote_count=Report.vote_count + 1)
+                    )
+                    await session.commit()
+                else:
+                    result = await session.execute(select(Report).filter(Report.event_id == 1))
+                    result.scalars().all()
+        except OperationalError as e:
+            if "locked" not in str(e):
+                raise
+            locked += 1
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+    await engine.dispose()
+    return {"role": role, "latencies": latencies, "locked": locked}
+
+
+def run_worker(
+    url: str,
+    profile: bool,
+    role: str,
+    deadline: float,
+    results: "multiprocessing.Queue[dict[str, Any]]",
+) -> None:
+    results.put(asyncio.run(worker(url, profile, role, deadline)))
+
+
+def run(url: str, profile: bool) -> None:
+    results: multiprocessing.Queue[dict[str, Any]] = multiprocessing.Queue()
+    deadline = time.monotonic() + DURATION_SECONDS
+    processes = [
+        multiprocessing.Process(target=run_worker, args=(url, profile, role, deadline, results))
+        for role in ["write"] * WRITERS + ["read"] * READERS
+    ]
+    for process in processes:
+        process.start()
+    outcomes = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    label = "profile" if profile else "bare"
+    for role in ("write", "read"):
+        mine = [o for o in outcomes if o["role"] == role]
+        latencies = [ms for o in mine for ms in o["latencies"]]
+        locked = sum(o["locked"] for o in mine)
+        p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else 0.0
+        print(
+            f"{label:<9}{role:<7}{len(latencies) / DURATION_SECONDS:>10.0f}"
+            f"{statistics.median(latencies) if latencies else 0.0:>12.2f}{p95:>10.2f}{locked:>8}"
+        )
+
+
+def main() -> None:
+    print(f"{WRITERS} writers + {READERS} readers, {DURATION_SECONDS}s per run")
+    print(f"{'engine':<9}{'role':<7}{'ops/s':>10}{'median ms':>12}{'p95 ms':>10}{'locked':>8}")
+    for profile in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            url = f"sqlite+aiosqlite:///{tmp}/load.db"
+            asyncio.run(seed(url))
+            run(url, profile)
+
+
+if __name__ == "__main__":
+    main()
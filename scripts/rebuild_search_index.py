@@ -0,0 +1,30 @@
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db.session import AsyncSessionLocal, engine
+from app.services.search_service import SearchService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def rebuild() -> None:
+    async with AsyncSessionLocal() as session:
+        logger.info("Rebuilding composer/work search index from the content tables...")
+        await SearchService.rebuild_index(session)
+    logger.info("Search index rebuilt.")
+
+
+async def main() -> None:
+    try:
+        await rebuild()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,30 @@
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db.session import AsyncSessionLocal, engine
+from app.services.report_service import ReportService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def recount() -> None:
+    async with AsyncSessionLocal() as session:
+        logger.info("Recomputing vote counters and consensus snapshots from votes...")
+        await ReportService.recompute_vote_counters(session)
+    logger.info("Vote counters repaired.")
+
+
+async def main() -> None:
+    try:
+        await recount()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
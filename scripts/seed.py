@@ -1,14 +1,19 @@
 import asyncio
+import hashlib
+import json
 import logging
 import sys
+import time
+from datetime import datetime, timezone
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import AsyncSessionLocal, engine
-from app.models import Discipline, ExamEvent, Region
+from app.db.session import AsyncSessionLocal, dialect_insert, engine
+from app.models import AppMetadata, Discipline, ExamEvent, Region
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -39,52 +44,90 @@ INITIAL_DISCIPLINES = [
 ]
 
 
-async def seed():
-    async with AsyncSessionLocal() as session:
-        logger.info("Seeding Regions...")
-        for region_data in INITIAL_REGIONS:
-            stmt = select(Region).filter_by(slug=region_data["slug"])
-            result = await session.execute(stmt)
-            existing = result.scalar_one_or_none()
-            if not existing:
-                logger.info(f"Adding Region: {region_data['name']}")
-                session.add(Region(**region_data))
-            else:
-                logger.info(f"Region exists: {region_data['name']}")
-
-        logger.info("Seeding Disciplines...")
-        for discipline_data in INITIAL_DISCIPLINES:
-            stmt = select(Discipline).filter_by(slug=discipline_data["slug"])
-            result = await session.execute(stmt)
-            existing = result.scalar_one_or_none()
-            if not existing:
-                logger.info(f"Adding Discipline: {discipline_data['name']}")
-                session.add(Discipline(**discipline_data))
-            else:
-                logger.info(f"Discipline exists: {discipline_data['name']}")
-
-        await session.commit()
-
-        # Seed Exam Events
-        logger.info("Seeding Exam Events...")
-        # Get necessary IDs
-        andalucia = (await session.execute(select(Region).filter_by(slug="andalucia"))).scalar_one()
-        piano = (await session.execute(select(Discipline).filter_by(slug="piano"))).scalar_one()
+INITIAL_EXAM_EVENTS = [
+    {"region": "andalucia", "discipline": "piano", "year": 2026},
+]
 
-        # Check and create event for Andalucia Piano 2026
-        stmt = select(ExamEvent).filter_by(
-            region_id=andalucia.id, discipline_id=piano.id, year=2026
+# app_metadata key holding the hash of the lists above as last seeded.
+SEED_HASH_KEY = "seed_hash"
+
+
+def seed_hash() -> str:
+    """Content hash of the seed lists: any edit to them changes it."""
+    payload = json.dumps(
+        [INITIAL_REGIONS, INITIAL_DISCIPLINES, INITIAL_EXAM_EVENTS],
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+async def upsert_reference_data(session: AsyncSession) -> None:
+    """One bulk upsert per table: new slugs are added, renamed entries updated."""
+    for model, rows in ((Region, INITIAL_REGIONS), (Discipline, INITIAL_DISCIPLINES)):
+        stmt = dialect_insert(session, model)
+        await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[model.slug], set_={"name": stmt.excluded.name}
+            ),
+            rows,
         )
-        result = await session.execute(stmt)
-        if not result.scalar_one_or_none():
-            logger.info("Adding Exam Event: Andalucia Piano 2026")
-            session.add(ExamEvent(region_id=andalucia.id, discipline_id=piano.id, year=2026))
-        else:
-            logger.info("Exam Event exists: Andalucia Piano 2026")
 
+    region_ids = dict((await session.execute(select(Region.slug, Region.id))).tuples().all())
+    discipline_ids = dict(
+        (await session.execute(select(Discipline.slug, Discipline.id))).tuples().all()
+    )
+    await session.execute(
+        dialect_insert(session, ExamEvent).on_conflict_do_nothing(),
+        [
+            {
+                "region_id": region_ids[event["region"]],
+                "discipline_id": discipline_ids[event["discipline"]],
+                "year": event["year"],
+            }
+            for event in INITIAL_EXAM_EVENTS
+        ],
+    )
+
+
+async def seed() -> bool:
+    """Seed reference data unless it is already at the current hash; returns whether it ran.
+
+    Runs on every boot (start.sh), so the usual case, unchanged seed lists, costs a single
+    query.
+    """
+    started = time.perf_counter()
+    digest = seed_hash()
+    async with AsyncSessionLocal() as session:
+        stored = await session.scalar(select(AppMetadata.value).filter_by(key=SEED_HASH_KEY))
+        if stored == digest:
+            logger.info(
+                "Seed data unchanged (%s), skipped in %.1f ms",
+                digest[:12],
+                (time.perf_counter() - started) * 1000,
+            )
+            return False
+
+        await upsert_reference_data(session)
+        stmt = dialect_insert(session, AppMetadata)
+        await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[AppMetadata.key],
+                set_={"value": stmt.excluded.value, "updated_at": stmt.excluded.updated_at},
+            ),
+            [{"key": SEED_HASH_KEY, "value": digest, "updated_at": datetime.now(timezone.utc)}],
+        )
         await session.commit()
 
-    logger.info("Seeding Complete.")
+    logger.info(
+        "Seeded %d regions, %d disciplines, %d exam events (%s) in %.1f ms",
+        len(INITIAL_REGIONS),
+        len(INITIAL_DISCIPLINES),
+        len(INITIAL_EXAM_EVENTS),
+        digest[:12],
+        (time.perf_counter() - started) * 1000,
+    )
+    return True
 
 
 async def main() -> None:
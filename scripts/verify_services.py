@@ -5,6 +5,7 @@ import sys
 # Ensure project root is in path
 sys.path.append(os.getcwd())
 
+from app.core.http import http_clients
 from app.services.openopus import get_popular_composers, search_work
 from app.services.wikidata import get_composer_by_id, search_composer
 
@@ -20,7 +21,7 @@ async def main():
             if first.get("wikidata_id"):
                 try:
                     details = await get_composer_by_id(first["wikidata_id"])
-                    print(f"Details for {first['wikidata_id']}: Name={details.get('name')}")
+                    print(f"Details for {first['wikidata_id']}: Name={details.name}")
                 except Exception as e:
                     print(f"Get details failed: {e}")
     except Exception as e:
@@ -45,6 +46,8 @@ async def main():
     except Exception as e:
         print(f"Search work failed: {e}")
 
+    await http_clients.aclose()
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -9,10 +9,16 @@ alembic upgrade head
 # Best-effort ONLY: this must never block or fail startup. A hang is bounded by
 # `timeout`, and any non-zero exit is swallowed so `set -e` cannot abort boot.
 # Seeding is idempotent, so if it is skipped on one boot it converges on a
-# later one. This keeps the web server's availability independent of seeding.
+# later one; when the seed lists are unchanged it is a single query. This
+# keeps the web server's availability independent of seeding.
 echo "Seeding reference data..."
 timeout 30 python scripts/seed.py || echo "WARN: seeding skipped (timed out or errored); continuing startup"
 
+# Several workers need a shared invalidation bus, or caches and live updates only
+# see the writes made by their own worker.
+export WEB_CONCURRENCY="${WEB_CONCURRENCY:-4}"
+export CACHE_BUS_BACKEND="${CACHE_BUS_BACKEND:-database}"
+
 # Start application (exec so gunicorn is PID 1 and receives Fly's stop signals)
 echo "Starting application..."
-exec gunicorn app.main:app --workers 4 --worker-class uvicorn.workers.UvicornWorker --bind 0.0.0.0:8080 --access-logfile -
+exec gunicorn app.main:app --workers "$WEB_CONCURRENCY" --worker-class uvicorn.workers.UvicornWorker --bind 0.0.0.0:8080 --access-logfile -
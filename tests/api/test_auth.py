@@ -0,0 +1,26 @@
+from app.core.security import create_session_token
+from app.models import User
+
+
+async def test_logout_everywhere_revokes_every_session(client, db):
+    user = User(email="logout-all@test.com", role="Visitor")
+    db.add(user)
+    await db.commit()
+    # Tokens issued to other devices are indistinguishable from this one.
+    headers = {"Authorization": f"Bearer {create_session_token(user)}"}
+    assert (await client.get("/api/auth/me", headers=headers)).status_code == 200
+
+    response = await client.post("/logout/all", headers=headers)
+
+    assert response.status_code == 303
+    assert response.headers["location"] == "/"
+    assert "access_token" in response.headers["set-cookie"]
+    assert (await client.get("/api/auth/me", headers=headers)).status_code == 401
+    fresh = {"Authorization": f"Bearer {create_session_token(user)}"}
+    assert (await client.get("/api/auth/me", headers=fresh)).status_code == 200
+
+
+async def test_logout_everywhere_requires_a_session(client):
+    response = await client.post("/logout/all")
+
+    assert response.status_code == 401
@@ -2,6 +2,8 @@ from unittest.mock import AsyncMock, patch
 
 import pytest
 
+from app.models import Composer
+
 
 @pytest.mark.asyncio
 async def test_search_composers_endpoint(client):
@@ -28,3 +30,14 @@ async def test_search_composers_missing_param_endpoint(client):
 async def test_search_composers_short_query(client):
     response = await client.get("/api/composers/search?q=a")
     assert response.status_code == 422  # Min length 2
+
+
+@pytest.mark.asyncio
+async def test_search_composers_local_accent_insensitive(client, db):
+    db.add(Composer(name="Antonín Dvořák", is_verified=True))
+    await db.commit()
+
+    response = await client.get("/api/composers/search?q=dvorak")
+
+    assert response.status_code == 200
+    assert [c["name"] for c in response.json()] == ["Antonín Dvořák"]
@@ -1,8 +1,8 @@
-"""Unit tests for check_user_event_participation in app.api.deps."""
+"""Unit tests for the participation check in app.api.deps."""
 
 import pytest
 
-from app.api.deps import check_user_event_participation
+from app.api.deps import check_user_event_participation, remember_participation
 from app.models import Composer, Discipline, ExamEvent, Region, Report, User, Vote, Work
 
 
@@ -101,3 +101,41 @@ async def test_other_user_report_does_not_affect_unrelated_user(
     has_participated, report_id = await check_user_event_participation(db, user.id, event.id)
     assert has_participated is False
     assert report_id is None
+
+
+async def test_own_report_preferred_over_vote(db, user, other_user, event, composer_and_work):
+    composer, work = composer_and_work
+    other_work = Work(title="Deps Work 2", composer_id=composer.id, is_verified=True)
+    db.add(other_work)
+    await db.commit()
+    voted = Report(user_id=other_user.id, event_id=event.id, work_id=work.id, is_flagged=False)
+    own = Report(user_id=user.id, event_id=event.id, work_id=other_work.id, is_flagged=False)
+    db.add_all([voted, own])
+    await db.commit()
+    db.add(Vote(user_id=user.id, report_id=voted.id))
+    await db.commit()
+
+    assert await check_user_event_participation(db, user.id, event.id) == (True, own.id)
+
+
+async def test_participation_memoized_per_session(db, user, event, composer_and_work):
+    _, work = composer_and_work
+    assert await check_user_event_participation(db, user.id, event.id) == (False, None)
+
+    # Written behind the memo's back: the same session keeps its first answer.
+    db.add(Report(user_id=user.id, event_id=event.id, work_id=work.id, is_flagged=False))
+    await db.commit()
+    assert await check_user_event_participation(db, user.id, event.id) == (False, None)
+
+
+async def test_rollback_forgets_remembered_participation(db, user, event, composer_and_work):
+    _, work = composer_and_work
+    user_id, event_id = user.id, event.id
+    report = Report(user_id=user_id, event_id=event_id, work_id=work.id, is_flagged=False)
+    db.add(report)
+    await db.flush()
+    remember_participation(db, user_id, event_id, report.id)
+
+    await db.rollback()
+
+    assert await check_user_event_participation(db, user_id, event_id) == (False, None)
@@ -0,0 +1,30 @@
+from unittest.mock import patch
+
+import pytest
+
+from app.core.config import settings
+from app.models import Discipline, ExamEvent, Region
+
+
+@pytest.fixture
+async def event(db):
+    region = Region(name="Stream Region", slug="stream-region")
+    discipline = Discipline(name="Stream Discipline", slug="stream-discipline")
+    db.add_all([region, discipline])
+    await db.commit()
+    event = ExamEvent(year=2024, region_id=region.id, discipline_id=discipline.id)
+    db.add(event)
+    await db.commit()
+    return event
+
+
+async def test_live_updates_unknown_event_is_404(client, event):
+    response = await client.get("/exams/stream-region/stream-discipline/1999/live")
+    assert response.status_code == 404
+
+
+async def test_live_updates_refused_past_subscriber_limit(client, event):
+    with patch.object(settings, "LIVE_UPDATES_MEMORY_BUDGET_MB", 0):
+        response = await client.get("/exams/stream-region/stream-discipline/2024/live")
+    assert response.status_code == 503
+    assert "Retry-After" in response.headers
@@ -0,0 +1,93 @@
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.core.constants import Cache
+from app.models import Composer, Discipline, ExamEvent, Region, Report, User, Work
+from app.services.exam_service import ExamService
+from app.services.page_cache_service import PageCacheService
+from app.services.report_service import ReportService
+
+
+@pytest.fixture
+async def report(db):
+    region = Region(name="Cache Region", slug="cache-region")
+    discipline = Discipline(name="Cache Discipline", slug="cache-discipline")
+    composer = Composer(name="Cache Composer", is_verified=True)
+    user = User(email="page-cache@test.com")
+    db.add_all([region, discipline, composer, user])
+    await db.commit()
+
+    event = ExamEvent(year=2024, region_id=region.id, discipline_id=discipline.id)
+    work = Work(title="Cache Work", composer_id=composer.id, is_verified=True)
+    db.add_all([event, work])
+    await db.commit()
+
+    report = Report(user_id=user.id, event_id=event.id, work_id=work.id)
+    db.add(report)
+    await db.commit()
+    await ReportService.cast_vote(db, user.id, report)
+    return report
+
+
+EXAM_URL = "/exams/cache-region/cache-discipline/2024"
+DISCIPLINE_URL = "/exams/cache-region/cache-discipline"
+
+
+async def test_anonymous_exam_page_served_from_cache(client, report):
+    first = await client.get(EXAM_URL)
+    assert first.status_code == 200
+    assert "ETag" in first.headers
+
+    with patch.object(ExamService, "get_exam_context") as get_context:
+        second = await client.get(EXAM_URL)
+    get_context.assert_not_called()
+    assert second.text == first.text
+
+
+async def test_matching_if_none_match_returns_304(client, report):
+    first = await client.get(DISCIPLINE_URL)
+    etag = first.headers["ETag"]
+
+    response = await client.get(DISCIPLINE_URL, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+async def test_vote_invalidates_event_and_discipline_pages(client, db, report):
+    exam_etag = (await client.get(EXAM_URL)).headers["ETag"]
+    discipline_etag = (await client.get(DISCIPLINE_URL)).headers["ETag"]
+
+    voter = User(email="page-cache-voter@test.com")
+    db.add(voter)
+    await db.commit()
+    await ReportService.cast_vote(db, voter.id, report)
+
+    exam = await client.get(EXAM_URL, headers={"If-None-Match": exam_etag})
+    discipline = await client.get(DISCIPLINE_URL, headers={"If-None-Match": discipline_etag})
+    assert exam.status_code == 200
+    assert exam.headers["ETag"] != exam_etag
+    assert discipline.status_code == 200
+    assert discipline.headers["ETag"] != discipline_etag
+
+
+async def test_unknown_query_params_share_the_cached_page(client, report):
+    await client.get(DISCIPLINE_URL)
+
+    with patch.object(ExamService, "get_discipline_context") as get_context:
+        response = await client.get(DISCIPLINE_URL, params={"junk": "1", "sparse_mode": "true"})
+    get_context.assert_not_called()
+    assert response.status_code == 200
+    assert len(PageCacheService._pages) == 1
+
+
+def test_tag_index_forgets_expired_and_evicted_pages():
+    for i in range(Cache.PAGE_CACHE_MAX_ENTRIES + 10):
+        PageCacheService.store(f"/page/{i}", b"body", {f"event:{i}", "discipline:1:1"})
+    assert len(PageCacheService._keys_by_tag) == Cache.PAGE_CACHE_MAX_ENTRIES + 1
+    assert len(PageCacheService._keys_by_tag["discipline:1:1"]) == Cache.PAGE_CACHE_MAX_ENTRIES
+
+    PageCacheService._pages.expire(time.monotonic() + Cache.PAGE_CACHE_TTL_SECONDS + 1)
+    assert not PageCacheService._pages
+    assert not PageCacheService._keys_by_tag
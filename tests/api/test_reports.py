@@ -7,6 +7,8 @@ from app.api import deps
 from app.core import config as app_config
 from app.main import app as fastapi_app
 from app.models import Composer, Discipline, ExamEvent, Region, Report, User, Work
+from app.services.identity_service import UserIdentity
+from app.services.report_service import ReportService
 
 
 @pytest.fixture
@@ -104,3 +106,61 @@ async def test_create_report_unverified_composer_and_work(client, db, user, even
     work = result.scalar_one()
     assert not work.is_verified
     assert work.composer_id == composer.id
+
+
+@pytest.fixture
+async def contested(db, user, event):
+    """Two reports in ``event`` with one vote each, cast by other users."""
+    composer = Composer(name="Chopin", is_verified=True)
+    voters = [User(email="first@example.com"), User(email="second@example.com")]
+    db.add_all([composer, *voters])
+    await db.commit()
+
+    reports = []
+    for title, voter in zip(["Nocturne", "Ballade"], voters, strict=True):
+        work = Work(title=title, composer_id=composer.id, is_verified=True)
+        db.add(work)
+        await db.commit()
+        report = Report(user_id=voter.id, event_id=event.id, work_id=work.id)
+        db.add(report)
+        await db.commit()
+        await ReportService.cast_vote(db, voter.id, report)
+        reports.append(report)
+
+    fastapi_app.dependency_overrides[deps.get_current_user_optional] = lambda: UserIdentity(
+        id=user.id, email=user.email, role=user.role
+    )
+    yield reports
+    fastapi_app.dependency_overrides.pop(deps.get_current_user_optional, None)
+
+
+async def test_vote_renders_updated_cards_without_refetching(client, contested):
+    target, sibling = contested
+
+    with patch.object(
+        ReportService,
+        "fetch_report_with_context",
+        wraps=ReportService.fetch_report_with_context,
+    ) as fetch:
+        response = await client.post(f"/api/reports/{target.id}/vote")
+
+    assert response.status_code == 200, response.text
+    fetch.assert_called_once()
+    assert f'id="report-{target.id}" data-status="disputed" data-votes="2"' in response.text
+    assert (
+        f'id="report-{sibling.id}" data-status="neutral" data-votes="1"\n'
+        '    data-flagged="false" hx-swap-oob="true"'
+    ) in response.text
+    assert 'id="consensus-banner"' in response.text
+
+
+async def test_flag_renders_only_the_flagged_card(client, contested):
+    target, sibling = contested
+
+    response = await client.post(f"/api/reports/{target.id}/flag")
+
+    assert response.status_code == 200, response.text
+    assert f'id="report-{target.id}"' in response.text
+    assert "Marcado para revisión" in response.text
+    assert f'id="report-{sibling.id}"' not in response.text
+    assert 'id="consensus-banner"' not in response.text
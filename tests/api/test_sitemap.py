@@ -0,0 +1,113 @@
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import update
+
+from app.core.constants import Sitemap
+from app.models import Composer, Discipline, ExamEvent, Region, Report, User, Work
+from app.services.report_service import ReportService
+from app.services.sitemap_service import SitemapService
+
+
+@pytest.fixture
+async def events(db):
+    region = Region(name="Sitemap Region", slug="sitemap-region")
+    discipline = Discipline(name="Sitemap Discipline", slug="sitemap-discipline")
+    composer = Composer(name="Sitemap Composer", is_verified=True)
+    user = User(email="sitemap@test.com")
+    db.add_all([region, discipline, composer, user])
+    await db.commit()
+
+    with_data, empty = (
+        ExamEvent(year=year, region_id=region.id, discipline_id=discipline.id)
+        for year in (2024, 2025)
+    )
+    work = Work(title="Sitemap Work", composer_id=composer.id, is_verified=True)
+    db.add_all([with_data, empty, work])
+    await db.commit()
+
+    report = Report(user_id=user.id, event_id=with_data.id, work_id=work.id)
+    db.add(report)
+    await db.commit()
+    await ReportService.cast_vote(db, user.id, report)
+    return with_data, empty, report
+
+
+async def test_sitemap_lists_only_events_with_data(client, events):
+    response = await client.get("/sitemap.xml")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/xml"
+    assert "<loc>http://test/exams/sitemap-region/sitemap-discipline/2024</loc>" in response.text
+    assert "/2025<" not in response.text
+    assert response.text.count("<lastmod>") == 1
+
+
+async def test_sitemap_is_cached_until_a_vote_changes_an_event(client, db, events):
+    await client.get("/sitemap.xml")
+    with patch.object(SitemapService, "entries") as entries:
+        await client.get("/sitemap.xml")
+    entries.assert_not_called()
+
+    voter = User(email="sitemap-voter@test.com")
+    db.add(voter)
+    await db.commit()
+    await ReportService.cast_vote(db, voter.id, events[2])
+
+    with patch.object(SitemapService, "entries", return_value=[]) as entries:
+        await client.get("/sitemap.xml")
+    entries.assert_called_once()
+
+
+async def test_report_without_timestamp_is_listed_without_lastmod(client, db, events):
+    with_data, empty, report = events
+    undated = Report(user_id=report.user_id, event_id=empty.id, work_id=report.work_id)
+    db.add(undated)
+    await db.commit()
+    await db.execute(update(Report).where(Report.id == undated.id).values(created_at=None))
+    await db.commit()
+
+    response = await client.get("/sitemap.xml")
+    with patch.object(Sitemap, "MAX_URLS_PER_FILE", 1):
+        SitemapService.reset_cache()
+        index = await client.get("/sitemap.xml")
+
+    assert response.status_code == 200
+    assert "/sitemap-region/sitemap-discipline/2025</loc><changefreq>" in response.text
+    assert response.text.count("<lastmod>") == 1
+    assert index.status_code == 200
+    assert index.text.count("<sitemap>") == 2
+    assert index.text.count("<lastmod>") == 1
+
+
+async def test_large_sitemap_becomes_an_index_of_child_files(client, db, events):
+    with_data, empty, report = events
+    db.add(Report(user_id=report.user_id, event_id=empty.id, work_id=report.work_id))
+    await db.commit()
+
+    with patch.object(Sitemap, "MAX_URLS_PER_FILE", 1):
+        index = await client.get("/sitemap.xml")
+        second = await client.get("/sitemaps/events-2.xml")
+        missing = await client.get("/sitemaps/events-3.xml")
+
+    assert "<sitemapindex" in index.text
+    assert index.text.count("<sitemap>") == 2
+    assert "<loc>http://test/sitemaps/events-2.xml</loc>" in index.text
+    assert "/sitemap-region/sitemap-discipline/2025</loc>" in second.text
+    assert second.text.count("<url>") == 1
+    assert missing.status_code == 404
+
+
+async def test_page_lastmods_match_each_child_files_entries(db, events):
+    with_data, empty, report = events
+    db.add(Report(user_id=report.user_id, event_id=empty.id, work_id=report.work_id))
+    await db.commit()
+
+    with patch.object(Sitemap, "MAX_URLS_PER_FILE", 1):
+        lastmods = await SitemapService.page_lastmods(db)
+    entries = await SitemapService.entries(db)
+
+    assert lastmods == [entry.lastmod for entry in entries]
+    assert all(isinstance(lastmod, datetime) for lastmod in lastmods)
+    assert len(await SitemapService.page_lastmods(db)) == 1
@@ -1,20 +1,24 @@
+from datetime import datetime, timezone
 from unittest.mock import AsyncMock, patch
 
+import httpx
 import pytest
 from httpx import ASGITransport, AsyncClient
 
+from app.core.http import HttpClientRegistry
 from app.main import app
+from app.models import Composer, Work
+from app.services.typeahead_service import TypeaheadService
 
 
 @pytest.mark.asyncio
-async def test_search_works_endpoint():
+async def test_search_works_endpoint(client):
     mock_results = [{"title": "Moonlight Sonata", "id": "123"}]
 
     with patch("app.services.openopus.search_work", new_callable=AsyncMock) as mock_search:
         mock_search.return_value = mock_results
 
-        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
-            response = await ac.get("/api/works/search?q=Moonlight&composer_id=145&source=openopus")
+        response = await client.get("/api/works/search?q=Moonlight&composer_id=145&source=openopus")
 
         assert response.status_code == 200
         assert response.json() == mock_results
@@ -29,3 +33,76 @@ async def test_search_works_missing_composer_id():
         )  # composer_id required for openopus
 
     assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_search_works_local_uses_loaded_typeahead(client, db):
+    composer = Composer(name="Typeahead Composer", is_verified=True)
+    db.add(composer)
+    await db.commit()
+    db.add(Work(title="Sonata in B minor", composer_id=composer.id, is_verified=True))
+    await db.commit()
+    await TypeaheadService.load(db)
+
+    response = await client.get(f"/api/works/search?q=sonat&composer_id={composer.id}")
+
+    assert response.status_code == 200
+    assert [w["title"] for w in response.json()] == ["Sonata in B minor"]
+
+
+async def test_search_works_openopus_falls_back_to_local_while_unavailable(client, db):
+    composer = Composer(name="Johann Sebastian Bach", openopus_id="87", is_verified=True)
+    db.add(composer)
+    await db.commit()
+    db.add(Work(title="Goldberg Variations", composer_id=composer.id, is_verified=True))
+    await db.commit()
+
+    registry = HttpClientRegistry(
+        transport=httpx.MockTransport(lambda request: httpx.Response(503))
+    )
+    with patch("app.services.openopus.http_clients", registry):
+        response = await client.get("/api/works/search?q=goldberg&source=openopus&composer_id=87")
+
+    assert response.status_code == 200
+    assert [(w["title"], w["composer_id"]) for w in response.json()] == [
+        ("Goldberg Variations", composer.id)
+    ]
+    await registry.aclose()
+
+
+async def test_search_works_openopus_answers_from_imported_mirror(client, db):
+    composer = Composer(
+        name="Johann Sebastian Bach",
+        openopus_id="87",
+        is_verified=True,
+        catalogue_imported_at=datetime.now(timezone.utc),
+    )
+    db.add(composer)
+    await db.commit()
+    db.add(Work(title="Goldberg Variations", openopus_id="4001", composer_id=composer.id))
+    await db.commit()
+
+    with patch("app.services.openopus.search_work", new_callable=AsyncMock) as mock_search:
+        response = await client.get("/api/works/search?q=goldberg&source=openopus&composer_id=87")
+
+    assert response.status_code == 200
+    assert [w["openopus_id"] for w in response.json()] == ["4001"]
+    mock_search.assert_not_called()
+
+
+async def test_search_works_openopus_ignores_single_user_submitted_work(client, db):
+    # Linked by seed_popular, no catalogue import: one user picked a work from OpenOpus.
+    composer = Composer(name="Johann Sebastian Bach", openopus_id="87", is_verified=True)
+    db.add(composer)
+    await db.commit()
+    db.add(Work(title="Goldberg Variations", openopus_id="4001", composer_id=composer.id))
+    await db.commit()
+    remote = [{"title": "Mass in B minor", "id": "4002"}]
+
+    with patch("app.services.openopus.search_work", new_callable=AsyncMock) as mock_search:
+        mock_search.return_value = remote
+        response = await client.get("/api/works/search?q=mass&source=openopus&composer_id=87")
+
+    assert response.status_code == 200
+    assert response.json() == remote
+    mock_search.assert_called_once_with("mass", composer_id="87")
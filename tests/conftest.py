@@ -1,13 +1,23 @@
+from unittest.mock import patch
+
 import pytest
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from app.core.limiter import limiter
+from app.core.security import clear_token_memo
 from app.db.base import Base  # Ensure this import is correct based on checking file
-from app.db.session import get_db
+from app.db.session import get_read_db, get_write_db
 from app.main import app as fastapi_app
+from app.services.identity_service import IdentityService
+from app.services.live_update_service import LiveUpdateService
+from app.services.openopus import WorkCatalogueCache
+from app.services.page_cache_service import PageCacheService
 from app.services.reference_data_service import ReferenceDataService
+from app.services.sitemap_service import SitemapService
+from app.services.typeahead_service import TypeaheadService
+from app.services.wikidata import WikidataCache
 
 
 @pytest.fixture(autouse=True)
@@ -29,6 +39,54 @@ def _reset_reference_data_cache():
     yield
 
 
+@pytest.fixture(autouse=True)
+def _reset_page_cache():
+    # Anonymous page renders are cached by URL; tests reuse the same slugs/years with
+    # fresh data, so a page cached by one test must not be served to the next.
+    PageCacheService.reset_cache()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def _reset_typeahead_index():
+    # The typeahead index is process-global; tests that load it must not leak their
+    # catalogue (or a loaded index at all) into tests expecting the FTS fallback.
+    TypeaheadService.reset_cache()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def _reset_openopus_catalogues():
+    # OpenOpus catalogues are cached per composer id; tests mock different catalogues
+    # for the same ids.
+    WorkCatalogueCache.reset_cache()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def _reset_sitemaps():
+    # Rendered sitemaps are kept until an event changes; tests rebuild the data each time.
+    SitemapService.reset_cache()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def _reset_identities():
+    # Signed-in users and verified tokens are cached per process; tests recreate users
+    # with the same emails (and new ids) and sign tokens for them.
+    IdentityService.reset_cache()
+    clear_token_memo()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def _reset_live_updates():
+    # Subscribers and the last state sent are per process, keyed by event id; tests reuse
+    # ids with fresh data.
+    LiveUpdateService.reset_cache()
+    yield
+
+
 # Use in-memory SQLite for tests
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
@@ -59,11 +117,23 @@ async def db_session(prepare_database):
         # Let's try function scope for safety.
 
 
+@pytest.fixture(autouse=True)
+def _reset_wikidata_cache(prepare_database):
+    # Lookups are cached in-process by query/id, and tests mock different Wikidata answers
+    # for the same ones. The table tier goes to the test database (wiped by ``db``) rather
+    # than the app engine, whose in-memory database has no tables.
+    WikidataCache.reset_cache()
+    with patch.object(WikidataCache, "session_factory", TestingSessionLocal):
+        yield
+
+
 @pytest.fixture(scope="function")
 async def db(prepare_database):  # Renamed to db for clarity
     async with TestingSessionLocal() as session:
         yield session
-        # Clean up tables (votes first — references reports and users)
+        # Clean up tables (snapshots and votes first — they reference reports and users)
+        await session.execute(text("DELETE FROM event_consensus"))
+        await session.execute(text("DELETE FROM user_event_participation"))
         await session.execute(text("DELETE FROM votes"))
         await session.execute(text("DELETE FROM reports"))
         await session.execute(text("DELETE FROM works"))
@@ -72,6 +142,9 @@ async def db(prepare_database):  # Renamed to db for clarity
         await session.execute(text("DELETE FROM regions"))
         await session.execute(text("DELETE FROM disciplines"))
         await session.execute(text("DELETE FROM users"))
+        await session.execute(text("DELETE FROM cache_invalidations"))
+        await session.execute(text("DELETE FROM wikidata_cache"))
+        await session.execute(text("DELETE FROM app_metadata"))
         await session.commit()
 
 
@@ -80,7 +153,9 @@ async def client(db):
     async def override_get_db():
         yield db
 
-    fastapi_app.dependency_overrides[get_db] = override_get_db
+    # One session for both engines, so a test's writes are visible to the reads that follow.
+    fastapi_app.dependency_overrides[get_read_db] = override_get_db
+    fastapi_app.dependency_overrides[get_write_db] = override_get_db
     async with AsyncClient(transport=ASGITransport(app=fastapi_app), base_url="http://test") as ac:
         yield ac
     fastapi_app.dependency_overrides.clear()
@@ -0,0 +1,143 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.core.constants import Http
+from app.core.http import (
+    OPENOPUS,
+    TURNSTILE,
+    UPSTREAMS,
+    WIKIDATA,
+    HttpClientRegistry,
+    UpstreamUnavailable,
+)
+
+
+async def test_registry_reuses_one_client_per_upstream():
+    registry = HttpClientRegistry()
+
+    client = registry.get(OPENOPUS)
+
+    assert registry.get(OPENOPUS) is client
+    assert registry.get(WIKIDATA) is not client
+    await registry.aclose()
+
+
+async def test_start_builds_every_upstream_and_aclose_closes_them():
+    registry = HttpClientRegistry()
+    registry.start()
+    clients = [registry.get(name) for name in UPSTREAMS]
+
+    await registry.aclose()
+
+    assert all(client.is_closed for client in clients)
+    # Used again after shutdown (e.g. a script after its own aclose): a fresh client.
+    reopened = registry.get(TURNSTILE)
+    assert not reopened.is_closed
+    await registry.aclose()
+
+
+async def test_clients_carry_upstream_configuration():
+    registry = HttpClientRegistry()
+
+    wikidata = registry.get(WIKIDATA)
+
+    assert wikidata.headers["User-Agent"].startswith("ExamRecordbot/")
+    assert wikidata.follow_redirects
+    assert wikidata.timeout.connect == Http.CONNECT_TIMEOUT_SECONDS
+    assert wikidata.timeout.read == Http.READ_TIMEOUT_SECONDS
+    await registry.aclose()
+
+
+def _fake_upstream(handler):
+    """A registry whose clients all talk to ``handler`` instead of the network."""
+    return HttpClientRegistry(transport=httpx.MockTransport(handler))
+
+
+async def _get_json(client: httpx.AsyncClient):
+    response = await client.get("https://api.openopus.org/work/list/composer/87/genre/all.json")
+    response.raise_for_status()
+    return response.json()
+
+
+async def test_identical_inflight_calls_share_one_request():
+    hits = 0
+    release = asyncio.Event()
+
+    async def handler(request):
+        nonlocal hits
+        hits += 1
+        await release.wait()
+        return httpx.Response(200, json={"works": []})
+
+    registry = _fake_upstream(handler)
+    calls = [asyncio.create_task(registry.call(OPENOPUS, "87", _get_json)) for _ in range(5)]
+    await asyncio.sleep(0.01)
+    release.set()
+
+    results = await asyncio.gather(*calls)
+
+    assert hits == 1
+    assert results == [{"works": []}] * 5
+    await registry.aclose()
+
+
+async def test_breaker_opens_after_repeated_failures_then_recovers():
+    status = 503
+    hits = 0
+
+    async def handler(request):
+        nonlocal hits
+        hits += 1
+        return httpx.Response(status, json={})
+
+    registry = _fake_upstream(handler)
+    for _ in range(Http.BREAKER_FAILURE_THRESHOLD):
+        with pytest.raises(UpstreamUnavailable):
+            await registry.call(OPENOPUS, "87", _get_json)
+    assert registry.breaker(OPENOPUS).is_open
+
+    with pytest.raises(UpstreamUnavailable):
+        await registry.call(OPENOPUS, "87", _get_json)
+    assert hits == Http.BREAKER_FAILURE_THRESHOLD  # failed fast, upstream not called
+
+    status = 200
+    registry.breaker(OPENOPUS).opened_at = time.monotonic() - Http.BREAKER_RESET_SECONDS
+    assert await registry.call(OPENOPUS, "87", _get_json) == {}
+    assert not registry.breaker(OPENOPUS).is_open
+    await registry.aclose()
+
+
+async def test_client_errors_do_not_trip_the_breaker():
+    async def handler(request):
+        return httpx.Response(400, json={})
+
+    registry = _fake_upstream(handler)
+    for _ in range(Http.BREAKER_FAILURE_THRESHOLD + 1):
+        with pytest.raises(httpx.HTTPStatusError):
+            await registry.call(OPENOPUS, "87", _get_json)
+
+    assert not registry.breaker(OPENOPUS).is_open
+    await registry.aclose()
+
+
+async def test_calls_past_the_concurrency_cap_fail_fast():
+    release = asyncio.Event()
+
+    async def handler(request):
+        await release.wait()
+        return httpx.Response(200, json={})
+
+    registry = _fake_upstream(handler)
+    cap = UPSTREAMS[OPENOPUS].max_connections
+    busy = [asyncio.create_task(registry.call(OPENOPUS, i, _get_json)) for i in range(cap)]
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(UpstreamUnavailable):
+        await registry.call(OPENOPUS, "one too many", _get_json)
+
+    release.set()
+    await asyncio.gather(*busy)
+    await registry.aclose()
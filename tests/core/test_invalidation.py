@@ -0,0 +1,98 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.invalidation import DatabaseInvalidationBackend, InvalidationBus
+from app.models import CacheInvalidation
+
+
+def test_publish_runs_matching_local_handlers():
+    bus = InvalidationBus()
+    seen: list[str] = []
+    bus.subscribe("page:", seen.append)
+
+    bus.publish("page:event:1", "reference-data")
+
+    assert seen == ["page:event:1"]
+
+
+async def test_database_backend_relays_to_other_workers(tmp_path):
+    # Its own file database: the backends poll from background tasks, which must not
+    # share the suite's single in-memory connection.
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/bus.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(CacheInvalidation.__table__.create)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    worker_a, worker_b = InvalidationBus(), InvalidationBus()
+    seen_a: list[str] = []
+    seen_b: list[str] = []
+    worker_a.subscribe("page:", seen_a.append)
+    worker_b.subscribe("page:", seen_b.append)
+
+    await worker_a.start(DatabaseInvalidationBackend(session_factory, poll_interval=0.01))
+    await worker_b.start(DatabaseInvalidationBackend(session_factory, poll_interval=0.01))
+    try:
+        worker_a.publish("page:event:7")
+        for _ in range(500):
+            if seen_b:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await worker_a.stop()
+        await worker_b.stop()
+        await engine.dispose()
+
+    assert seen_b == ["page:event:7"]
+    # The publishing worker evicts locally once and ignores its own relayed row.
+    assert seen_a == ["page:event:7"]
+
+
+async def test_database_backend_delivers_after_prune_empties_table(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/bus.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(CacheInvalidation.__table__.create)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    publisher = DatabaseInvalidationBackend(session_factory)
+    listener = DatabaseInvalidationBackend(session_factory, poll_interval=0.01)
+    await listener.connect()
+    seen: list[str] = []
+    listening = asyncio.create_task(listener.listen("listener", seen.extend))
+
+    async def relayed(key: str) -> bool:
+        await publisher.publish([key], "publisher")
+        for _ in range(500):
+            if key in seen:
+                return True
+            await asyncio.sleep(0.01)
+        return False
+
+    try:
+        assert await relayed("page:event:1")
+        async with session_factory() as session:
+            # What the retention prune does after a quiet hour.
+            await session.execute(delete(CacheInvalidation))
+            await session.commit()
+        assert await relayed("page:event:2")
+    finally:
+        listening.cancel()
+        with suppress(asyncio.CancelledError):
+            await listening
+        await engine.dispose()
+
+
+async def test_database_backend_refuses_other_databases():
+    session = MagicMock()
+    session.get_bind.return_value.dialect.name = "postgresql"
+
+    @asynccontextmanager
+    async def session_factory():
+        yield session
+
+    with pytest.raises(RuntimeError, match="requires SQLite"):
+        await DatabaseInvalidationBackend(session_factory).connect()
@@ -0,0 +1,60 @@
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.db.session import read_database_url
+
+
+def test_sqlite_file_reopened_read_only():
+    with (
+        patch.object(settings, "DATABASE_URL", "sqlite+aiosqlite:////data/exam_record.db"),
+        patch.object(settings, "DATABASE_READ_URL", None),
+    ):
+        url = read_database_url()
+
+    assert url == "sqlite+aiosqlite:///file:/data/exam_record.db?mode=ro&uri=true"
+
+
+def test_in_memory_sqlite_shares_write_engine():
+    with (
+        patch.object(settings, "DATABASE_URL", "sqlite+aiosqlite:///:memory:"),
+        patch.object(settings, "DATABASE_READ_URL", None),
+    ):
+        assert read_database_url() is None
+
+
+def test_explicit_read_url_wins():
+    replica = "postgresql+asyncpg://reader@replica/exam_record"
+    with (
+        patch.object(settings, "DATABASE_URL", "postgresql+asyncpg://app@primary/exam_record"),
+        patch.object(settings, "DATABASE_READ_URL", replica),
+    ):
+        assert read_database_url() == replica
+
+
+async def test_read_only_engine_rejects_writes(tmp_path):
+    db_path = tmp_path / "ro.db"
+    writer = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with writer.begin() as conn:
+        await conn.execute(text("CREATE TABLE t (x INTEGER)"))
+        await conn.execute(text("INSERT INTO t VALUES (1)"))
+    await writer.dispose()
+
+    with (
+        patch.object(settings, "DATABASE_URL", f"sqlite+aiosqlite:///{db_path}"),
+        patch.object(settings, "DATABASE_READ_URL", None),
+    ):
+        read_url = read_database_url()
+    assert read_url is not None
+    reader = create_async_engine(read_url)
+    try:
+        async with reader.connect() as conn:
+            assert (await conn.execute(text("SELECT x FROM t"))).scalar() == 1
+            with pytest.raises(OperationalError, match="readonly"):
+                await conn.execute(text("INSERT INTO t VALUES (2)"))
+    finally:
+        await reader.dispose()
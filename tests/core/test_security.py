@@ -1,10 +1,18 @@
 """Unit tests for app.core.security — no DB required."""
 
+import time
 from datetime import timedelta
+from unittest.mock import patch
 
 import jwt
 
-from app.core.security import create_access_token, verify_token
+from app.core.security import (
+    SESSION_TOKEN_VERSION,
+    create_access_token,
+    create_session_token,
+    verify_token,
+)
+from app.models import User
 
 
 def test_verify_valid_token():
@@ -38,3 +46,43 @@ def test_create_token_contains_sub():
     assert payload is not None
     assert payload["role"] == "Contributor"
     assert "exp" in payload
+
+
+def test_verify_token_memoizes_repeated_tokens():
+    token = create_access_token({"sub": "memo@test.com"})
+    verify_token(token)
+
+    with patch("app.core.security.jwt.decode") as decode:
+        payload = verify_token(token)
+
+    decode.assert_not_called()
+    assert payload is not None
+    assert payload["sub"] == "memo@test.com"
+
+
+def test_memoized_token_is_verified_again_once_expired():
+    token = create_access_token({"sub": "memo@test.com"}, expires_delta=timedelta(seconds=5))
+    verify_token(token)
+
+    with (
+        patch("app.core.security.time.time", return_value=time.time() + 10),
+        patch("app.core.security.jwt.decode", side_effect=jwt.ExpiredSignatureError) as decode,
+    ):
+        assert verify_token(token) is None
+
+    decode.assert_called_once()
+
+
+def test_session_token_carries_id_role_and_generation():
+    user = User(id=7, email="s@test.com", role="Contributor", token_generation=3)
+
+    payload = verify_token(create_session_token(user))
+
+    assert payload is not None
+    assert payload["ver"] == SESSION_TOKEN_VERSION
+    assert (payload["sub"], payload["uid"], payload["role"], payload["gen"]) == (
+        "s@test.com",
+        7,
+        "Contributor",
+        3,
+    )
@@ -0,0 +1,81 @@
+import logging
+from unittest.mock import patch
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.db.session import (
+    apply_sqlite_pragmas,
+    check_sqlite_pragmas,
+    sqlite_cache_worst_case_mb,
+    sqlite_pragmas,
+)
+
+
+async def test_pragmas_applied_to_every_pooled_connection(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/profile.db")
+    apply_sqlite_pragmas(engine.sync_engine, sqlite_pragmas())
+    try:
+        async with engine.connect() as first, engine.connect() as second:
+            for conn in (first, second):
+                assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+                assert (await conn.execute(text("PRAGMA synchronous"))).scalar() == 1  # NORMAL
+                assert (await conn.execute(text("PRAGMA busy_timeout"))).scalar() == 5000
+                assert (await conn.execute(text("PRAGMA temp_store"))).scalar() == 2  # MEMORY
+    finally:
+        await engine.dispose()
+
+
+async def test_check_reports_effective_profile(tmp_path, caplog):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/profile.db")
+    apply_sqlite_pragmas(engine.sync_engine, sqlite_pragmas())
+    try:
+        with caplog.at_level(logging.WARNING, logger="uvicorn"):
+            effective = await check_sqlite_pragmas(engine)
+    finally:
+        await engine.dispose()
+
+    assert effective["journal_mode"] == "wal"
+    assert effective["cache_size"] == "-2000"
+    assert "journal_mode" not in caplog.text
+    assert "budget" not in caplog.text
+
+
+async def test_check_warns_when_wal_does_not_stick(caplog):
+    # In-memory databases can't use WAL: SQLite silently keeps journal_mode=memory.
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    apply_sqlite_pragmas(engine.sync_engine, sqlite_pragmas())
+    try:
+        with caplog.at_level(logging.WARNING, logger="uvicorn"):
+            effective = await check_sqlite_pragmas(engine)
+    finally:
+        await engine.dispose()
+
+    assert effective["journal_mode"] == "memory"
+    assert "journal_mode is memory, expected wal" in caplog.text
+
+
+async def test_check_warns_when_page_caches_exceed_the_budget(tmp_path, caplog):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/profile.db")
+    apply_sqlite_pragmas(engine.sync_engine, {**sqlite_pragmas(), "cache_size": -64000})
+    try:
+        with (
+            patch.object(settings, "WEB_CONCURRENCY", 4),
+            caplog.at_level(logging.WARNING, logger="uvicorn"),
+        ):
+            await check_sqlite_pragmas(engine)
+    finally:
+        await engine.dispose()
+
+    assert "over the 256 MB budget" in caplog.text
+
+
+def test_default_profile_fits_the_budget_with_four_workers():
+    # Production: a file database, so the read pool exists too.
+    with (
+        patch.object(settings, "WEB_CONCURRENCY", 4),
+        patch("app.db.session.read_database_url", return_value="sqlite:///file:ro"),
+    ):
+        worst_case_mb = sqlite_cache_worst_case_mb(settings.SQLITE_CACHE_SIZE)
+    assert worst_case_mb <= settings.SQLITE_CACHE_BUDGET_MB
@@ -1,30 +1,87 @@
-from unittest.mock import AsyncMock, Mock, mock_open, patch
+from contextlib import asynccontextmanager
+from unittest.mock import patch
 
 import pytest
+from sqlalchemy.future import select
 
-from scripts.import_csv import import_csv_data
+from app.models import Composer, Work
+from scripts import import_csv
 
+CSV = """composer_name,work_title,nickname,wikidata_id,openopus_id
+Ludwig van Beethoven,Piano Sonata No. 14,Moonlight Sonata,Q255,
+Johann Sebastian Bach,Brandenburg Concerto No. 1,,,
+Johann Sebastian Bach,Goldberg Variations,,,4001
+Johann Sebastian Bach,Brandenburg Concerto No. 1,,,
+,Missing composer,,,
+"""
 
-@pytest.mark.asyncio
-async def test_import_csv():
-    # Mock CSV content
-    csv_content = "composer_name,work_title\nTest Composer,Test Work\n"
 
-    with (
-        patch("builtins.open", mock_open(read_data=csv_content)),
-        patch("scripts.import_csv.AsyncSessionLocal") as mock_session_factory,
-    ):
-        mock_db = AsyncMock()
-        mock_session_factory.return_value.__aenter__.return_value = mock_db
+@pytest.fixture
+def shared_session(db):
+    # The in-memory test database lives on the fixture's connection: chunks reuse it.
+    @asynccontextmanager
+    async def session():
+        yield db
 
-        # KEY FIX: scalar_one_or_none must be a Mock, not AsyncMock (which is default child of AsyncMock)
-        # Because in the code we call it synchronously: result.scalar_one_or_none()
-        mock_result = Mock()
-        mock_result.scalar_one_or_none.side_effect = [None, None]
+    with patch.object(import_csv, "AsyncSessionLocal", session):
+        yield
 
-        mock_db.execute.return_value = mock_result
 
-        await import_csv_data()
+async def _works(db):
+    db.expire_all()
+    result = await db.execute(
+        select(Composer.name, Work.title, Work.nickname, Work.openopus_id)
+        .join(Work.composer)
+        .order_by(Work.title)
+    )
+    return result.tuples().all()
 
-        # Verify db.add called for composer and work
-        assert mock_db.add.call_count == 2
+
+async def test_import_csv(db, shared_session, tmp_path):
+    bach = Composer(name="Johann Sebastian Bach", is_verified=True)
+    db.add(bach)
+    await db.commit()
+    path = tmp_path / "works.csv"
+    path.write_text(CSV, encoding="utf-8")
+
+    written, skipped = await import_csv.import_csv_data(path, chunk_rows=2)
+
+    assert (written, skipped) == (3, 2)
+    assert await _works(db) == [
+        ("Johann Sebastian Bach", "Brandenburg Concerto No. 1", None, None),
+        ("Johann Sebastian Bach", "Goldberg Variations", None, "4001"),
+        ("Ludwig van Beethoven", "Piano Sonata No. 14", "Moonlight Sonata", None),
+    ]
+    composers = (await db.execute(select(Composer).order_by(Composer.id))).scalars().all()
+    assert [(c.name, c.wikidata_id) for c in composers] == [
+        ("Johann Sebastian Bach", None),
+        ("Ludwig van Beethoven", "Q255"),
+    ]
+    assert not (tmp_path / "works.csv.checkpoint").exists()
+
+    # Importing again writes nothing new.
+    assert await import_csv.import_csv_data(path) == (1, 4)  # the OpenOpus row is re-upserted
+    assert len(await _works(db)) == 3
+
+
+async def test_import_csv_resumes_from_checkpoint(db, shared_session, tmp_path):
+    path = tmp_path / "works.csv"
+    path.write_text(CSV, encoding="utf-8")
+    (tmp_path / "works.csv.checkpoint").write_text("2")
+
+    await import_csv.import_csv_data(path)
+
+    assert [title for _, title, _, _ in await _works(db)] == [
+        "Brandenburg Concerto No. 1",
+        "Goldberg Variations",
+    ]
+
+
+async def test_import_csv_dry_run_writes_nothing(db, shared_session, tmp_path):
+    path = tmp_path / "works.csv"
+    path.write_text(CSV, encoding="utf-8")
+
+    assert await import_csv.import_csv_data(path, dry_run=True) == (3, 2)
+
+    assert await _works(db) == []
+    assert (await db.execute(select(Composer))).first() is None
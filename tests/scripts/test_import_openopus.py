@@ -0,0 +1,87 @@
+import io
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+
+from sqlalchemy.future import select
+
+from app.models import Composer, Work
+from scripts import import_openopus
+
+DUMP = {
+    "status": {"success": "true"},
+    "composers": [
+        {
+            "id": "87",
+            "name": "Bach",
+            "complete_name": "Johann Sebastian Bach",
+            "works": [
+                {"id": "4001", "title": "Goldberg Variations", "subtitle": "BWV 988"},
+                {"id": "4002", "title": "Mass in B minor"},
+            ],
+        },
+        {
+            "id": "145",
+            "name": "Beethoven",
+            "complete_name": "Ludwig van Beethoven",
+            "works": [{"id": "5001", "title": "Piano Sonata no. 14"}],
+        },
+    ],
+}
+
+
+def test_iter_array_items_streams_across_chunk_boundaries():
+    text = json.dumps(DUMP, indent=2)
+    with patch.object(import_openopus, "READ_CHUNK", 7):
+        items = list(import_openopus.iter_array_items(io.StringIO(text), "composers"))
+
+    assert items == DUMP["composers"]
+
+
+async def test_import_upserts_on_openopus_id_and_adopts_existing_rows(db, tmp_path):
+    # Created earlier by a user (no OpenOpus link yet): must be linked, not duplicated.
+    bach = Composer(name="Johann Sebastian Bach", is_verified=False)
+    db.add(bach)
+    await db.commit()
+    db.add(Work(title="Mass in B minor", composer_id=bach.id, is_verified=False))
+    await db.commit()
+
+    dump = tmp_path / "dump.json"
+    dump.write_text(json.dumps(DUMP), encoding="utf-8")
+
+    # The in-memory test database lives on the fixture's connection: batches reuse it.
+    @asynccontextmanager
+    async def session():
+        yield db
+
+    with patch.object(import_openopus, "AsyncSessionLocal", session):
+        await import_openopus.import_openopus(dump)
+        await import_openopus.import_openopus(dump)  # idempotent
+    db.expire_all()  # the upserts bypass the ORM; reload ``bach``
+
+    composers = (await db.execute(select(Composer).order_by(Composer.openopus_id))).scalars()
+    assert [
+        (c.id == bach.id, c.openopus_id, c.is_verified, c.catalogue_imported_at is not None)
+        for c in composers
+    ] == [
+        (False, "145", True, True),
+        (True, "87", True, True),
+    ]
+    works = (await db.execute(select(Work).order_by(Work.openopus_id))).scalars().all()
+    assert [(w.openopus_id, w.title, w.nickname) for w in works] == [
+        ("4001", "Goldberg Variations", "BWV 988"),
+        ("4002", "Mass in B minor", None),
+        ("5001", "Piano Sonata no. 14", None),
+    ]
+
+
+def test_iter_composers_reads_a_directory_of_saved_responses(tmp_path):
+    (tmp_path / "87.json").write_text(
+        json.dumps({"composer": {"id": "87", "name": "Bach"}, "works": [{"id": "4001"}]}),
+        encoding="utf-8",
+    )
+    (tmp_path / "dump.json").write_text(json.dumps({"composers": DUMP["composers"][1:]}))
+
+    composers = list(import_openopus.iter_composers(tmp_path))
+
+    assert [(c["id"], len(c["works"])) for c in composers] == [("87", 1), ("145", 1)]
@@ -0,0 +1,44 @@
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.future import select
+
+from app.models import AppMetadata, Discipline, ExamEvent, Region
+from scripts import seed
+
+
+@pytest.fixture
+def shared_session(db):
+    # The in-memory test database lives on the fixture's connection: the script reuses it.
+    @asynccontextmanager
+    async def session():
+        yield db
+
+    with patch.object(seed, "AsyncSessionLocal", session):
+        yield
+
+
+async def test_seed_writes_reference_data_and_hash(db, shared_session):
+    assert await seed.seed() is True
+
+    slugs = (await db.execute(select(Discipline.slug))).scalars().all()
+    assert sorted(slugs) == sorted(d["slug"] for d in seed.INITIAL_DISCIPLINES)
+    assert len((await db.execute(select(ExamEvent))).all()) == 1
+    stored = await db.scalar(select(AppMetadata.value).filter_by(key=seed.SEED_HASH_KEY))
+    assert stored == seed.seed_hash()
+
+
+async def test_seed_skips_unchanged_lists_and_upserts_changed_ones(db, shared_session):
+    db.add(Region(name="Andalusia", slug="andalucia"))  # seeded by an older list
+    await db.commit()
+    await seed.seed()
+
+    assert await seed.seed() is False
+
+    regions = [*seed.INITIAL_REGIONS, {"name": "Galicia", "slug": "galicia"}]
+    with patch.object(seed, "INITIAL_REGIONS", regions):
+        assert await seed.seed() is True
+    db.expire_all()
+    names = (await db.execute(select(Region.name).order_by(Region.slug))).scalars().all()
+    assert names == ["Andalucía", "Comunidad de Madrid", "Comunidad Valenciana", "Galicia"]
@@ -4,6 +4,7 @@ import pytest
 
 from app.models import Composer, Discipline, ExamEvent, Region, Report, User, Vote, Work
 from app.services.exam_service import ExamService
+from app.services.report_service import ReportService
 
 # ---------------------------------------------------------------------------
 # Shared fixtures
@@ -125,6 +126,7 @@ async def test_get_exam_context_with_votes(db, region, discipline, event, user,
     db.add(vote1)
     db.add(vote2)
     await db.commit()
+    await ReportService.recompute_vote_counters(db)
 
     ctx = await ExamService.get_exam_context(
         db,
@@ -207,6 +209,7 @@ async def test_get_discipline_context_has_data(db, region, discipline, event, co
     vote = Vote(user_id=user.id, report_id=report.id)
     db.add(vote)
     await db.commit()
+    await ReportService.recompute_vote_counters(db)
 
     ctx = await ExamService.get_discipline_context(
         db,
@@ -243,6 +246,7 @@ async def test_get_discipline_context_badge_neutral_single_source(
 
     db.add(Vote(user_id=user1.id, report_id=report1.id))
     await db.commit()
+    await ReportService.recompute_vote_counters(db)
 
     ctx = await ExamService.get_discipline_context(
         db,
@@ -294,6 +298,7 @@ async def test_get_discipline_context_badge_disputed(
     db.add(Vote(user_id=user1.id, report_id=report1.id))
     db.add(Vote(user_id=user2.id, report_id=report2.id))
     await db.commit()
+    await ReportService.recompute_vote_counters(db)
 
     ctx = await ExamService.get_discipline_context(
         db,
@@ -352,6 +357,7 @@ async def test_get_discipline_context_badge_verified(
     db.add(Vote(user_id=users[2].id, report_id=report1.id))
     db.add(Vote(user_id=users[2].id, report_id=report2.id))
     await db.commit()
+    await ReportService.recompute_vote_counters(db)
 
     ctx = await ExamService.get_discipline_context(
         db,
@@ -367,6 +373,35 @@ async def test_get_discipline_context_badge_verified(
     assert year_entry["badge_status"] == "verified"
 
 
+async def test_get_discipline_context_best_work_from_snapshot(
+    db, region, discipline, event, user, composer_and_work
+):
+    _, work = composer_and_work
+    report = Report(user_id=user.id, event_id=event.id, work_id=work.id, is_flagged=False)
+    db.add(report)
+    await db.commit()
+    await db.refresh(report)
+
+    # cast_vote keeps the EventConsensus snapshot current — no repair needed.
+    await ReportService.cast_vote(db, user.id, report)
+
+    ctx = await ExamService.get_discipline_context(
+        db,
+        region_slug=region.slug,
+        discipline_slug=discipline.slug,
+        cursor=None,
+        sparse_mode=True,
+        current_user=None,
+    )
+    assert ctx is not None
+    year_entry = next((y for y in ctx["years"] if y["year"] == event.year), None)
+    assert year_entry is not None
+    assert year_entry["best_work"]["title"] == "ES Work"
+    assert year_entry["best_work"]["composer"] == "ES Composer"
+    assert year_entry["best_work"]["is_verified"] is False
+    assert year_entry["badge_status"] == "neutral"
+
+
 async def test_get_discipline_context_cursor_pagination(db, region, discipline):
     """cursor filters out years >= cursor value."""
     # Create two events
@@ -0,0 +1,69 @@
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.core.security import create_session_token, verify_token
+from app.models import User
+from app.services.identity_service import IdentityService
+
+
+@pytest.fixture
+async def user(db):
+    user = User(email="identity@test.com", role="Visitor")
+    db.add(user)
+    await db.commit()
+    return user
+
+
+def claims(user: User) -> dict:
+    payload = verify_token(create_session_token(user))
+    assert payload is not None
+    return payload
+
+
+async def test_resolve_caches_identity_across_requests(db, user):
+    first = await IdentityService.resolve(db, claims(user))
+    with patch.object(db, "execute") as execute:
+        second = await IdentityService.resolve(db, claims(user))
+
+    execute.assert_not_called()
+    assert second == first
+    assert first is not None
+    assert (first.id, first.email, first.role) == (user.id, "identity@test.com", "Visitor")
+
+
+async def test_resolve_accepts_old_format_tokens(db, user):
+    old_claims = {"sub": user.email, "role": user.role, "exp": time.time() + 3600}
+
+    identity = await IdentityService.resolve(db, old_claims)
+
+    assert identity is not None
+    assert identity.id == user.id
+
+
+async def test_resolve_rejects_unknown_users_and_mismatched_ids(db, user):
+    assert await IdentityService.resolve(db, {"sub": "nobody@test.com", "exp": time.time()}) is None
+    forged = {**claims(user), "sub": "someone-else@test.com"}
+    assert await IdentityService.resolve(db, forged) is None
+
+
+async def test_cached_identity_never_outlives_the_token(db, user):
+    await IdentityService.resolve(db, {**claims(user), "exp": time.time() - 1})
+
+    with patch.object(db, "execute", wraps=db.execute) as execute:
+        await IdentityService.resolve(db, claims(user))
+
+    execute.assert_called_once()
+
+
+async def test_revoke_tokens_rejects_tokens_issued_before(db, user):
+    old_claims = {"sub": user.email, "role": user.role, "exp": time.time() + 3600}
+    issued = claims(user)
+    assert await IdentityService.resolve(db, issued) is not None
+
+    await IdentityService.revoke_tokens(db, user)
+
+    assert await IdentityService.resolve(db, issued) is None
+    assert await IdentityService.resolve(db, old_claims) is None
+    assert await IdentityService.resolve(db, claims(user)) is not None
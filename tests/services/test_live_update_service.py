@@ -0,0 +1,152 @@
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.core.constants import LiveUpdates
+from app.core.invalidation import DatabaseInvalidationBackend, InvalidationBus, invalidation_bus
+from app.models import (
+    CacheInvalidation,
+    Composer,
+    Discipline,
+    ExamEvent,
+    Region,
+    Report,
+    User,
+    Work,
+)
+from app.services.live_update_service import LiveUpdateService
+from app.services.page_cache_service import EVENT_PAGE_KEY_PREFIX
+from app.services.report_service import ReportService
+
+
+@pytest.fixture
+async def reports(db):
+    region = Region(name="Live Region", slug="live-region")
+    discipline = Discipline(name="Live Discipline", slug="live-discipline")
+    composer = Composer(name="Live Composer", is_verified=True)
+    db.add_all([region, discipline, composer])
+    await db.commit()
+
+    event = ExamEvent(year=2025, region_id=region.id, discipline_id=discipline.id)
+    works = [Work(title=f"Live Work {i}", composer_id=composer.id) for i in range(2)]
+    author = User(email="live-author@test.com")
+    db.add_all([event, *works, author])
+    await db.commit()
+
+    reports = [Report(user_id=author.id, event_id=event.id, work_id=w.id) for w in works]
+    db.add_all(reports)
+    await db.commit()
+    return reports
+
+
+async def vote(db, report, email):
+    voter = User(email=email)
+    db.add(voter)
+    await db.commit()
+    await ReportService.cast_vote(db, voter.id, report)
+
+
+def parse(message):
+    assert message.startswith("event: consensus\ndata: ")
+    return json.loads(message.removeprefix("event: consensus\ndata: "))
+
+
+def test_subscriber_cap_is_each_workers_share_of_the_memory_budget():
+    with patch.object(settings, "WEB_CONCURRENCY", 4):
+        per_worker = LiveUpdateService.max_subscribers()
+
+    assert 1000 <= per_worker <= 2000
+    assert per_worker * 4 * LiveUpdates.STREAM_MEMORY_KB <= (
+        settings.LIVE_UPDATES_MEMORY_BUDGET_MB * 1024
+    )
+
+
+async def test_stream_sends_full_state_then_only_changes(db, reports):
+    first, second = reports
+    stream = LiveUpdateService.stream(first.event_id)
+    assert await anext(stream) == "retry: 5000\n\n"
+
+    await vote(db, first, "live-1@test.com")
+    await LiveUpdateService.flush(db)
+    delta = parse(await anext(stream))
+    assert delta["total_votes"] == 1
+    assert delta["event_status"] == "neutral"
+    assert delta["reports"] == {
+        str(first.id): {"votes": 1, "percentage": 100, "status": "neutral", "flagged": False},
+        str(second.id): {"votes": 0, "percentage": 0, "status": "neutral", "flagged": False},
+    }
+
+    await vote(db, second, "live-2@test.com")
+    await LiveUpdateService.flush(db)
+    delta = parse(await anext(stream))
+    assert delta["event_status"] == "disputed"
+    assert set(delta["reports"]) == {str(first.id), str(second.id)}  # both percentages moved
+
+    await ReportService.set_flagged(db, second)
+    await LiveUpdateService.flush(db)
+    delta = parse(await anext(stream))
+    assert delta["reports"] == {
+        str(second.id): {"votes": 1, "percentage": 50, "status": "neutral", "flagged": True}
+    }
+    await stream.aclose()
+
+
+async def test_burst_is_coalesced_into_one_query_and_message(db, reports):
+    first, _ = reports
+    stream = LiveUpdateService.stream(first.event_id)
+    await anext(stream)
+
+    for i in range(3):
+        await vote(db, first, f"burst-{i}@test.com")
+        await LiveUpdateService.flush(db)  # the client hasn't read anything yet
+    delta = parse(await anext(stream))
+    assert delta["total_votes"] == 3
+    assert delta["reports"][str(first.id)]["votes"] == 3
+    await stream.aclose()
+
+
+async def test_closed_stream_drops_its_event(db, reports):
+    first, _ = reports
+    stream = LiveUpdateService.stream(first.event_id)
+    await anext(stream)
+    await vote(db, first, "leaving@test.com")
+    await LiveUpdateService.flush(db)
+    await stream.aclose()
+
+    assert not LiveUpdateService.is_full()
+    assert LiveUpdateService._subscriber_count == 0
+    assert first.event_id not in LiveUpdateService._state
+    await vote(db, reports[1], "unwatched@test.com")
+    assert first.event_id not in LiveUpdateService._dirty
+
+
+async def test_vote_on_another_worker_marks_the_event_dirty(tmp_path):
+    # Its own file database, like the bus tests: the poller runs in a background task.
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/bus.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(CacheInvalidation.__table__.create)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    other_worker = InvalidationBus()
+    await invalidation_bus.start(DatabaseInvalidationBackend(session_factory, poll_interval=0.01))
+    await other_worker.start(DatabaseInvalidationBackend(session_factory, poll_interval=0.01))
+    stream = LiveUpdateService.stream(42)
+    dirty = False
+    try:
+        await anext(stream)
+        other_worker.publish(EVENT_PAGE_KEY_PREFIX + "42")
+        for _ in range(500):
+            if dirty := 42 in LiveUpdateService._dirty:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await stream.aclose()
+        await other_worker.stop()
+        await invalidation_bus.stop()
+        await engine.dispose()
+
+    assert dirty
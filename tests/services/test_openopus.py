@@ -1,7 +1,11 @@
+import asyncio
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.core.config import settings
+from app.core.constants import Cache
 from app.services import openopus
 
 
@@ -12,9 +16,9 @@ async def test_get_popular_composers():
         "composers": [{"name": "Bach", "id": "87"}, {"name": "Mozart", "id": "140"}],
     }
 
-    with patch("app.services.openopus.httpx.AsyncClient") as mock_client_cls:
+    with patch("app.services.openopus.http_clients.get") as mock_get:
         mock_client = AsyncMock()
-        mock_client_cls.return_value.__aenter__.return_value = mock_client
+        mock_get.return_value = mock_client
 
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -40,9 +44,9 @@ async def test_search_work():
         ],
     }
 
-    with patch("app.services.openopus.httpx.AsyncClient") as mock_client_cls:
+    with patch("app.services.openopus.http_clients.get") as mock_get:
         mock_client = AsyncMock()
-        mock_client_cls.return_value.__aenter__.return_value = mock_client
+        mock_get.return_value = mock_client
 
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -60,3 +64,77 @@ async def test_search_work():
         # Verify it filters correctly
         results_empty = await openopus.search_work("NonExistent", composer_id="145")
         assert len(results_empty) == 0
+
+
+def _catalogue_response(works):
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = {"status": "success", "works": works}
+    response.raise_for_status = lambda: None
+    return response
+
+
+async def test_search_work_reuses_cached_catalogue_and_folds_accents():
+    works = [
+        {"title": "Rusalka, Op. 114", "id": "1", "nickname": "Píseň měsíčku"},
+        {"title": "Symphony No. 9", "id": "2", "nickname": "From the New World"},
+    ]
+    with patch("app.services.openopus.http_clients.get") as mock_get:
+        mock_client = AsyncMock()
+        mock_get.return_value = mock_client
+        mock_client.get.return_value = _catalogue_response(works)
+
+        first = await openopus.search_work("pisen", composer_id="100")
+        second = await openopus.search_work("NEW WORLD", composer_id="100")
+
+    assert [w["openopus_id"] for w in first] == ["1"]
+    assert [w["openopus_id"] for w in second] == ["2"]
+    assert mock_client.get.await_count == 1
+
+
+async def test_stale_catalogue_is_served_while_refreshing():
+    old = openopus.build_catalogue(
+        [{"title": "Old Sonata", "id": "1", "nickname": ""}],
+        time.time() - Cache.OPENOPUS_CATALOGUE_TTL_SECONDS - 60,
+    )
+    openopus.WorkCatalogueCache._catalogues["100"] = old
+
+    with patch("app.services.openopus.http_clients.get") as mock_get:
+        mock_client = AsyncMock()
+        mock_get.return_value = mock_client
+        mock_client.get.return_value = _catalogue_response(
+            [{"title": "New Sonata", "id": "2", "nickname": ""}]
+        )
+
+        served = await openopus.search_work("sonata", composer_id="100")
+        await asyncio.gather(*openopus.WorkCatalogueCache._refreshes.values())
+        refreshed = await openopus.search_work("sonata", composer_id="100")
+
+    assert [w["title"] for w in served] == ["Old Sonata"]
+    assert [w["title"] for w in refreshed] == ["New Sonata"]
+
+
+async def test_catalogue_survives_restart_through_disk_store(tmp_path):
+    with (
+        patch.object(settings, "OPENOPUS_CACHE_DIR", str(tmp_path)),
+        patch("app.services.openopus.http_clients.get") as mock_get,
+    ):
+        mock_client = AsyncMock()
+        mock_get.return_value = mock_client
+        mock_client.get.return_value = _catalogue_response(
+            [{"title": "Goldberg Variations", "id": "7", "nickname": ""}]
+        )
+        await openopus.search_work("goldberg", composer_id="87")
+
+        openopus.WorkCatalogueCache.reset_cache()  # a restarted worker
+        results = await openopus.search_work("goldberg", composer_id="87")
+
+    assert [w["openopus_id"] for w in results] == ["7"]
+    assert mock_client.get.await_count == 1
+    assert (tmp_path / "works_87.json").exists()
+
+
+async def test_search_work_punctuation_only_query_matches_nothing():
+    with patch("app.services.openopus.http_clients.get") as mock_get:
+        assert await openopus.search_work("!!", composer_id="100") == []
+    mock_get.assert_not_called()
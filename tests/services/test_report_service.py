@@ -7,9 +7,21 @@ from fastapi import HTTPException
 from sqlalchemy.future import select
 
 from app.core import config as app_config
-from app.models import Composer, Discipline, ExamEvent, Region, Report, User, Vote, Work
+from app.models import (
+    Composer,
+    Discipline,
+    EventConsensus,
+    ExamEvent,
+    Region,
+    Report,
+    User,
+    UserEventParticipation,
+    Vote,
+    Work,
+)
 from app.schemas.report import ComposerInput, ReportCreate, ScopeEnum, WorkInput
 from app.services.report_service import ReportService
+from app.services.wikidata import WikidataEntity
 
 # ---------------------------------------------------------------------------
 # Shared fixtures
@@ -74,9 +86,9 @@ async def test_verify_turnstile_failure_raises():
     mock_response = MagicMock()
     mock_response.json.return_value = {"success": False}
 
-    with patch("httpx.AsyncClient") as MockClient:
+    with patch("app.services.report_service.http_clients.get") as mock_get:
         mock_instance = AsyncMock()
-        MockClient.return_value.__aenter__.return_value = mock_instance
+        mock_get.return_value = mock_instance
         mock_instance.post.return_value = mock_response
 
         with pytest.raises(HTTPException) as exc_info:
@@ -88,9 +100,9 @@ async def test_verify_turnstile_success():
     mock_response = MagicMock()
     mock_response.json.return_value = {"success": True}
 
-    with patch("httpx.AsyncClient") as MockClient:
+    with patch("app.services.report_service.http_clients.get") as mock_get:
         mock_instance = AsyncMock()
-        MockClient.return_value.__aenter__.return_value = mock_instance
+        mock_get.return_value = mock_instance
         mock_instance.post.return_value = mock_response
 
         # Should not raise
@@ -130,7 +142,15 @@ async def test_get_or_create_composer_by_wikidata_id_existing(db):
 async def test_get_or_create_composer_by_wikidata_id_new(db):
     with patch(
         "app.services.report_service.wikidata.get_composer_by_id",
-        new=AsyncMock(return_value={"name": "Johann Bach"}),
+        new=AsyncMock(
+            return_value=WikidataEntity(
+                wikidata_id="Q999",
+                name="Johann Bach",
+                birth_year=None,
+                death_year=None,
+                occupation_ids=(),
+            )
+        ),
     ):
         data = ComposerInput(wikidata_id="Q999")
         result = await ReportService.get_or_create_composer(db, data)
@@ -236,6 +256,10 @@ async def test_submit_report_happy_path(db, user, event, composer, work):
     assert vote is not None
     assert vote.user_id == user.id
 
+    assert report.vote_count == 1
+    await db.refresh(event)
+    assert event.total_votes == 1
+
 
 async def test_submit_report_event_not_found(db, user, composer, work):
     report_in = ReportCreate(
@@ -326,6 +350,118 @@ async def test_cast_vote_creates_vote_record(db, user, event, composer, work):
     assert vote is not None
 
 
+async def test_cast_vote_increments_counters(db, user, event, composer, work):
+    other = User(email="counter-voter@test.com")
+    db.add(other)
+    await db.commit()
+    await db.refresh(other)
+
+    report = Report(user_id=other.id, event_id=event.id, work_id=work.id, is_flagged=False)
+    db.add(report)
+    await db.commit()
+    await db.refresh(report)
+
+    await ReportService.cast_vote(db, other.id, report)
+    await ReportService.cast_vote(db, user.id, report)
+
+    await db.refresh(report)
+    await db.refresh(event)
+    assert report.vote_count == 2
+    assert event.total_votes == 2
+
+
+async def test_cast_vote_refreshes_event_snapshot(db, user, event, composer, work):
+    other = User(email="snapshot-voter@test.com")
+    db.add(other)
+    await db.commit()
+    await db.refresh(other)
+
+    report = Report(user_id=other.id, event_id=event.id, work_id=work.id, is_flagged=False)
+    db.add(report)
+    await db.commit()
+    await db.refresh(report)
+
+    await ReportService.cast_vote(db, other.id, report)
+    snapshot = await db.get(EventConsensus, event.id)
+    assert snapshot is not None
+    assert snapshot.event_status == "neutral"
+    assert snapshot.top_report_id == report.id
+
+    await ReportService.cast_vote(db, user.id, report)
+    await db.refresh(snapshot)
+    assert snapshot.total_votes == 2
+    assert snapshot.report_count == 1
+    assert snapshot.top_percentage == 100
+    assert snapshot.has_verified is True
+    assert snapshot.event_status == "resolved"
+
+
+async def test_cast_vote_rejects_second_vote_in_event(db, user, event, composer, work):
+    other = User(email="twice-voter@test.com")
+    db.add(other)
+    await db.commit()
+    report = Report(user_id=other.id, event_id=event.id, work_id=work.id, is_flagged=False)
+    db.add(report)
+    await db.commit()
+    report_id, event_id, user_id = report.id, event.id, user.id
+
+    await ReportService.cast_vote(db, user_id, report)
+    with pytest.raises(HTTPException) as exc_info:
+        await ReportService.cast_vote(db, user_id, report)
+    assert exc_info.value.status_code == 400
+
+    refreshed = await db.get(Report, report_id)
+    assert refreshed is not None
+    assert refreshed.vote_count == 1
+    votes = await db.execute(select(Vote).filter(Vote.report_id == report_id))
+    assert len(votes.scalars().all()) == 1
+    assert await db.get(UserEventParticipation, (user_id, event_id)) is not None
+
+
+async def test_cast_vote_rejected_when_participation_written_elsewhere(
+    db, user, event, composer, work
+):
+    # Simulates a racing request in another worker that committed first: no pre-read
+    # sees it, the insert itself has to fail.
+    report = Report(user_id=user.id, event_id=event.id, work_id=work.id, is_flagged=False)
+    db.add(report)
+    await db.commit()
+    db.add(UserEventParticipation(user_id=user.id, event_id=event.id, report_id=report.id))
+    await db.commit()
+    report_id = report.id
+
+    with pytest.raises(HTTPException) as exc_info:
+        await ReportService.cast_vote(db, user.id, report)
+    assert exc_info.value.status_code == 400
+
+    refreshed = await db.get(Report, report_id)
+    assert refreshed is not None
+    assert refreshed.vote_count == 0
+
+
+# ---------------------------------------------------------------------------
+# recompute_vote_counters
+# ---------------------------------------------------------------------------
+
+
+async def test_recompute_vote_counters_repairs_drift(db, user, event, composer, work):
+    report = Report(user_id=user.id, event_id=event.id, work_id=work.id, vote_count=7)
+    db.add(report)
+    await db.commit()
+    await db.refresh(report)
+
+    # Raw insert that bypasses ReportService, so the stored counters are now wrong.
+    db.add(Vote(user_id=user.id, report_id=report.id))
+    await db.commit()
+
+    await ReportService.recompute_vote_counters(db)
+
+    await db.refresh(report)
+    await db.refresh(event)
+    assert report.vote_count == 1
+    assert event.total_votes == 1
+
+
 # ---------------------------------------------------------------------------
 # set_flagged
 # ---------------------------------------------------------------------------
@@ -359,6 +495,7 @@ async def test_build_item_dict_structure(db, user, event, composer, work):
     vote = Vote(user_id=user.id, report_id=report.id)
     db.add(vote)
     await db.commit()
+    await ReportService.recompute_vote_counters(db)
 
     result = await db.execute(
         select(Report)
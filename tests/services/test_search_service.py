@@ -0,0 +1,83 @@
+"""Unit tests for SearchService (SQLite FTS5 index)."""
+
+import pytest
+from sqlalchemy import text
+
+from app.models import Composer, Work
+from app.services.search_service import SearchService
+
+
+@pytest.fixture
+async def catalogue(db):
+    chopin = Composer(name="Frédéric Chopin")
+    dvorak = Composer(name="Antonín Dvořák")
+    bach = Composer(name="Johann Sebastian Bach")
+    db.add_all([chopin, dvorak, bach])
+    await db.commit()
+    db.add_all(
+        [
+            Work(title="Ballade No. 1 in G minor", composer_id=chopin.id),
+            Work(title="Étude Op. 10 No. 3", nickname="Tristesse", composer_id=chopin.id),
+            Work(title="Symphony No. 9", nickname="From the New World", composer_id=dvorak.id),
+            Work(title="Humoresque", nickname="Symphony of humour", composer_id=dvorak.id),
+            Work(title="Goldberg Variations", composer_id=bach.id),
+        ]
+    )
+    await db.commit()
+    return {"chopin": chopin, "dvorak": dvorak, "bach": bach}
+
+
+def test_match_expression_quotes_every_word_as_prefix():
+    assert SearchService.match_expression('fr "chopin" OR') == '"fr"* "chopin"* "OR"*'
+    assert SearchService.match_expression("  -*  ") is None
+
+
+async def test_composer_search_ignores_accents(db, catalogue):
+    assert [c.name for c in await SearchService.search_composers(db, "frederic")] == [
+        "Frédéric Chopin"
+    ]
+    assert [c.name for c in await SearchService.search_composers(db, "Dvořák")] == [
+        "Antonín Dvořák"
+    ]
+
+
+async def test_composer_search_matches_word_prefixes(db, catalogue):
+    results = await SearchService.search_composers(db, "seb ba")
+    assert [c.name for c in results] == ["Johann Sebastian Bach"]
+
+
+async def test_work_search_covers_nickname_and_ranks_title_first(db, catalogue):
+    results = await SearchService.search_works(db, "symphony")
+    assert [w.title for w in results] == ["Symphony No. 9", "Humoresque"]
+
+    results = await SearchService.search_works(db, "tristesse")
+    assert [w.title for w in results] == ["Étude Op. 10 No. 3"]
+
+
+async def test_work_search_filters_by_composer(db, catalogue):
+    results = await SearchService.search_works(db, "no", composer_id=catalogue["chopin"].id)
+    assert {w.title for w in results} == {"Ballade No. 1 in G minor", "Étude Op. 10 No. 3"}
+
+
+async def test_triggers_follow_updates_and_deletes(db, catalogue):
+    bach = catalogue["bach"]
+    bach.name = "J. S. Bach"
+    await db.commit()
+    assert await SearchService.search_composers(db, "johann") == []
+    assert [c.name for c in await SearchService.search_composers(db, "bach")] == ["J. S. Bach"]
+
+    await db.execute(text("DELETE FROM works WHERE title = 'Goldberg Variations'"))
+    await db.commit()
+    assert await SearchService.search_works(db, "goldberg") == []
+
+
+async def test_rebuild_restores_index(db, catalogue):
+    await db.execute(text("INSERT INTO composers_fts(composers_fts) VALUES ('delete-all')"))
+    await db.commit()
+    assert await SearchService.search_composers(db, "chopin") == []
+
+    await SearchService.rebuild_index(db)
+
+    assert [c.name for c in await SearchService.search_composers(db, "chopin")] == [
+        "Frédéric Chopin"
+    ]
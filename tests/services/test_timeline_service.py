@@ -0,0 +1,65 @@
+"""Unit tests for TimelineService."""
+
+import pytest
+
+from app.models import Composer, Discipline, ExamEvent, Region, Report, User, Work
+from app.services.report_service import ReportService
+from app.services.timeline_service import TimelineService
+
+
+@pytest.fixture
+async def setup(db):
+    region = Region(name="TL Region", slug="tl-region")
+    discipline = Discipline(name="TL Discipline", slug="tl-discipline")
+    composer = Composer(name="TL Composer", is_verified=True)
+    db.add_all([region, discipline, composer])
+    await db.commit()
+
+    work_a = Work(title="TL Work A", composer_id=composer.id, is_verified=True)
+    work_b = Work(title="TL Work B", composer_id=composer.id, is_verified=True)
+    users = [User(email=f"tl{i}@test.com") for i in range(4)]
+    db.add_all([work_a, work_b, *users])
+    await db.commit()
+    return region, discipline, work_a, work_b, users
+
+
+async def test_get_years_skips_events_without_reports(db, setup):
+    region, discipline, *_ = setup
+    db.add(ExamEvent(year=2020, region_id=region.id, discipline_id=discipline.id))
+    await db.commit()
+
+    assert await TimelineService.get_years(db, region.id, discipline.id) == {}
+
+
+async def test_get_years_summarizes_each_year(db, setup):
+    region, discipline, work_a, work_b, users = setup
+    verified = ExamEvent(year=2021, region_id=region.id, discipline_id=discipline.id)
+    disputed = ExamEvent(year=2022, region_id=region.id, discipline_id=discipline.id)
+    db.add_all([verified, disputed])
+    await db.commit()
+
+    # 2021: three votes on A → verified
+    report = Report(user_id=users[0].id, event_id=verified.id, work_id=work_a.id)
+    db.add(report)
+    await db.commit()
+    for user in users[:3]:
+        await ReportService.cast_vote(db, user.id, report)
+
+    # 2022: one vote each on A and B → disputed
+    report_a = Report(user_id=users[0].id, event_id=disputed.id, work_id=work_a.id)
+    report_b = Report(user_id=users[1].id, event_id=disputed.id, work_id=work_b.id)
+    db.add_all([report_a, report_b])
+    await db.commit()
+    await ReportService.cast_vote(db, users[0].id, report_a)
+    await ReportService.cast_vote(db, users[1].id, report_b)
+
+    years = await TimelineService.get_years(db, region.id, discipline.id)
+
+    assert set(years) == {2021, 2022}
+    assert years[2021].badge_status == "verified"
+    assert years[2021].total_votes == 3
+    assert years[2021].top_work_title == "TL Work A"
+    assert years[2021].top_composer_name == "TL Composer"
+    assert years[2021].top_score_url is not None
+    assert years[2022].badge_status == "disputed"
+    assert years[2022].report_count == 2
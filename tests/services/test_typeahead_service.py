@@ -0,0 +1,124 @@
+"""Unit tests for the in-process TypeaheadService."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+
+import pytest
+
+from app.core.constants import Search
+from app.models import Composer, Work
+from app.services.typeahead_service import TypeaheadService, normalize
+
+
+@pytest.fixture
+async def catalogue(db):
+    bach = Composer(name="Johann Sebastian Bach", is_verified=True)
+    cpe = Composer(name="Carl Philipp Emanuel Bach", is_verified=False)
+    dvorak = Composer(name="Antonín Dvořák", is_verified=True)
+    db.add_all([bach, cpe, dvorak])
+    await db.commit()
+    db.add_all(
+        [
+            Work(title="Goldberg Variations", composer_id=bach.id, is_verified=True),
+            Work(title="Partita No. 2", nickname="Chaconne", composer_id=bach.id),
+            Work(title="Symphony No. 9", nickname="From the New World", composer_id=dvorak.id),
+        ]
+    )
+    await db.commit()
+    return {"bach": bach, "cpe": cpe, "dvorak": dvorak}
+
+
+def test_normalize_folds_accents_case_and_punctuation():
+    assert normalize("Dvořák, Antonín") == "dvorak antonin"
+    assert normalize("  Frédéric   CHOPIN ") == "frederic chopin"
+
+
+async def test_suggestions_are_none_until_loaded(db, catalogue):
+    assert await TypeaheadService.suggest_composers(db, "bach") is None
+
+
+async def test_composer_prefixes_match_any_word(db, catalogue):
+    await TypeaheadService.load(db)
+
+    names = [c.name for c in TypeaheadService.match_composers("dvor", 10)]
+    assert names == ["Antonín Dvořák"]
+    names = [c.name for c in TypeaheadService.match_composers("seb ba", 10)]
+    assert names == ["Johann Sebastian Bach"]
+
+
+async def test_composer_ranking_prefers_verified(db, catalogue):
+    await TypeaheadService.load(db)
+
+    names = [c.name for c in TypeaheadService.match_composers("bach", 10)]
+    assert names == ["Johann Sebastian Bach", "Carl Philipp Emanuel Bach"]
+    assert len(TypeaheadService.match_composers("bach", 1)) == 1
+    # Short prefixes are served from the precomputed top-k lists, same ranking.
+    names = [c.name for c in TypeaheadService.match_composers("ba", 10)]
+    assert names == ["Johann Sebastian Bach", "Carl Philipp Emanuel Bach"]
+
+
+async def test_works_scoped_to_composer_and_match_nickname(db, catalogue):
+    await TypeaheadService.load(db)
+    bach_id = catalogue["bach"].id
+
+    assert [w.title for w in TypeaheadService.match_works("chac", bach_id, 10)] == ["Partita No. 2"]
+    assert TypeaheadService.match_works("symph", bach_id, 10) == []
+
+
+async def test_new_rows_picked_up_after_invalidate(db, catalogue):
+    await TypeaheadService.load(db)
+    db.add(Composer(name="Béla Bartók", is_verified=True))
+    await db.commit()
+
+    assert await TypeaheadService.suggest_composers(db, "bartok") == []
+
+    TypeaheadService.invalidate()
+    suggestions = await TypeaheadService.suggest_composers(db, "bartok")
+    assert suggestions is not None
+    assert [c.name for c in suggestions] == ["Béla Bartók"]
+    names = [c.name for c in TypeaheadService.match_composers("ba", 10)]
+    assert names == ["Béla Bartók", "Johann Sebastian Bach", "Carl Philipp Emanuel Bach"]
+
+
+async def test_index_not_built_past_entry_cap(db, catalogue):
+    with patch.object(Search, "TYPEAHEAD_MAX_ENTRIES", 3):
+        await TypeaheadService.load(db)
+
+    assert await TypeaheadService.suggest_composers(db, "bach") is None
+
+
+async def test_reload_swaps_in_renames_and_deletions(db, catalogue):
+    await TypeaheadService.load(db)
+    catalogue["dvorak"].name = "Antonín Leopold Dvořák"
+    await db.delete(catalogue["cpe"])
+    await db.commit()
+
+    await TypeaheadService.load(db)
+
+    assert [c.name for c in TypeaheadService.match_composers("leopold", 10)] == [
+        "Antonín Leopold Dvořák"
+    ]
+    assert [c.name for c in TypeaheadService.match_composers("bach", 10)] == [
+        "Johann Sebastian Bach"
+    ]
+
+
+async def test_started_loader_builds_in_the_background(db, catalogue):
+    @asynccontextmanager
+    async def session_factory():
+        yield db  # the in-memory database is per connection
+
+    TypeaheadService.start(session_factory)
+    try:
+        assert await TypeaheadService.suggest_composers(db, "bach") is None  # not built yet
+        for _ in range(100):
+            if TypeaheadService._loaded:
+                break
+            await asyncio.sleep(0.01)
+        suggestions = await TypeaheadService.suggest_composers(db, "dvo")
+    finally:
+        await TypeaheadService.stop()
+
+    assert suggestions is not None
+    assert [c.name for c in suggestions] == ["Antonín Dvořák"]
@@ -0,0 +1,199 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.future import select
+
+from app.api import deps
+from app.core.constants import VoteQueue
+from app.models import (
+    Composer,
+    Discipline,
+    EventConsensus,
+    ExamEvent,
+    Region,
+    Report,
+    User,
+    Vote,
+    Work,
+)
+from app.services.report_service import ReportService
+from app.services.vote_queue_service import VoteQueueService
+
+
+@asynccontextmanager
+async def running_queue(db, locked: int = 0) -> AsyncIterator[list[int]]:
+    """Run the write-behind queue (on the test's own loop, unlike fixtures), writing
+    through the test session; yields the size of each batch write attempted. The first
+    ``locked`` attempts fail as if another worker held the write lock."""
+    sizes: list[int] = []
+
+    @asynccontextmanager
+    async def session_factory():
+        yield db  # the in-memory database is per connection
+
+    async def write(db, votes):
+        sizes.append(len(votes))
+        if len(sizes) <= locked:
+            raise OperationalError("INSERT", {}, Exception("database is locked"))
+        await ReportService.write_vote_batch(db, votes)
+
+    VoteQueueService.start(session_factory, write)
+    try:
+        yield sizes
+    finally:
+        await VoteQueueService.stop()
+
+
+@pytest.fixture
+async def reports(db):
+    region = Region(name="Queue Region", slug="queue-region")
+    discipline = Discipline(name="Queue Discipline", slug="queue-discipline")
+    composer = Composer(name="Queue Composer", is_verified=True)
+    db.add_all([region, discipline, composer])
+    await db.commit()
+
+    event = ExamEvent(year=2025, region_id=region.id, discipline_id=discipline.id)
+    works = [Work(title=f"Queue Work {i}", composer_id=composer.id) for i in range(2)]
+    author = User(email="queue-author@test.com")
+    db.add_all([event, *works, author])
+    await db.commit()
+
+    reports = [Report(user_id=author.id, event_id=event.id, work_id=w.id) for w in works]
+    db.add_all(reports)
+    await db.commit()
+    return reports
+
+
+async def voters(db, count):
+    users = [User(email=f"queued-{i}@test.com") for i in range(count)]
+    db.add_all(users)
+    await db.commit()
+    return [u.id for u in users]
+
+
+async def test_burst_is_written_in_one_batch(db, reports):
+    first, second = reports
+    alice, bob, carol = await voters(db, 3)
+    votes = [(alice, first), (bob, first), (carol, second), (alice, second)]
+
+    async with running_queue(db) as batches:
+        results = await asyncio.gather(
+            *(VoteQueueService.submit(user, r.id, r.event_id) for user, r in votes),
+            return_exceptions=True,
+        )
+
+    assert batches == [4]
+    assert results[:3] == [{first.id: 2, second.id: 1}] * 3
+    assert isinstance(results[3], HTTPException) and results[3].status_code == 400
+    report_id, event_id = first.id, first.event_id
+    db.expire_all()  # written by Core statements
+    assert (await db.get(Report, report_id)).vote_count == 2
+    assert (await db.get(ExamEvent, event_id)).total_votes == 3
+    assert (await db.get(EventConsensus, event_id)).top_report_id == report_id
+    assert len((await db.execute(select(Vote))).scalars().all()) == 3
+
+
+async def test_cast_vote_goes_through_the_running_queue(db, reports):
+    first, second = reports
+    (alice,) = await voters(db, 1)
+
+    async with running_queue(db) as batches:
+        assert await ReportService.cast_vote(db, alice, first) == {first.id: 1, second.id: 0}
+        assert await deps.check_user_event_participation(db, alice, first.event_id) == (
+            True,
+            first.id,
+        )
+        with pytest.raises(HTTPException) as exc_info:
+            await ReportService.cast_vote(db, alice, second)
+
+    assert exc_info.value.status_code == 400
+    assert batches == [1, 1]
+
+
+async def test_stop_writes_the_votes_still_queued(db, reports):
+    first, _ = reports
+    alice, bob = await voters(db, 2)
+
+    async with running_queue(db):
+        pending = [
+            asyncio.create_task(VoteQueueService.submit(user, first.id, first.event_id))
+            for user in (alice, bob)
+        ]
+        await asyncio.sleep(0)  # both queued, batch window still open
+
+    assert [await task for task in pending][-1][first.id] == 2
+    assert not VoteQueueService.is_running()
+
+
+async def test_vote_waiting_for_room_when_shutdown_begins_is_written(db, reports):
+    first, _ = reports
+    alice, bob, carol = await voters(db, 3)
+    writing, release, written = asyncio.Event(), asyncio.Event(), asyncio.Event()
+
+    @asynccontextmanager
+    async def session_factory():
+        yield db
+
+    async def write(db, votes):
+        writing.set()
+        await release.wait()
+        await ReportService.write_vote_batch(db, votes)
+        written.set()
+
+    with patch.object(VoteQueue, "MAX_PENDING_VOTES", 1):
+        VoteQueueService.start(session_factory, write)
+        submits = [asyncio.create_task(VoteQueueService.submit(alice, first.id, first.event_id))]
+        await writing.wait()
+        submits += [
+            asyncio.create_task(VoteQueueService.submit(user, first.id, first.event_id))
+            for user in (bob, carol)
+        ]
+        await asyncio.sleep(0)  # bob's vote fills the queue; carol's waits for room
+        release.set()
+        # Woken as alice's batch commits, before carol's submit gets the room the writer
+        # frees by taking bob's vote: the sentinel takes it, and carol lands behind it.
+        await written.wait()
+        await VoteQueueService.stop()
+        results = await asyncio.wait_for(asyncio.gather(*submits), 1)
+
+    assert [counts[first.id] for counts in results] == [1, 2, 3]
+
+
+async def test_locked_batch_is_retried(db, reports):
+    first, second = reports
+    (alice,) = await voters(db, 1)
+
+    async with running_queue(db, locked=1) as attempts:
+        counts = await VoteQueueService.submit(alice, first.id, first.event_id)
+
+    assert counts == {first.id: 1, second.id: 0}
+    assert attempts == [1, 1]
+
+
+async def test_batch_still_locked_after_retries_is_refused_with_503(db, reports):
+    first, _ = reports
+    (alice,) = await voters(db, 1)
+
+    async with running_queue(db, locked=VoteQueue.MAX_WRITE_ATTEMPTS) as attempts:
+        with pytest.raises(HTTPException) as exc_info:
+            await VoteQueueService.submit(alice, first.id, first.event_id)
+
+    assert exc_info.value.status_code == 503
+    assert len(attempts) == VoteQueue.MAX_WRITE_ATTEMPTS
+    assert (await db.execute(select(Vote))).scalars().all() == []
+
+
+async def test_vote_arriving_during_shutdown_is_written_directly(db, reports):
+    first, second = reports
+    (alice,) = await voters(db, 1)
+
+    # Seen running by cast_vote, stopped by the time it submits.
+    with patch.object(VoteQueueService, "is_running", return_value=True):
+        counts = await ReportService.cast_vote(db, alice, first)
+
+    assert counts == {first.id: 1, second.id: 0}
@@ -1,7 +1,11 @@
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
+from app.models import WikidataCacheEntry
 from app.services import wikidata
 
 
@@ -17,12 +21,12 @@ async def test_search_composer():
         ]
     }
 
-    # Mock the httpx.AsyncClient used in the module
-    with patch("app.services.wikidata.httpx.AsyncClient") as mock_client_cls:
+    # Mock the shared Wikidata client used by the module
+    with patch("app.services.wikidata.http_clients.get") as mock_get:
         # Create a mock client instance
         mock_client = AsyncMock()
-        # Ensure __aenter__ returns this mock client
-        mock_client_cls.return_value.__aenter__.return_value = mock_client
+        # The shared registry hands out this mock client
+        mock_get.return_value = mock_client
 
         # Mock the get method of the client
         # Response object is synchronous, so use MagicMock
@@ -47,9 +51,9 @@ async def test_get_composer_by_id():
         "entities": {"Q255": {"labels": {"en": {"value": "Ludwig van Beethoven"}}, "claims": {}}}
     }
 
-    with patch("app.services.wikidata.httpx.AsyncClient") as mock_client_cls:
+    with patch("app.services.wikidata.http_clients.get") as mock_get:
         mock_client = AsyncMock()
-        mock_client_cls.return_value.__aenter__.return_value = mock_client
+        mock_get.return_value = mock_client
 
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -60,5 +64,150 @@ async def test_get_composer_by_id():
 
         result = await wikidata.get_composer_by_id("Q255")
 
-        assert result["name"] == "Ludwig van Beethoven"
-        assert result["wikidata_id"] == "Q255"
+        assert result.name == "Ludwig van Beethoven"
+        assert result.wikidata_id == "Q255"
+
+
+@pytest.fixture
+async def cache_table(tmp_path):
+    # The persistent tier on its own file database, standing in for the app database.
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/wikidata.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(WikidataCacheEntry.__table__.create)
+    with patch.object(
+        wikidata.WikidataCache,
+        "session_factory",
+        async_sessionmaker(engine, expire_on_commit=False),
+    ):
+        yield
+    await engine.dispose()
+
+
+def _json_response(data):
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = data
+    response.raise_for_status = lambda: None
+    return response
+
+
+def _entity(label):
+    return {"labels": {"en": {"value": label}}, "claims": {}}
+
+
+async def test_entity_lookup_is_served_from_table_after_restart(cache_table):
+    with patch("app.services.wikidata.http_clients.get") as mock_get:
+        mock_client = AsyncMock()
+        mock_get.return_value = mock_client
+        mock_client.get.return_value = _json_response(
+            {"entities": {"Q255": _entity("Ludwig van Beethoven")}}
+        )
+
+        await wikidata.get_composer_by_id("Q255")
+        wikidata.WikidataCache.reset_cache()  # another worker / a restart
+        result = await wikidata.get_composer_by_id("Q255")
+
+    assert result.name == "Ludwig van Beethoven"
+    assert mock_client.get.await_count == 1
+
+
+async def test_missing_entity_is_negatively_cached(cache_table):
+    with patch("app.services.wikidata.http_clients.get") as mock_get:
+        mock_client = AsyncMock()
+        mock_get.return_value = mock_client
+        mock_client.get.return_value = _json_response(
+            {"entities": {"Q999999": {"id": "Q999999", "missing": ""}}}
+        )
+
+        for _ in range(2):
+            with pytest.raises(LookupError):
+                await wikidata.get_composer_by_id("Q999999")
+
+    assert mock_client.get.await_count == 1
+
+
+async def test_batched_lookup_fetches_uncached_ids_in_chunks_of_50(cache_table):
+    ids = [f"Q{i}" for i in range(1, 121)]
+
+    async def fake_get(url, params):
+        return _json_response(
+            {"entities": {i: _entity(f"Composer {i}") for i in params["ids"].split("|")}}
+        )
+
+    with patch("app.services.wikidata.http_clients.get") as mock_get:
+        mock_client = AsyncMock()
+        mock_get.return_value = mock_client
+        mock_client.get.side_effect = fake_get
+
+        await wikidata.get_composer_by_id("Q1")
+        results = await wikidata.get_composers_by_ids(ids + ["not-an-id"])
+
+    batches = [call.kwargs["params"]["ids"].split("|") for call in mock_client.get.await_args_list]
+    assert [len(batch) for batch in batches] == [1, 50, 50, 19]
+    assert "Q1" not in batches[1]
+    assert set(results) == set(ids)
+    assert results["Q120"].name == "Composer Q120"
+
+
+async def test_search_does_not_write_cache_rows(cache_table):
+    with patch("app.services.wikidata.http_clients.get") as mock_get:
+        mock_client = AsyncMock()
+        mock_get.return_value = mock_client
+        mock_client.get.return_value = _json_response(
+            {"search": [{"id": "Q255", "label": "Beethoven", "description": "German composer"}]}
+        )
+
+        for prefix in ("B", "Be", "Bee", "Beethoven", "Beethoven"):
+            await wikidata.search_composer(prefix)
+
+    async with wikidata.WikidataCache.session_factory() as session:
+        rows = (await session.execute(select(WikidataCacheEntry))).scalars().all()
+    assert rows == []
+    assert mock_client.get.await_count == 4  # the repeated query is served from memory
+
+
+async def test_entity_write_prunes_expired_rows(cache_table):
+    now = time.time()
+    async with wikidata.WikidataCache.session_factory() as session:
+        session.add_all(
+            [
+                WikidataCacheEntry(key="entity:Q1", payload="{}", fetched_at=now - 31 * 86400),
+                WikidataCacheEntry(key="entity:Q2", payload=None, fetched_at=now - 7200),
+                WikidataCacheEntry(key="entity:Q3", payload="{}", fetched_at=now - 7200),
+            ]
+        )
+        await session.commit()
+
+    await wikidata.WikidataCache.put_many({"entity:Q4": None})
+
+    async with wikidata.WikidataCache.session_factory() as session:
+        keys = (await session.execute(select(WikidataCacheEntry.key))).scalars().all()
+    assert sorted(keys) == ["entity:Q3", "entity:Q4"]
+
+
+def test_parse_entity_keeps_only_whitelisted_claims():
+    def statement(value, rank="normal"):
+        return {"rank": rank, "mainsnak": {"datavalue": {"value": value}}}
+
+    entity = {
+        "labels": {"en": {"value": "Ludwig van Beethoven"}},
+        "claims": {
+            "P569": [
+                statement({"time": "+1770-12-16T00:00:00Z"}, rank="deprecated"),
+                statement({"time": "+1770-12-17T00:00:00Z"}),
+            ],
+            "P570": [statement({"time": "+1827-03-26T00:00:00Z"})],
+            "P106": [statement({"id": "Q486748"}), statement({"id": "Q36834"}, rank="preferred")],
+            "P18": [statement("Beethoven.jpg")],
+        },
+    }
+
+    parsed = wikidata.parse_entity("Q255", entity)
+
+    assert parsed == wikidata.WikidataEntity(
+        wikidata_id="Q255",
+        name="Ludwig van Beethoven",
+        birth_year=1770,
+        death_year=1827,
+        occupation_ids=("Q36834", "Q486748"),
+    )
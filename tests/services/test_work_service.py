@@ -34,3 +34,10 @@ def test_get_score_url_fallback_is_valid_url():
     work = _make_work("Nocturne Op.9", None, "Chopin")
     url = WorkService.get_score_url(work)
     assert url.startswith("https://")
+
+
+def test_build_score_url_matches_get_score_url():
+    work = _make_work("Nocturne Op.9", None, "Chopin")
+    assert WorkService.build_score_url("Nocturne Op.9", "Chopin", None) == (
+        WorkService.get_score_url(work)
+    )
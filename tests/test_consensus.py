@@ -1,6 +1,7 @@
 import pytest
 
 from app.models import Composer, Discipline, ExamEvent, Region, Report, User, Vote, Work
+from app.services.report_service import ReportService
 
 
 @pytest.mark.asyncio
@@ -57,6 +58,7 @@ async def test_consensus_logic(client, db):
         ]
     )
     await db.commit()
+    await ReportService.recompute_vote_counters(db)
 
     response = await client.get(f"/exams/{region.slug}/{discipline.slug}/2026")
     assert response.status_code == 200
@@ -87,6 +89,7 @@ async def test_consensus_logic(client, db):
         ]
     )
     await db.commit()
+    await ReportService.recompute_vote_counters(db)
 
     response = await client.get(f"/exams/{region.slug}/{discipline.slug}/2027")
     html2 = response.text
@@ -106,6 +109,7 @@ async def test_consensus_logic(client, db):
 
     db.add(Vote(user_id=user3.id, report_id=report_b3.id))
     await db.commit()
+    await ReportService.recompute_vote_counters(db)
 
     response = await client.get(f"/exams/{region.slug}/{discipline.slug}/2028")
     html3 = response.text
@@ -99,11 +99,10 @@ async def test_submission_flow_full(client: AsyncClient, db):
     settings.TURNSTILE_SECRET_KEY = "mock_secret"
 
     try:
-        # Patch httpx.AsyncClient to return a mock that handles the post request
-        with patch("httpx.AsyncClient") as MockClient:
+        # Patch the shared Turnstile client to return a mock that handles the post request
+        with patch("app.services.report_service.http_clients.get") as mock_get:
             mock_instance = AsyncMock()
-            MockClient.return_value = mock_instance
-            mock_instance.__aenter__.return_value = mock_instance
+            mock_get.return_value = mock_instance
 
             # Setup response mock
             from unittest.mock import MagicMock